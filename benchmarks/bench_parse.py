@@ -0,0 +1,74 @@
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from metnet.csrgraph import CSRGraph
+from metnet.metabolicnetwork import MetabolicNetwork
+import numpy as np
+
+'''
+    Benchmark of the sequential and parallel loading of reaction files.
+    Usage: python benchmarks/bench_parse.py [--sizes 100000 1000000] [--workers 4]
+'''
+
+
+def write_network(path, number_reactions, number_metabolites, seed=0):
+    'Writes a random reaction file with the given number of reactions.'
+
+    generator = random.Random(seed)
+    with open(path, "w") as out_file:
+        for reaction in range(number_reactions):
+            substrates = " + ".join("C%05d" % generator.randrange(number_metabolites) for _ in range(generator.randint(1, 3)))
+            products = " + ".join("C%05d" % generator.randrange(number_metabolites) for _ in range(generator.randint(1, 3)))
+            arrow = "<=>" if generator.random() < 0.3 else "=>"
+            out_file.write("R%07d : %s %s %s\n" % (reaction, substrates, arrow, products))
+
+
+def time_load(path, workers, compact):
+    'Returns the time to load the network and the network loaded.'
+
+    start = time.perf_counter()
+    network = MetabolicNetwork.create(path, compact=compact, workers=workers)
+    return time.perf_counter() - start, network
+
+
+def same_graph(network, expected):
+    'Checks that the two networks have the same nodes, in the same order, and the same arcs.'
+
+    graph, expected_graph = CSRGraph.from_graph(network.graph), CSRGraph.from_graph(expected.graph)
+    return (graph.names == expected_graph.names and np.array_equal(graph.out_offsets, expected_graph.out_offsets)
+            and np.array_equal(graph.out_targets, expected_graph.out_targets))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Sequential vs parallel load of reaction files.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10000, 100000, 1000000], help="number of reactions")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    arguments = parser.parse_args()
+
+    print("%12s %8s %8s %12s %12s %8s" % ("reactions", "MB", "graph", "sequential", "parallel", "speedup"))
+
+    with tempfile.TemporaryDirectory() as directory:
+        for size in arguments.sizes:
+            path = os.path.join(directory, "network_%d.txt" % size)
+            write_network(path, size, max(100, size // 4))
+
+            for compact in (False, True):
+                sequential, expected = time_load(path, 1, compact)
+                parallel, network = time_load(path, arguments.workers, compact)
+
+                if not same_graph(network, expected):
+                    raise AssertionError("parallel load differs from the sequential load")
+
+                print("%12d %8.1f %8s %11.2fs %11.2fs %7.2fx" % (size, os.path.getsize(path) / 1e6,
+                                                                 "csr" if compact else "dict", sequential,
+                                                                 parallel, sequential / parallel))
+
+
+if __name__ == "__main__":
+    main()
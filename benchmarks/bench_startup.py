@@ -0,0 +1,63 @@
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+'''
+    Benchmark of the startup time: from the interpreter start to the first result of a small network,
+    in a new process for each run. It fails if a heavy dependency is imported on that path, or if the
+    median time is above --max-seconds.
+    Usage: python benchmarks/bench_startup.py [--runs 5] [--max-seconds 1.0]
+'''
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+HEAVY_MODULES = ["pandas", "Bio", "igraph", "plotly", "networkx", "matplotlib"]
+
+PROGRAM = """
+import json, sys, time
+start = time.perf_counter()
+sys.path.insert(0, %r)
+from metnet.metabolicnetwork import MetabolicNetwork
+imported = time.perf_counter()
+network = MetabolicNetwork.create(%r)
+network.get_number_reactions_metabolites(), network.get_final_metabolites(), network.get_frequent_metabolites()
+done = time.perf_counter()
+print(json.dumps({"import": imported - start, "first_result": done - start,
+                  "heavy": [name for name in %r if name in sys.modules]}))
+"""
+
+
+def run_once(network_file):
+    'Runs the program in a new interpreter and returns its measures.'
+
+    program = PROGRAM % (ROOT, network_file, HEAVY_MODULES)
+    output = subprocess.run([sys.executable, "-c", program], check=True, capture_output=True, text=True).stdout
+    return json.loads(output)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Time from the interpreter start to the first result.")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--network", default=os.path.join(ROOT, "example-net.txt"))
+    parser.add_argument("--max-seconds", type=float, default=None, help="fails if the median time is above it")
+    arguments = parser.parse_args()
+
+    runs = [run_once(arguments.network) for _ in range(arguments.runs)]
+    import_time = statistics.median(run["import"] for run in runs)
+    first_result = statistics.median(run["first_result"] for run in runs)
+    heavy = sorted(set(name for run in runs for name in run["heavy"]))
+
+    print("%-20s %8.3fs" % ("import", import_time))
+    print("%-20s %8.3fs" % ("first result", first_result))
+    print("%-20s %s" % ("heavy modules", ", ".join(heavy) or "none"))
+
+    if heavy:
+        sys.exit("heavy modules imported at startup: " + ", ".join(heavy))
+    if arguments.max_seconds is not None and first_result > arguments.max_seconds:
+        sys.exit("startup took %.3fs, above %.3fs" % (first_result, arguments.max_seconds))
+
+
+if __name__ == "__main__":
+    main()
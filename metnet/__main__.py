@@ -1,4 +1,12 @@
-import app
+import os
+import sys
+
+if not __package__:
+    # executado como "python metnet": a aplicação é importada como pacote, para os imports relativos
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    from metnet import app
+else:
+    from . import app
 
 '''
     Application start.
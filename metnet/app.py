@@ -1,5 +1,6 @@
-from application import RunMetabolicalNetworkController
-from shared import InputOptions
+from . import batch
+from .application import RunMetabolicalNetworkController
+from .shared import InputOptions
 import sys
 
 
@@ -21,6 +22,9 @@ def get_options_from_user():
 
     tmp = input("Topological analysis [Y|n]? ")
     options[InputOptions.TOPOLOGICAL_ANALYSIS] = get_boolean(tmp)
+    if options[InputOptions.TOPOLOGICAL_ANALYSIS]:
+        tmp = input("Number of worker processes for the topological analysis [1]: ")
+        options[InputOptions.WORKERS] = get_integer(tmp)
 
     tmp = input("Graphical visualization of metabolic network [Y|n]? ")
     options[InputOptions.GRAPHIC_VISUALIZATION] = get_boolean(tmp)
@@ -54,6 +58,7 @@ def get_mock_options():
     return {
         InputOptions.FILEPATH: 'example-net.txt',
         InputOptions.TOPOLOGICAL_ANALYSIS: True,
+        InputOptions.WORKERS: 1,
         InputOptions.GRAPHIC_VISUALIZATION: False,
         InputOptions.NUMBER_REACT_MET: True,
         InputOptions.FINAL_METABOLITES: True,
@@ -64,6 +69,14 @@ def get_mock_options():
         InputOptions.AUTO_GENERATION_PATHWAY: "map00061"
     }
 
+def get_integer(input_response, default=1):
+    'Check the input response and returns a positive integer (default if empty or invalid).'
+    result = get_sanitized_string(input_response)
+    if not result.isdigit() or int(result) < 1:
+        return default
+
+    return int(result)
+
 def put_elements_in_list(input_response):
     'Retrieves the input response and puts it in a list.'
     result = get_sanitized_string(input_response)
@@ -108,6 +121,9 @@ def show_result(prompt, result, new_line=False, is_list=False):
 def run():
     'Allows the interaction with the user in console mode. Shows the functionalities  and their results.'
 
+    if len(sys.argv) > 1 and sys.argv[1] == "batch":
+        sys.exit(batch.main(sys.argv[2:]))
+
     show_welcome_message()
 
     if len(sys.argv) > 1 and sys.argv[1] == "test":
@@ -1,7 +1,5 @@
-from metabolicnetwork import MetabolicNetwork
-from shared import InputOptions
-
-import graph
+from .metabolicnetwork import MetabolicNetwork
+from .shared import InputOptions
 
 
 class RunMetabolicalNetworkController:
@@ -15,8 +13,12 @@ class RunMetabolicalNetworkController:
 
 
     def load_from_file(self):
-        'Creates a new MetabolicNetwork object from the filepath introduced.'
-        self.metabolic_network = MetabolicNetwork.create(self.options[InputOptions.FILEPATH])
+        """
+            Creates a new read-only MetabolicNetwork object, in its compact form, from the filepath introduced,
+            or from its binary snapshot when it is up to date. The snapshot is only written if it was asked for.
+        """
+        self.metabolic_network = MetabolicNetwork.create_with_snapshot(self.options[InputOptions.FILEPATH], compact = True,
+                                                                       save = self.options.get(InputOptions.SAVE_SNAPSHOT, False))
         if self.metabolic_network is None:
             raise Exception("File not valid!")
         return self
@@ -25,7 +27,8 @@ class RunMetabolicalNetworkController:
     def get_topological_analysis(self):
         'Gets the topological measures of the metabolic network and sends to the user. '
         if self.options[InputOptions.TOPOLOGICAL_ANALYSIS]:
-            return self.metabolic_network.get_centrality_measures()
+            workers = self.options.get(InputOptions.WORKERS, 1)
+            return self.metabolic_network.get_centrality_measures(workers)
         else:
             return None, None
     
@@ -0,0 +1,161 @@
+from .application import RunMetabolicalNetworkController
+from .shared import InputOptions
+from concurrent.futures import ProcessPoolExecutor, as_completed
+import argparse
+import csv
+import glob
+import json
+import os
+import sys
+import time
+
+'''
+    Batch mode: runs the analyses of many network files in a pool of processes, without prompts.
+    Each file is analyzed by its own RunMetabolicalNetworkController; the results are written as soon as
+    each file is done, one JSON object (or CSV row) per file, with the errors and the time of each file.
+
+    Usage: python metnet batch <directory or glob> [--analyses ...] [--format jsonl|csv] [--output FILE] [--snapshot]
+'''
+
+ANALYSES = {
+    "topological": (InputOptions.TOPOLOGICAL_ANALYSIS, "get_topological_analysis"),
+    "counts": (InputOptions.NUMBER_REACT_MET, "get_number_reactions_metabolites"),
+    "final": (InputOptions.FINAL_METABOLITES, "get_final_metabolites"),
+    "frequent": (InputOptions.TOP5_METABOLITES, "get_top5_metabolites"),
+    "active": (InputOptions.ALL_REACTIONS, "get_active_reactions"),
+    "excreted": (InputOptions.ALL_PRODUCTS, "get_metabolites_excreted"),
+}
+DEFAULT_ANALYSES = ["topological", "counts", "final", "frequent"]
+FIELDS = ["file", "error", "seconds", "load_seconds"]
+
+
+def find_files(patterns):
+    'Expands the directories (every file but the snapshots) and the glob patterns into a sorted list of files.'
+
+    files = []
+    for pattern in patterns:
+        if os.path.isdir(pattern):
+            paths = [os.path.join(pattern, name) for name in os.listdir(pattern)]
+        else:
+            paths = glob.glob(pattern)
+        files.extend(path for path in paths if os.path.isfile(path) and not path.endswith(".snapshot"))
+
+    return sorted(set(files))
+
+
+def get_options(filepath, analyses, metabolites, snapshot=False):
+    'Builds the options of the controller for one file: only the chosen analyses, no visualization or KEGG.'
+
+    return {
+        InputOptions.FILEPATH: filepath,
+        InputOptions.TOPOLOGICAL_ANALYSIS: "topological" in analyses,
+        InputOptions.WORKERS: 1,
+        InputOptions.SAVE_SNAPSHOT: snapshot,
+        InputOptions.GRAPHIC_VISUALIZATION: False,
+        InputOptions.NUMBER_REACT_MET: "counts" in analyses,
+        InputOptions.FINAL_METABOLITES: "final" in analyses,
+        InputOptions.ALL_REACTIONS: metabolites if "active" in analyses else [],
+        InputOptions.TOP5_METABOLITES: "frequent" in analyses,
+        InputOptions.ALL_PRODUCTS: metabolites if "excreted" in analyses else [],
+        InputOptions.AUTO_GENERATION: False,
+    }
+
+
+def analyze_file(filepath, analyses, metabolites, snapshot=False):
+    'Runs the analyses of one file. An error is reported in the result instead of stopping the batch.'
+
+    result = {"file": filepath, "error": None}
+    start = time.perf_counter()
+
+    try:
+        controller = RunMetabolicalNetworkController(get_options(filepath, analyses, metabolites, snapshot))
+        controller.load_from_file()
+        result["load_seconds"] = round(time.perf_counter() - start, 6)
+
+        for analysis in analyses:
+            result[analysis] = getattr(controller, ANALYSES[analysis][1])()
+
+    except Exception as e:
+        result["error"] = type(e).__name__ + ": " + str(e)
+
+    result["seconds"] = round(time.perf_counter() - start, 6)
+    return result
+
+
+def to_json(value):
+    'Converts the sets (e.g. active reactions) in sorted lists.'
+
+    if isinstance(value, (set, frozenset)):
+        return sorted(value)
+    raise TypeError(type(value).__name__ + " is not JSON serializable")
+
+
+class ResultWriter:
+
+    '''
+        Writes the results as JSON Lines or CSV; in CSV the results of the analyses are JSON-encoded cells.
+    '''
+
+    def __init__(self, output, output_format, analyses):
+        self.output = output
+        self.output_format = output_format
+        if output_format == "csv":
+            self.writer = csv.DictWriter(output, fieldnames=FIELDS + analyses, extrasaction="ignore")
+            self.writer.writeheader()
+
+    def write(self, result):
+        if self.output_format == "csv":
+            self.writer.writerow({field: value if field in FIELDS else json.dumps(value, default=to_json)
+                                  for field, value in result.items()})
+        else:
+            self.output.write(json.dumps(result, default=to_json) + "\n")
+        self.output.flush()
+
+
+def parse_arguments(arguments):
+    parser = argparse.ArgumentParser(prog="metnet batch", description="Analyzes many network files in parallel.")
+    parser.add_argument("inputs", nargs="+", help="directories or glob patterns of network files")
+    parser.add_argument("--analyses", default=",".join(DEFAULT_ANALYSES),
+                        help="comma-separated analyses: " + ", ".join(ANALYSES) + " (default: %(default)s)")
+    parser.add_argument("--metabolites", nargs="*", default=[],
+                        help="metabolites given to the active and excreted analyses")
+    parser.add_argument("--format", choices=["jsonl", "csv"], default="jsonl", dest="output_format")
+    parser.add_argument("--output", help="output file (default: standard output)")
+    parser.add_argument("--processes", type=int, default=os.cpu_count(), help="number of worker processes")
+    parser.add_argument("--snapshot", action="store_true",
+                        help="save a binary snapshot next to each file, so the next runs load it instead of parsing")
+
+    options = parser.parse_args(arguments)
+    options.analyses = [analysis.strip() for analysis in options.analyses.split(",") if analysis.strip()]
+    unknown = [analysis for analysis in options.analyses if analysis not in ANALYSES]
+    if unknown:
+        parser.error("unknown analyses: " + ", ".join(unknown))
+
+    return options
+
+
+def main(arguments):
+    'Runs the batch and returns the exit status: 0 if every file was analyzed, 1 otherwise.'
+
+    options = parse_arguments(arguments)
+    files = find_files(options.inputs)
+    failures = 0
+
+    output = open(options.output, "w", newline="") if options.output else sys.stdout
+    try:
+        writer = ResultWriter(output, options.output_format, options.analyses)
+
+        with ProcessPoolExecutor(max_workers=max(1, min(options.processes, len(files) or 1))) as executor:
+            futures = [executor.submit(analyze_file, filepath, options.analyses, options.metabolites, options.snapshot)
+                       for filepath in files]
+
+            for future in as_completed(futures):
+                result = future.result()
+                failures += result["error"] is not None
+                writer.write(result)
+    finally:
+        if output is not sys.stdout:
+            output.close()
+
+    print("%d files analyzed, %d failed" % (len(files), failures), file=sys.stderr)
+    return 1 if failures or not files else 0
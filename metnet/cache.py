@@ -0,0 +1,133 @@
+from collections import OrderedDict
+from functools import wraps
+import numpy as np
+
+'''
+    Memoization of the analysis results of a graph.
+    The cache is bound to a version counter, bumped by every change of the graph, so the results
+    computed for an older version are never returned. Each call gets its own copy of the containers of the
+    result (lists, sets, dicts, arrays), so changing it does not change the cached result.
+
+    The results of the whole-graph analyses (degrees, components, distances, ...) are kept until the graph
+    changes; only the results keyed by a query (e.g. a list of metabolites) are evicted, least recently used first,
+    so many queries can not evict the expensive analyses they are answered from.
+'''
+
+DEFAULT_MAX_ENTRIES = 128
+CONTAINERS = (list, tuple, set, dict, np.ndarray)
+
+
+class AnalysisCache:
+
+    '''
+        Results of the analyses of one graph, keyed by analysis and arguments. The whole-graph analyses
+        have their own tier, without a limit; the query results are evicted when max_entries is reached.
+    '''
+
+    def __init__(self, max_entries=DEFAULT_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self.analyses = {}
+        self.entries = OrderedDict()
+        self.version = None
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self.analyses) + len(self.entries)
+
+    def __check_version(self, version):
+        'Drops every entry computed for another version of the graph.'
+
+        if version != self.version:
+            self.analyses.clear()
+            self.entries.clear()
+            self.version = version
+
+    def lookup(self, key, version, query=False):
+        'Returns (True, result) when the result is cached, (False, None) otherwise.'
+
+        self.__check_version(version)
+        entries = self.entries if query else self.analyses
+        if key in entries:
+            if query:
+                entries.move_to_end(key)
+            self.hits += 1
+            return True, entries[key]
+
+        self.misses += 1
+        return False, None
+
+    def store(self, key, version, value, query=False):
+        'Stores the result of an analysis; for a query, evicts the least recently used one if needed.'
+
+        self.__check_version(version)
+        if not query:
+            self.analyses[key] = value
+            return
+
+        self.entries[key] = value
+        self.entries.move_to_end(key)
+
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+
+    def clear(self):
+        self.analyses.clear()
+        self.entries.clear()
+        self.hits = 0
+        self.misses = 0
+
+
+def make_key(value):
+    'Converts the arguments of an analysis in a hashable key.'
+
+    if isinstance(value, (list, tuple)):
+        return tuple(make_key(element) for element in value)
+    if isinstance(value, (set, frozenset)):
+        return frozenset(make_key(element) for element in value)
+    if isinstance(value, dict):
+        return tuple(sorted((key, make_key(element)) for key, element in value.items()))
+
+    return value
+
+
+def copy_result(value):
+    'Copies the containers of a result, with the same types; other objects (e.g. graphs) are kept as they are.'
+
+    if isinstance(value, dict):
+        copied = value.copy()
+        for key, element in value.items():
+            if isinstance(element, CONTAINERS):
+                copied[key] = copy_result(element)
+        return copied
+    if isinstance(value, list) or type(value) is tuple:
+        copied = [copy_result(element) if isinstance(element, CONTAINERS) else element for element in value]
+        return copied if isinstance(value, list) else tuple(copied)
+    if isinstance(value, (set, np.ndarray)):
+        return value.copy()
+
+    return value
+
+
+def cached_analysis(method=None, *, query=False, shared=False):
+    """
+        Memoizes a method of an object with the attributes analysis_cache and version; each call gets a copy of
+        the result. query puts the results in the evictable tier, for the methods whose arguments are queries.
+        shared returns the cached result itself, only for the private helpers whose results are never given out.
+    """
+    if method is None:
+        return lambda method: cached_analysis(method, query=query, shared=shared)
+
+    @wraps(method)
+    def wrapper(self, *args, **kwargs):
+        key = (method.__qualname__, make_key(args), make_key(kwargs))
+        version = self.version
+        found, result = self.analysis_cache.lookup(key, version, query)
+
+        if not found:
+            result = method(self, *args, **kwargs)
+            self.analysis_cache.store(key, version, result, query)
+
+        return result if shared else copy_result(result)
+
+    return wrapper
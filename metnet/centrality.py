@@ -0,0 +1,66 @@
+from collections import deque
+
+'''
+    Centrality engine shared by Graph and its analyses.
+    Nodes are visited through a successors function, so any adjacency structure can be used.
+'''
+
+
+def accumulate_betweenness(nodes, successors, sources=None):
+    'Accumulates the betweenness dependencies (Brandes) of the shortest paths starting at each source.'
+
+    betweenness = dict.fromkeys(nodes, 0.0)
+    if sources is None:
+        sources = betweenness.keys()
+
+    for source in sources:
+        stack = []
+        predecessors = {source: []}
+        number_paths = {source: 1}
+        distance = {source: 0}
+        queue = deque([source])
+
+        while queue:
+            node = queue.popleft()
+            stack.append(node)
+
+            for element in successors(node):
+                if element not in distance:
+                    distance[element] = distance[node] + 1
+                    number_paths[element] = 0
+                    predecessors[element] = []
+                    queue.append(element)
+
+                if distance[element] == distance[node] + 1:
+                    number_paths[element] += number_paths[node]
+                    predecessors[element].append(node)
+
+        dependency = dict.fromkeys(stack, 0.0)
+        while stack:
+            element = stack.pop()
+            for node in predecessors[element]:
+                dependency[node] += number_paths[node] / number_paths[element] * (1 + dependency[element])
+
+            if element != source:
+                betweenness[element] += dependency[element]
+
+    return betweenness
+
+
+def normalize_betweenness(betweenness, number_nodes):
+    'Scales the betweenness values by the number of ordered pairs of the remaining nodes.'
+
+    if number_nodes <= 2:
+        return betweenness
+
+    scale = 1.0 / ((number_nodes - 1) * (number_nodes - 2))
+    return {node: value * scale for node, value in betweenness.items()}
+
+
+def betweenness_centrality(nodes, successors, normalized=True):
+    'Calculates the betweenness centrality of all nodes in a single pass.'
+
+    nodes = list(nodes)
+    betweenness = accumulate_betweenness(nodes, successors)
+
+    return normalize_betweenness(betweenness, len(nodes)) if normalized else betweenness
@@ -0,0 +1,248 @@
+from .cache import AnalysisCache, cached_analysis
+from .graph import Graph
+from .traversal import breadth_first, depth_first, strongly_connected_components
+from collections.abc import Mapping
+import numpy as np
+
+'''
+    Compact, array-backed representation of a Graph.
+'''
+
+
+class AdjacencyView(Mapping):
+
+    '''
+        Read-only view over CSR arrays with the same interface as Graph.graph_map.
+        The neighbours of a node are only materialized when they are requested.
+    '''
+
+    def __init__(self, names, index, offsets, targets):
+        self.names = names
+        self.index = index
+        self.offsets = offsets
+        self.targets = targets
+
+    def __getitem__(self, node):
+        position = self.index[node]
+        ids = self.targets[self.offsets[position]:self.offsets[position + 1]]
+        return frozenset(map(self.names.__getitem__, ids.tolist()))
+
+    def __contains__(self, node):
+        return node in self.index
+
+    def __iter__(self):
+        return iter(self.names)
+
+    def __len__(self):
+        return len(self.names)
+
+
+class CSRGraph(Graph):
+
+    '''
+        Frozen form of Graph. The nodes are interned to integer ids and the arcs of both directions
+        are stored in CSR arrays: the targets of node i are targets[offsets[i]:offsets[i + 1]].
+    '''
+
+    def __init__(self, names, out_offsets, out_targets, in_offsets=None, in_targets=None):
+        self.names = list(names)
+        self.index = {name: position for position, name in enumerate(self.names)}
+        self.out_offsets = out_offsets
+        self.out_targets = out_targets
+
+        if in_offsets is None or in_targets is None:
+            in_offsets, in_targets = self.__transpose()
+        self.in_offsets = in_offsets
+        self.in_targets = in_targets
+
+        self.graph_map = AdjacencyView(self.names, self.index, self.out_offsets, self.out_targets)
+        self.reverse_graph_map = AdjacencyView(self.names, self.index, self.in_offsets, self.in_targets)
+        self.version = 0
+        self.analysis_cache = AnalysisCache()
+        self.statistics = None
+        self.copy_on_write = False
+
+    @classmethod
+    def from_graph(cls, graph):
+        'Builds the frozen form of an existing Graph.'
+
+        if isinstance(graph, CSRGraph):
+            return graph
+
+        names = list(graph.graph_map.keys())
+        index = {name: position for position, name in enumerate(names)}
+        number_edges = sum(len(successors) for successors in graph.graph_map.values())
+
+        sources = np.fromiter((index[node] for node in names for _ in graph.graph_map[node]),
+                              dtype=np.int64, count=number_edges)
+        targets = np.fromiter((index[element] for node in names for element in graph.graph_map[node]),
+                              dtype=np.int64, count=number_edges)
+
+        return cls.from_edges(names, sources, targets)
+
+    @classmethod
+    def from_edges(cls, names, sources, targets):
+        'Builds the frozen graph from arrays of node ids, removing the repeated arcs.'
+
+        number_nodes = len(names)
+        keys = np.sort(np.asarray(sources, dtype=np.int64) * number_nodes + np.asarray(targets, dtype=np.int64))
+        keys = keys[np.concatenate(([True], keys[1:] != keys[:-1]))] if len(keys) else keys
+        sources = keys // number_nodes
+
+        offsets = np.zeros(number_nodes + 1, dtype=np.int64)
+        np.cumsum(np.bincount(sources, minlength=number_nodes), out=offsets[1:])
+
+        return cls(names, offsets, (keys % number_nodes).astype(np.int32))
+
+    def __transpose(self):
+        'Builds the CSR arrays of the incoming arcs.'
+
+        number_nodes = len(self.names)
+        sources = np.repeat(np.arange(number_nodes, dtype=np.int32), np.diff(self.out_offsets))
+        order = np.argsort(self.out_targets, kind="stable")
+
+        offsets = np.zeros(number_nodes + 1, dtype=np.int64)
+        np.cumsum(np.bincount(self.out_targets, minlength=number_nodes), out=offsets[1:])
+
+        return offsets, sources[order]
+
+    def freeze(self):
+        return self
+
+    def thaw(self):
+        'Returns a mutable Graph with the same nodes, in the same order, and the same arcs, built in one pass.'
+
+        graph = Graph()
+        for adjacency, offsets, targets in ((graph.graph_map, self.out_offsets, self.out_targets),
+                                            (graph.reverse_graph_map, self.in_offsets, self.in_targets)):
+            target_names = list(map(self.names.__getitem__, targets.tolist()))
+            offsets = offsets.tolist()
+            for position, name in enumerate(self.names):
+                adjacency[name] = set(target_names[offsets[position]:offsets[position + 1]])
+
+        graph.version = 1
+        return graph
+
+    def add_vertex(self, node):
+        raise TypeError("CSRGraph is frozen and can not be changed")
+
+    def add_vertices(self, nodes):
+        raise TypeError("CSRGraph is frozen and can not be changed")
+
+    def add_edge(self, initial_node, final_node):
+        raise TypeError("CSRGraph is frozen and can not be changed")
+
+    def add_edges(self, edges):
+        raise TypeError("CSRGraph is frozen and can not be changed")
+
+    def remove_edge(self, initial_node, final_node):
+        raise TypeError("CSRGraph is frozen and can not be changed")
+
+    def remove_vertex(self, node):
+        raise TypeError("CSRGraph is frozen and can not be changed")
+
+    def fork(self):
+        'Frozen graphs can be shared as they are.'
+        return self
+
+    def nbytes(self):
+        'Returns the memory used by the adjacency arrays.'
+
+        return self.out_offsets.nbytes + self.out_targets.nbytes + self.in_offsets.nbytes + self.in_targets.nbytes
+
+    def successor_ids(self, position):
+        'Dá os ids dos nós sucessores'
+        return self.out_targets[self.out_offsets[position]:self.out_offsets[position + 1]]
+
+    def predecessor_ids(self, position):
+        'Dá os ids dos nós antecessores'
+        return self.in_targets[self.in_offsets[position]:self.in_offsets[position + 1]]
+
+    def get_nodes(self):
+        return list(self.names)
+
+    def get_edges(self):
+        sources = np.repeat(np.arange(len(self.names)), np.diff(self.out_offsets))
+        return [(self.names[source], self.names[target])
+                for source, target in zip(sources.tolist(), self.out_targets.tolist())]
+
+    def get_successors(self, node):
+        return [self.names[element] for element in self.successor_ids(self.index[node]).tolist()]
+
+    def get_predecessors(self, node):
+        return [self.names[element] for element in self.predecessor_ids(self.index[node]).tolist()]
+
+    def get_adjacents(self, node):
+        position = self.index[node]
+        adjacents = np.union1d(self.predecessor_ids(position), self.successor_ids(position))
+        return [self.names[element] for element in adjacents.tolist()]
+
+    def out_degree(self, node):
+        position = self.index[node]
+        return int(self.out_offsets[position + 1] - self.out_offsets[position])
+
+    def in_degree(self, node):
+        position = self.index[node]
+        return int(self.in_offsets[position + 1] - self.in_offsets[position])
+
+    def degree(self, node):
+        position = self.index[node]
+        return len(np.union1d(self.predecessor_ids(position), self.successor_ids(position)))
+
+    def size(self):
+        return len(self.names), len(self.out_targets)
+
+    def degree_array(self, deg_type="inout"):
+        'Calcula os graus de todos os nós, indexados pelo id do nó'
+
+        out_degrees = np.diff(self.out_offsets)
+        in_degrees = np.diff(self.in_offsets)
+
+        if deg_type == "out":
+            return out_degrees
+        if deg_type == "in":
+            return in_degrees
+
+        # arcos recíprocos são contados uma só vez
+        number_nodes = len(self.names)
+        sources = np.repeat(np.arange(number_nodes, dtype=np.int64), out_degrees)
+        keys = sources * number_nodes + self.out_targets
+        reverse_keys = self.out_targets.astype(np.int64) * number_nodes + sources
+        reciprocal = np.isin(reverse_keys, keys, assume_unique=True)
+
+        return out_degrees + in_degrees - np.bincount(sources[reciprocal], minlength=number_nodes)
+
+    @cached_analysis
+    def all_degrees(self, deg_type = "inout"):
+        return dict(zip(self.names, self.degree_array(deg_type).tolist()))
+
+    @cached_analysis
+    def degree_histogram(self, deg_type = "inout"):
+        counts = np.bincount(self.degree_array(deg_type))
+        return {degree: count for degree, count in enumerate(counts.tolist()) if count}
+
+    @cached_analysis
+    def get_sinks(self):
+        return [self.names[position] for position in np.flatnonzero(np.diff(self.out_offsets) == 0).tolist()]
+
+    def successor_list(self, position):
+        'Dá os ids dos nós sucessores sob a forma de lista'
+        return self.out_targets[self.out_offsets[position]:self.out_offsets[position + 1]].tolist()
+
+    @cached_analysis
+    def strongly_connected_components(self):
+        components = strongly_connected_components(range(len(self.names)), self.successor_list)
+        return [[self.names[node] for node in component] for component in reversed(components)]
+
+    def iter_bfs(self, *sources, max_depth=None):
+        return self.__named(breadth_first(self.successor_list, [self.index[node] for node in sources], max_depth))
+
+    def iter_dfs(self, *sources, max_depth=None):
+        return self.__named(depth_first(self.successor_list, [self.index[node] for node in sources], max_depth))
+
+    def __named(self, traversal):
+        'Converte os ids produzidos por uma travessia nos nomes dos nós'
+
+        names = self.names
+        for node, depth, parent in traversal:
+            yield names[node], depth, None if parent is None else names[parent]
@@ -0,0 +1,84 @@
+from collections import Counter
+
+'''
+    Degree statistics of a Graph kept up to date by its changes: the histograms of the out, in and inout degrees,
+    the inout degree of each node (number of distinct neighbours) and the sinks (nodes without successors).
+    Each change of an edge updates them in O(1), instead of a new pass over the whole graph.
+'''
+
+
+class DegreeStatistics:
+
+    '''
+        Live degree statistics of one Graph. The Graph calls vertex_added, vertex_removed and edge_changed
+        after each change.
+    '''
+
+    def __init__(self, graph):
+        self.graph = graph
+        self.inout = {node: len(successors | graph.reverse_graph_map[node]) for node, successors in graph.graph_map.items()}
+        self.histograms = {"out": Counter(len(successors) for successors in graph.graph_map.values()),
+                           "in": Counter(len(predecessors) for predecessors in graph.reverse_graph_map.values()),
+                           "inout": Counter(self.inout.values())}
+        self.sinks = dict.fromkeys(node for node, successors in graph.graph_map.items() if not successors)
+
+    def copy(self, graph):
+        'Returns a copy of the statistics for a copy of the graph.'
+
+        statistics = DegreeStatistics.__new__(DegreeStatistics)
+        statistics.graph = graph
+        statistics.inout = dict(self.inout)
+        statistics.histograms = {deg_type: Counter(histogram) for deg_type, histogram in self.histograms.items()}
+        statistics.sinks = dict(self.sinks)
+
+        return statistics
+
+    def __move(self, deg_type, old_degree, new_degree):
+        'Moves one node between two bins of the histogram.'
+
+        histogram = self.histograms[deg_type]
+        histogram[old_degree] -= 1
+        if not histogram[old_degree]:
+            del histogram[old_degree]
+        histogram[new_degree] += 1
+
+    def vertex_added(self, node):
+        for histogram in self.histograms.values():
+            histogram[0] += 1
+        self.inout[node] = 0
+        self.sinks[node] = None
+
+    def vertex_removed(self, node):
+        'Removes a node without edges.'
+
+        for histogram in self.histograms.values():
+            histogram[0] -= 1
+            if not histogram[0]:
+                del histogram[0]
+        del self.inout[node]
+        self.sinks.pop(node, None)
+
+    def edge_changed(self, initial_node, final_node, change):
+        'Updates the statistics after the edge was added (change = 1) or removed (change = -1).'
+
+        successors = self.graph.graph_map[initial_node]
+        self.__move("out", len(successors) - change, len(successors))
+        self.__move("in", len(self.graph.reverse_graph_map[final_node]) - change, len(self.graph.reverse_graph_map[final_node]))
+
+        if not successors:
+            self.sinks[initial_node] = None
+        elif change == 1 and len(successors) == 1:
+            self.sinks.pop(initial_node, None)
+
+        # o número de vizinhos só muda quando não há arco no sentido contrário
+        if initial_node == final_node:
+            self.__change_inout(initial_node, change)
+        else:
+            if final_node not in self.graph.reverse_graph_map[initial_node]:
+                self.__change_inout(initial_node, change)
+            if initial_node not in self.graph.graph_map[final_node]:
+                self.__change_inout(final_node, change)
+
+    def __change_inout(self, node, change):
+        self.__move("inout", self.inout[node], self.inout[node] + change)
+        self.inout[node] += change
@@ -0,0 +1,85 @@
+import numpy as np
+
+'''
+    All-pairs unweighted distances over a CSRGraph.
+    The distance matrix is computed by blocks of sources (one vectorized breadth-first search per block),
+    so the memory used is bounded by block_size * number of nodes.
+'''
+
+DEFAULT_BLOCK_SIZE = 256
+
+
+def block_distances(graph, sources):
+    'Returns the matrix of distances from the given source ids to every node (-1 when not reachable).'
+
+    number_nodes = len(graph.names)
+    out_degrees = np.diff(graph.out_offsets)
+    distances = np.full((len(sources), number_nodes), -1, dtype=np.int32)
+
+    rows = np.arange(len(sources), dtype=np.int64)
+    nodes = np.asarray(sources, dtype=np.int64)
+    distances[rows, nodes] = 0
+    depth = 0
+
+    while len(nodes) > 0:
+        depth += 1
+        counts = out_degrees[nodes]
+        total = int(counts.sum())
+        if total == 0:
+            break
+
+        # posições em out_targets dos sucessores de todos os nós da fronteira
+        first = np.repeat(graph.out_offsets[nodes] - (np.cumsum(counts) - counts), counts)
+        targets = graph.out_targets[first + np.arange(total)].astype(np.int64)
+        rows = np.repeat(rows, counts)
+
+        new = distances[rows, targets] < 0
+        keys = np.unique(rows[new] * number_nodes + targets[new])
+        rows, nodes = keys // number_nodes, keys % number_nodes
+        distances[rows, nodes] = depth
+
+    return distances
+
+
+def iter_distance_blocks(graph, sources=None, block_size=DEFAULT_BLOCK_SIZE):
+    'Generates (source ids, distance matrix) for consecutive blocks of sources.'
+
+    if sources is None:
+        sources = np.arange(len(graph.names))
+
+    for start in range(0, len(sources), block_size):
+        block = sources[start:start + block_size]
+        yield block, block_distances(graph, block)
+
+
+def distance_sums(graph, sources=None, block_size=DEFAULT_BLOCK_SIZE):
+    'Returns, for each source, the sum of distances, the number of reachable nodes and the eccentricity.'
+
+    totals, reachable, eccentricity = [], [], []
+
+    for _, distances in iter_distance_blocks(graph, sources, block_size):
+        reached = distances > 0
+        totals.append(np.where(reached, distances, 0).sum(axis=1, dtype=np.int64))
+        reachable.append(reached.sum(axis=1, dtype=np.int64))
+        eccentricity.append(distances.max(axis=1, initial=0).astype(np.int64))
+
+    if not totals:
+        empty = np.zeros(0, dtype=np.int64)
+        return empty, empty, empty
+
+    return np.concatenate(totals), np.concatenate(reachable), np.concatenate(eccentricity)
+
+
+def summarize_distances(names, totals, reachable, eccentricity):
+    'Combines the per-source sums into closeness, eccentricity, mean distance and reachability fraction.'
+
+    number_nodes = len(names)
+    number_reachable = int(reachable.sum())
+    closeness = np.divide(1.0, totals, out=np.zeros(len(totals)), where=totals > 0)
+
+    return {
+        "closeness": dict(zip(names, closeness.tolist())),
+        "eccentricity": dict(zip(names, eccentricity.tolist())),
+        "mean_distance": float(totals.sum()) / number_reachable if number_reachable else 0.0,
+        "reachability": float(number_reachable) / ((number_nodes - 1) * number_nodes) if number_nodes > 1 else 0.0
+    }
@@ -1,8 +1,8 @@
-def is_in_tuple_list(list, value):
-    for (x, y) in list:
-        if value == x:
-            return True
-    return False
+from .cache import AnalysisCache, cached_analysis, copy_result
+from .centrality import betweenness_centrality
+from .degreestats import DegreeStatistics
+from .distances import DEFAULT_BLOCK_SIZE, distance_sums, summarize_distances
+from .traversal import breadth_first, depth_first, strongly_connected_components
 
 
 class Graph:
@@ -14,6 +14,12 @@ class Graph:
 
     def __init__(self):
         self.graph_map = {}
+        self.reverse_graph_map = {} #arcos de entrada de cada nó
+        self.version = 0 #incrementado a cada alteração, invalida os resultados em cache
+        self.analysis_cache = AnalysisCache()
+        self.statistics = None #estatísticas dos graus, mantidas a cada alteração depois de pedidas
+        self.copy_on_write = False #os conjuntos de adjacências são partilhados com outra cópia (fork)
+        self.owned = (set(), set()) #nós cujos conjuntos (sucessores, antecessores) já foram copiados
 
     def __str__(self):
         for key in self.graph_map.keys():
@@ -31,20 +37,140 @@ class Graph:
 
     def add_vertex(self, node):
         'Adiciona um nó ao grafo'
-        if node not in self.graph_map.keys():
-            self.graph_map[node] = []
+        if node not in self.graph_map:
+            self.graph_map[node] = set()
+            self.reverse_graph_map[node] = set()
+            self.version += 1
+
+            if self.copy_on_write:
+                self.owned[0].add(node)
+                self.owned[1].add(node)
+            if self.statistics is not None:
+                self.statistics.vertex_added(node)
 
     def add_edge(self, initial_node, final_node):
         'Adiciona o nó e arco correspondente'
 
-        if initial_node not in self.graph_map.keys():
+        if initial_node not in self.graph_map:
             self.add_vertex(initial_node)
 
-        if final_node not in self.graph_map.keys():
+        if final_node not in self.graph_map:
             self.add_vertex(final_node)
 
         if final_node not in self.graph_map[initial_node]:
-            self.graph_map[initial_node].append(final_node)
+            self.__writable(0, initial_node).add(final_node)
+            self.__writable(1, final_node).add(initial_node)
+            self.version += 1
+
+            if self.statistics is not None:
+                self.statistics.edge_changed(initial_node, final_node, 1)
+
+    def add_vertices(self, nodes):
+        'Adiciona um lote de nós ao grafo'
+        for node in nodes:
+            if node not in self.graph_map:
+                self.add_vertex(node)
+
+    def add_edges(self, edges):
+        'Adiciona um lote de arcos (e os nós correspondentes) ao grafo'
+
+        if self.copy_on_write or self.statistics is not None:
+            for initial_node, final_node in edges:
+                self.add_edge(initial_node, final_node)
+            return
+
+        graph_map, reverse_graph_map = self.graph_map, self.reverse_graph_map
+        for initial_node, final_node in edges:
+            if initial_node not in graph_map:
+                self.add_vertex(initial_node)
+
+            if final_node not in graph_map:
+                self.add_vertex(final_node)
+
+            if final_node not in graph_map[initial_node]:
+                graph_map[initial_node].add(final_node)
+                reverse_graph_map[final_node].add(initial_node)
+                self.version += 1
+
+    def remove_edge(self, initial_node, final_node):
+        'Remove o arco, se existir; os nós mantêm-se'
+
+        if initial_node in self.graph_map and final_node in self.graph_map[initial_node]:
+            self.__writable(0, initial_node).discard(final_node)
+            self.__writable(1, final_node).discard(initial_node)
+            self.version += 1
+
+            if self.statistics is not None:
+                self.statistics.edge_changed(initial_node, final_node, -1)
+
+    def remove_vertex(self, node):
+        'Remove o nó e os seus arcos, em O(grau do nó)'
+
+        if node not in self.graph_map:
+            return
+
+        for successor in list(self.graph_map[node]):
+            self.remove_edge(node, successor)
+        for predecessor in list(self.reverse_graph_map[node]):
+            self.remove_edge(predecessor, node)
+
+        del self.graph_map[node]
+        del self.reverse_graph_map[node]
+        self.owned[0].discard(node)
+        self.owned[1].discard(node)
+        self.version += 1
+
+        if self.statistics is not None:
+            self.statistics.vertex_removed(node)
+
+    def __writable(self, direction, node):
+        'Dá o conjunto de sucessores (direction 0) ou antecessores (1) do nó para alteração, copiando-o se for partilhado'
+
+        adjacency = self.reverse_graph_map if direction else self.graph_map
+        if self.copy_on_write and node not in self.owned[direction]:
+            adjacency[node] = set(adjacency[node])
+            self.owned[direction].add(node)
+
+        return adjacency[node]
+
+    def fork(self):
+        """
+            Retorna uma cópia do grafo que partilha os conjuntos de adjacências com este (copy-on-write):
+            só os conjuntos dos nós alterados, num ou noutro grafo, são copiados
+        """
+        graph = Graph()
+        graph.graph_map = dict(self.graph_map)
+        graph.reverse_graph_map = dict(self.reverse_graph_map)
+        graph.version = self.version
+        graph.copy_on_write = True
+
+        self.copy_on_write = True
+        self.owned = (set(), set())
+
+        if self.statistics is not None:
+            graph.statistics = self.statistics.copy(graph)
+
+        return graph
+
+    def degree_statistics(self):
+        'Dá as estatísticas dos graus (DegreeStatistics), calculadas no primeiro pedido e depois mantidas a cada alteração'
+        if self.statistics is None:
+            self.statistics = DegreeStatistics(self)
+        return self.statistics
+
+    def get_sinks(self):
+        'Dá os nós sem sucessores'
+        return list(self.degree_statistics().sinks)
+
+    def degree_histogram(self, deg_type = "inout"):
+        'Dá o nº de nós com cada grau (grau -> nº de nós)'
+        return self.degree_statistics().histograms[deg_type].copy()
+
+    @cached_analysis
+    def freeze(self):
+        'Retorna uma cópia compacta e imutável do grafo, com os nós indexados por inteiros (CSR)'
+        from .csrgraph import CSRGraph
+        return CSRGraph.from_graph(self)
 
     def get_successors(self, node):
         'Dá a lista de nós sucessores'
@@ -53,158 +179,150 @@ class Graph:
 
     def get_predecessors(self, node):
         'Dá a lista de nós antecessores'
-        predecessors = [key for key in self.graph_map.keys() if node in self.graph_map[key]]
+        predecessors = list(self.reverse_graph_map[node])
         return predecessors
 
     def get_adjacents(self, node):
         'Dá a lista de nós adjacentes'
-        successor = self.get_successors(node)
-        predecessor = self.get_predecessors(node)
-        result = predecessor
-
-        for succ in successor:
-            if succ not in result:
-                result.append(succ)
-
+        result = list(self.reverse_graph_map[node] | self.graph_map[node])
         return result
 
 # Faz parte da classe NetworkTopology
 
     def out_degree(self, node):
         'Calcula o grau de saida, isto é, nº de successores (ligações que saem)'
-        out_degree = len(self.get_successors(node))
+        out_degree = len(self.graph_map[node])
         return out_degree
 
     def in_degree(self, node):
         'Calcula o grau de entrada, isto é, nº de predecessores (ligações que chegam)'
-        in_degree = len(self.get_predecessors(node))
+        in_degree = len(self.reverse_graph_map[node])
         return in_degree
 
     def degree(self, node):
         'Calcula o nº de sucessores e antecessores'
-        degree = len(self.get_adjacents(node))
+        if self.statistics is not None:
+            return self.statistics.inout[node]
+        degree = len(self.reverse_graph_map[node] | self.graph_map[node])
         return degree
 
-    def reachable_bfs(self, vertex):
-        'Implementa a travessia de um grafo em largura, usa uma queue'
-
-        visited_nodes = [vertex]
-        result = []
+    def iter_bfs(self, *sources, max_depth=None):
+        'Gerador da travessia em largura a partir de um ou mais nós; produz (nó, profundidade, pai)'
+        return breadth_first(self.graph_map.__getitem__, sources, max_depth)
 
-        while len(visited_nodes) > 0:
-            node = visited_nodes.pop(0) #ultimo elemento da lista é removido
+    def iter_dfs(self, *sources, max_depth=None):
+        'Gerador da travessia em profundidade a partir de um ou mais nós; produz (nó, profundidade, pai)'
+        return depth_first(self.graph_map.__getitem__, sources, max_depth)
 
-            if node != vertex:
-                result.append(node)
-
-            for element in self.graph_map[node]: #vai aos sucessores do nó
-                if element not in result and element not in visited_nodes and element != node:
-                    visited_nodes.append(element) #o elemento é inserido no fim da lista
+    def reachable_bfs(self, vertex):
+        'Implementa a travessia de um grafo em largura, usa uma queue'
 
-        return result
+        return [node for node, depth, _ in self.iter_bfs(vertex) if depth > 0]
 
     def reachable_dfs(self, vertex):
         'Implementa a travessia de um grado em profundidade, usa uma stack'
 
-        visited_nodes = [vertex]
-        result = []
-
-        while len(visited_nodes) > 0:
-            node = visited_nodes.pop(0) #ultimo elemento da lista é removida
-
-            if node != vertex:
-                result.append(node)
-
-            for element in self.graph_map[node]: #vai aos sucessores do nó
-                if element not in result and element not in visited_nodes:
-                    visited_nodes.insert(0, element) #o elemento é inserido no inicio da lista
-
-        return result
+        return [node for node, depth, _ in self.iter_dfs(vertex) if depth > 0]
 
     def distance(self, inicial_node, final_node):
         """
             Retorna a distância entre dois nós, isto é, comprimento do caminho mais curto
             isto é, o número de nós visitados usa queue de nós, juntando o valor da distancia
         """
-        initial_nodes = [(inicial_node, 0)]
-        visited_nodes = [inicial_node]
-
-        if inicial_node == final_node:
-            return 0
-
-        while len(initial_nodes) > 0:
-            node, distance = initial_nodes.pop(0)
-
-            for element in self.graph_map[node]:
-                if element == final_node:
-                    return distance + 1
-
-                elif element not in visited_nodes:
-                    initial_nodes.append((element, distance + 1))
-                    visited_nodes.append(element)
+        for node, distance, _ in self.iter_bfs(inicial_node):
+            if node == final_node:
+                return distance
 
         return None
 
     def shortest_path(self, initial_node, final_node):
         'Retorna o caminho mais curto entre dois nós'
 
-        initial_nodes = [(initial_node, [])]
-        visited_nodes = [initial_node]
-
         if initial_node == final_node:
             return []
 
-        while len(initial_nodes) > 0:
-            node, preds = initial_nodes.pop(0)
-
-            for element in self.graph_map[node]:
-                if element == final_node:
-                    return preds + [node, element]
+        parents = {}
+        for node, _, parent in self.iter_bfs(initial_node):
+            parents[node] = parent
 
-                elif element not in visited_nodes:
-                    initial_nodes.append((element, preds + [node]))
-                    visited_nodes.append(element)
+            if node == final_node:
+                path = []
+                while node is not None:
+                    path.append(node)
+                    node = parents[node]
+                return path[::-1]
 
         return None
 
     def reachable_with_dist(self, vertix):
         'Retorna uma lista de nós atingivies a partir de vertix com a respectiva distância'
 
-        result = []
-        visited_nodes = [(vertix, 0)]
+        return [(node, distance) for node, distance, _ in self.iter_bfs(vertix) if distance > 0]
+
+    @cached_analysis
+    def strongly_connected_components(self):
+        'Decompõe o grafo nas suas componentes fortemente ligadas, devolvidas por ordem topológica'
+
+        components = strongly_connected_components(self.graph_map.keys(), self.graph_map.__getitem__)
+        return components[::-1]
 
-        while len(visited_nodes) > 0:
-            node, distance = visited_nodes.pop(0)
+    def condensation(self):
+        """
+            Retorna as componentes fortemente ligadas (por ordem topológica), o índice da componente
+            de cada nó e o grafo acíclico (DAG) das componentes, cujos nós são esses índices
+        """
+        components, component_of, dag = self.__condensation()
+        return copy_result(components), copy_result(component_of), dag.fork()
 
-            if node != vertix:
-                result.append((node, distance))
+    @cached_analysis(shared = True)
+    def __condensation(self):
+        'Condensação partilhada pelas consultas internas, que não a alteram nem a devolvem'
 
-            for element in self.graph_map[node]:
-                if not is_in_tuple_list(visited_nodes, element) and not is_in_tuple_list(result, element):
-                    visited_nodes.append((element, distance + 1))
+        components = self.strongly_connected_components()
+        component_of = {node: position for position, component in enumerate(components) for node in component}
 
-        return result
+        dag = Graph()
+        for position in range(len(components)):
+            dag.add_vertex(position)
 
-    def node_has_cycle(self, vertix):
-        list_nodes = [vertix]
-        visited = [vertix]
+        for node, successors in self.graph_map.items():
+            for element in successors:
+                if component_of[node] != component_of[element]:
+                    dag.add_edge(component_of[node], component_of[element])
 
-        while len(list_nodes) > 0:
-            node = list_nodes.pop(0)
+        return components, component_of, dag
 
-            for element in self.graph_map[node]:
-                if element == vertix:
-                    return True
+    @cached_analysis(query = True)
+    def reachable_targets(self, targets):
+        """
+            Dá, para cada nó, o conjunto dos nós de targets alcançáveis a partir dele, num inteiro em que o bit i
+            corresponde a targets[i]. Os conjuntos são propagados no DAG das componentes por ordem topológica inversa,
+            pelo que uma só passagem responde para todos os nós. Cada nó alcança os nós da sua componente, incluindo-se a si próprio
+        """
+        components, component_of, dag = self.__condensation()
+        bits = [0] * len(components)
 
-                elif element not in visited:
-                    list_nodes.append(element)
-                    visited.append(element)
+        for position, target in enumerate(targets):
+            bits[component_of[target]] |= 1 << position
 
-        return False
+        for position in range(len(components) - 1, -1, -1):
+            for successor in dag.get_successors(position):
+                bits[position] |= bits[successor]
+
+        return {node: bits[position] for node, position in component_of.items()}
+
+    def node_has_cycle(self, vertix):
+        'Verifica se existe um caminho de vertix para si próprio, pela componente de vertix na condensação do grafo'
+
+        components, component_of, _ = self.__condensation()
+        if vertix not in component_of:
+            return False
+
+        return len(components[component_of[vertix]]) > 1 or vertix in self.graph_map[vertix]
 
     def has_cycle(self):
-        for key in self.graph_map.keys():
-            if self.node_has_cycle(key):
+        for component in self.strongly_connected_components():
+            if len(component) > 1 or component[0] in self.graph_map[component[0]]:
                 return True
 
         return False
@@ -212,20 +330,21 @@ class Graph:
     def size(self):
         return len(self.get_nodes()), len(self.get_edges())
 
+    @cached_analysis
     def all_degrees(self, deg_type = "inout"):
         'calcula os graus de entrada e saida'
 
+        if deg_type == "inout" and self.statistics is not None:
+            return dict(self.statistics.inout)
+
         degrees = {}
         for node in self.graph_map.keys():
-            if deg_type == "out" or deg_type == "inout":
+            if deg_type == "out":
                 degrees[node] = len(self.graph_map[node])
+            elif deg_type == "in":
+                degrees[node] = len(self.reverse_graph_map[node])
             else:
-                degrees[node] = 0
-        if deg_type == "in" or deg_type == "inout":
-            for node in self.graph_map.keys():
-                for edge in self.graph_map[node]:
-                    if deg_type == "in" or node not in self.graph_map[edge]:
-                        degrees[edge] = degrees[edge] + 1
+                degrees[node] = len(self.graph_map[node] | self.reverse_graph_map[node])
         return degrees
 
     def mean_degrre(self, deg_type = "inout"):
@@ -236,51 +355,65 @@ class Graph:
     def prob_degree(self, deg_type="inout"):
         'calcula a probabilidade de um nó ter um grau k'
 
-        degrees = self.all_degrees(deg_type)
-        res = {}
-        for k in degrees.keys():
-            if degrees[k] in res.keys():
-                res[degrees[k]] += 1
-            else:
-                res[degrees[k]] = 1
-        for k in res.keys():
-            res[k] /= float(len(degrees))
-        return res
+        histogram = self.degree_histogram(deg_type)
+        number_nodes = float(len(self.graph_map))
+        return {degree: count / number_nodes for degree, count in histogram.items()}
+
+    @cached_analysis
+    def distance_statistics(self, block_size=DEFAULT_BLOCK_SIZE):
+        """
+            Calcula numa só passagem sobre a matriz de distâncias (por blocos de origens)
+            a closeness e a excentricidade de cada nó, a distância média e a fração de pares atingíveis
+        """
+        compact = self.freeze()
+        totals, reachable, eccentricity = distance_sums(compact, block_size=block_size)
+        return summarize_distances(compact.names, totals, reachable, eccentricity)
 
     def mean_distances(self):
         'média dos comprimentos dos caminhos'
-        tot = 0
-        num_reachable = 0
-        for k in self.graph_map.keys():
-            distsk = self.reachable_with_dist(k)
-            for _, dist in distsk:
-                tot += dist
-            num_reachable += len(distsk)
-        meandist = float(tot) / num_reachable
-        n = len(self.get_nodes())
-        return meandist, float(num_reachable) / ((n - 1) * n)
+        statistics = self.distance_statistics()
+        return statistics["mean_distance"], statistics["reachability"]
+
+    def eccentricities(self):
+        'maior distância de cada nó aos nós atingíveis a partir dele'
+        return self.distance_statistics()["eccentricity"]
+
+    @cached_analysis
+    def undirected_adjacency(self):
+        'Índice dos adjacentes (sucessores e antecessores) de todos os nós, sob a forma de conjuntos'
+
+        return {node: self.graph_map[node] | self.reverse_graph_map[node] for node in self.graph_map.keys()}
 
     def clustering_coef(self, v):
         """
             número de arcos entre vizinhos de um nó
             número total de arcos que poderiam existir entre vizinhos do nó 
         """
-        adjs = self.get_adjacents(v)
+        adjs = self.graph_map[v] | self.reverse_graph_map[v]
         if len(adjs) <= 1: return 0.0
         ligs = 0
         for i in adjs:
-            for j in adjs:
-                if i != j:
-                    if j in self.graph_map[i] or i in self.graph_map[j]:
-                        ligs = ligs + 1
+            adjs_i = self.graph_map[i] | self.reverse_graph_map[i]
+            ligs += len(adjs & adjs_i) - (i in adjs_i)
         return float(ligs) / (len(adjs) * (len(adjs) - 1))
 
+    @cached_analysis
     def all_clustering_coefs(self):
-        'média de coeficiente de clustering sobre todos os nós'
+        """
+            coeficientes de clustering de todos os nós numa só passagem:
+            os triângulos são contados por interseção dos conjuntos de adjacentes
+        """
+        adjacency = self.undirected_adjacency()
 
         ccs = {}
-        for k in self.graph_map.keys():
-            ccs[k] = self.clustering_coef(k)
+        for k, adjs in adjacency.items():
+            if len(adjs) <= 1:
+                ccs[k] = 0.0
+                continue
+            ligs = 0
+            for i in adjs:
+                ligs += len(adjs & adjacency[i]) - (i in adjacency[i])
+            ccs[k] = float(ligs) / (len(adjs) * (len(adjs) - 1))
         return ccs
 
     def mean_clustering_coef(self):
@@ -290,7 +423,13 @@ class Graph:
         return sum(ccs.values()) / float(len(ccs))
 
     def mean_clustering_perdegree(self, deg_type="inout"):
-        degs = self.all_degrees(deg_type)
+        'média dos coeficientes de clustering dos nós com o mesmo grau'
+
+        adjacency = self.undirected_adjacency()
+        if deg_type == "inout":
+            degs = {k: len(adjs) for k, adjs in adjacency.items()}
+        else:
+            degs = self.all_degrees(deg_type)
         ccs = self.all_clustering_coefs()
         degs_k = {}
         for k in degs.keys():
@@ -330,16 +469,20 @@ class Graph:
         
         return round(number_nodes/len(list_paths), 2)
 
+    @cached_analysis
+    def all_betweenness_centrality(self, normalized=True):
+        'Calculates the betweenness centrality of every node at once (Brandes algorithm).'
+
+        return betweenness_centrality(self.graph_map.keys(), self.graph_map.__getitem__, normalized)
+
     def closeness_centrality(self, vertex):
         'Implements the calculation of the closeness centrality value.'
 
-        distance_value = 0
-        list_nodes = self.get_nodes()
-        list_nodes.remove(vertex)
+        distance_value = sum(distance for _, distance, _ in self.iter_bfs(vertex))
+
+        return 0.0 if distance_value == 0 else 1.0 / distance_value
 
-        for node in list_nodes:
-            distance_between_nodes = self.distance(vertex, node)
-            if distance_between_nodes is not None:
-                distance_value += distance_between_nodes
+    def all_closeness_centrality(self):
+        'Calculates the closeness centrality of every node from a single all-pairs distance pass.'
 
-        return 0 if distance_value == 0 else 1 // distance_value
+        return self.distance_statistics()["closeness"]
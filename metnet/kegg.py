@@ -0,0 +1,259 @@
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+import threading
+import time
+import urllib.error
+import urllib.request
+
+'''
+    Retrieval of KEGG entries. The entries are requested in batches (the KEGG REST API accepts up to
+    10 entries per get), the batches run over a bounded pool of threads with a shared rate limit, and the
+    failed requests are retried with exponential backoff. The transport is pluggable, so the client can be
+    pointed at a local stand-in of the KEGG server.
+'''
+
+MAX_ENTRIES_PER_GET = 10
+DEFAULT_WORKERS = 4
+DEFAULT_REQUESTS_PER_SECOND = 3
+DEFAULT_RETRIES = 3
+DEFAULT_BACKOFF = 1.0
+
+
+class BiopythonTransport:
+
+    '''
+        Transport over Bio.KEGG.REST.
+    '''
+
+    def __init__(self):
+        from Bio.KEGG import REST # Biopython só é importado quando é usado
+        self.rest = REST
+
+    def get(self, entries):
+        return self.rest.kegg_get(list(entries)).read()
+
+    def link(self, target, source):
+        return self.rest.kegg_link(target, source).read()
+
+    def list(self, database, organism=None):
+        return self.rest.kegg_list(database, organism).read()
+
+
+class HTTPTransport:
+
+    '''
+        Transport over plain HTTP. base_url can point to any server with the KEGG REST interface.
+    '''
+
+    def __init__(self, base_url="https://rest.kegg.jp", timeout=30):
+        self.base_url = base_url.rstrip("/")
+        self.timeout = timeout
+
+    def request(self, path):
+        with urllib.request.urlopen(self.base_url + "/" + path, timeout=self.timeout) as response:
+            return response.read().decode("utf-8")
+
+    def get(self, entries):
+        return self.request("get/" + "+".join(entries))
+
+    def link(self, target, source):
+        return self.request("link/" + target + "/" + source)
+
+    def list(self, database, organism=None):
+        return self.request("list/" + database + ("/" + organism if organism else ""))
+
+
+class RateLimiter:
+
+    '''
+        Spaces the requests of all threads by at least 1 / requests_per_second seconds.
+    '''
+
+    def __init__(self, requests_per_second):
+        self.interval = 1.0 / requests_per_second if requests_per_second else 0.0
+        self.next_time = 0.0
+        self.lock = threading.Lock()
+
+    def wait(self):
+        with self.lock:
+            now = time.monotonic()
+            start = max(now, self.next_time)
+            self.next_time = start + self.interval
+
+        if start > now:
+            time.sleep(start - now)
+
+
+def split_entries(flat_files):
+    'Splits a response with several concatenated flat files (ended by "///") in a dictionary entry id -> flat file.'
+
+    entries = {}
+    lines = []
+
+    for line in flat_files.splitlines(True):
+        if line.startswith("///"):
+            if lines and lines[0].startswith("ENTRY"):
+                entries[lines[0].split()[1]] = "".join(lines)
+            lines = []
+        elif line.strip():
+            lines.append(line)
+
+    return entries
+
+
+def parse_equation(flat_file):
+    'Returns the equation of a reaction flat file, or None.'
+
+    for line in flat_file.splitlines():
+        if line.startswith("EQUATION"):
+            return line.replace("EQUATION", "").strip()
+
+    return None
+
+
+def parse_links(links):
+    'Returns the targets of the tab-separated links of a response, without the database prefix (e.g. "rn:").'
+
+    return [line.split("\t")[1].split(":")[-1] for line in links.splitlines() if "\t" in line]
+
+
+def organism_maps(pathways, organism):
+    'Converts the tab-separated list of pathways of an organism (e.g. hsa00010) to the reference maps (map00010).'
+
+    return ["map" + line.split("\t")[0].split(":")[-1][len(organism):]
+            for line in pathways.splitlines() if "\t" in line]
+
+
+def make_batches(entries, size=MAX_ENTRIES_PER_GET):
+    return [entries[start:start + size] for start in range(0, len(entries), size)]
+
+
+class KEGGOfflineError(LookupError):
+
+    '''
+        Error raised in offline mode when a response is not in the cache.
+    '''
+
+
+class KEGGClient:
+
+    '''
+        Client of the KEGG REST API with batched, concurrent and rate-limited requests.
+        With a cache (KEGGResponseCache) the responses are reused between runs; in offline mode
+        the network is never used and a missing response raises KEGGOfflineError.
+    '''
+
+    def __init__(self, transport=None, workers=DEFAULT_WORKERS, requests_per_second=DEFAULT_REQUESTS_PER_SECOND,
+                 retries=DEFAULT_RETRIES, backoff=DEFAULT_BACKOFF, cache=None, offline=False):
+        self.transport = transport if transport is not None else BiopythonTransport()
+        self.workers = workers
+        self.rate_limiter = RateLimiter(requests_per_second)
+        self.retries = retries
+        self.backoff = backoff
+        self.cache = cache
+        self.offline = offline
+
+    def call(self, function, *arguments):
+        'Calls the transport, retrying with exponential backoff. A 404 (no entry found) is an empty response.'
+
+        for attempt in range(self.retries + 1):
+            self.rate_limiter.wait()
+            try:
+                return function(*arguments)
+
+            except urllib.error.HTTPError as error:
+                if error.code == 404:
+                    return ""
+                if attempt == self.retries or (error.code < 500 and error.code != 429):
+                    raise
+
+            except OSError:
+                if attempt == self.retries:
+                    raise
+
+            time.sleep(self.backoff * 2 ** attempt)
+
+    def cached(self, key):
+        'Returns the cached response of the request, or None.'
+
+        return self.cache.get(key) if self.cache is not None else None
+
+    def request(self, key, function, *arguments):
+        'Returns the response of a request, from the cache when available.'
+
+        response = self.cached(key)
+        if response is not None:
+            return response
+
+        if self.offline:
+            raise KEGGOfflineError(key + " is not in the cache")
+
+        response = self.call(function, *arguments)
+        if self.cache is not None:
+            self.cache.put(key, response)
+
+        return response
+
+    def link(self, target, source):
+        'Returns the tab-separated links of source to the database target (e.g. link("rn", "map00061")).'
+
+        return self.request("link/" + target + "/" + source, self.transport.link, target, source)
+
+    def list(self, database, organism=None):
+        'Returns the tab-separated entries of a database (e.g. list("pathway", "hsa")).'
+
+        key = "list/" + database + ("/" + organism if organism else "")
+        return self.request(key, self.transport.list, database, organism)
+
+    def get_batch(self, entries):
+        '''
+            Gets up to 10 entries in one request and returns a dictionary entry id -> flat file.
+            The entries not found are cached as empty responses.
+        '''
+        flat_files = split_entries(self.call(self.transport.get, entries))
+
+        if self.cache is not None:
+            self.cache.put_many(("get/" + entry, flat_files.get(entry, "")) for entry in entries)
+
+        return flat_files
+
+    def iter_entries(self, entries, include_missing=False):
+        '''
+            Yields (entry id, flat file) for the entries found, in the order of the entries.
+            The cached entries are yielded at once; the others are requested in batches.
+            With include_missing, the entries that KEGG does not have are also yielded, with None as flat file.
+        '''
+        entries = deque(entry.split(":")[-1] for entry in entries)
+        responses = {}
+        for entry in entries:
+            response = self.cached("get/" + entry)
+            if response is not None:
+                responses[entry] = response
+
+        missing = [entry for entry in dict.fromkeys(entries) if entry not in responses]
+        if missing and self.offline:
+            raise KEGGOfflineError(", ".join(missing[:10]) + " not in the cache (%d missing)" % len(missing))
+
+        batches = make_batches(missing)
+
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            results = executor.map(self.get_batch, batches)
+
+            for batch in batches:
+                flat_files = next(results)
+                responses.update((entry, flat_files.get(entry, "")) for entry in batch)
+
+                # devolve, por ordem, todas as entradas já disponíveis
+                while entries and entries[0] in responses:
+                    entry = entries.popleft()
+                    if responses[entry] or include_missing:
+                        yield entry, responses[entry] or None
+
+            for entry in entries:
+                if responses[entry] or include_missing:
+                    yield entry, responses[entry] or None
+
+    def get_entries(self, entries):
+        'Returns a dictionary entry id -> flat file with all the entries found.'
+
+        return dict(self.iter_entries(entries))
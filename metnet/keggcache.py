@@ -0,0 +1,161 @@
+from .shared import cache_directory
+import os
+import sqlite3
+import threading
+import time
+
+'''
+    Persistent cache of the KEGG REST responses, stored in a SQLite database and keyed by request
+    (e.g. "get/R00001" or "link/rn/map00061"). The entries expire after a configurable time to live,
+    and the least recently used ones are evicted when the cache grows beyond its size cap.
+
+    A hit does not write to the database: the access times are only refreshed when they are older than
+    ACCESS_RESOLUTION, and those updates are written in batches, with the next write or when the cache is closed.
+    The total size is kept as a running sum, so a put does not scan the table.
+'''
+
+DEFAULT_TTL = 30 * 24 * 3600 # seconds
+DEFAULT_MAX_BYTES = 512 << 20
+ACCESS_RESOLUTION = 60 # seconds
+ACCESS_BATCH = 256
+
+
+def default_cache_path():
+    'Path of the cache database.'
+
+    return os.path.join(cache_directory(), "kegg.sqlite")
+
+
+class KEGGResponseCache:
+
+    '''
+        SQLite-backed store of KEGG responses with time to live, size cap (LRU eviction) and hit/miss statistics.
+        It can be shared by the threads of a KEGGClient.
+    '''
+
+    def __init__(self, path=None, ttl=DEFAULT_TTL, max_bytes=DEFAULT_MAX_BYTES):
+        self.path = path or default_cache_path()
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.lock = threading.Lock()
+        self.accessed = {} # key -> tempo do último acesso, ainda por escrever
+
+        if self.path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+
+        self.connection = sqlite3.connect(self.path, check_same_thread=False)
+        with self.connection:
+            self.connection.execute("CREATE TABLE IF NOT EXISTS responses (key TEXT PRIMARY KEY, value TEXT NOT NULL, "
+                                    "size INTEGER NOT NULL, created REAL NOT NULL, accessed REAL NOT NULL)")
+            self.connection.execute("CREATE INDEX IF NOT EXISTS responses_accessed ON responses (accessed)")
+        self.total = self.connection.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+
+    def get(self, key):
+        'Returns the cached response, or None when it is missing or expired.'
+
+        now = time.time()
+        with self.lock:
+            row = self.connection.execute("SELECT value, created, accessed FROM responses WHERE key = ?",
+                                          (key,)).fetchone()
+
+            if row is None or (self.ttl is not None and now - row[1] > self.ttl):
+                self.misses += 1
+                return None
+
+            if now - row[2] >= ACCESS_RESOLUTION:
+                self.accessed[key] = now
+                if len(self.accessed) >= ACCESS_BATCH:
+                    with self.connection:
+                        self.__write_accessed()
+            self.hits += 1
+            return row[0]
+
+    def put(self, key, value):
+        'Stores a response and evicts the least recently used ones if the cache is over its size cap.'
+
+        self.put_many([(key, value)])
+
+    def put_many(self, items):
+        'Stores several (key, response) pairs in one transaction.'
+
+        now = time.time()
+        rows = {key: (key, value, len(value.encode("utf-8")), now, now) for key, value in items}
+
+        with self.lock, self.connection:
+            for key, _, size, _, _ in rows.values():
+                previous = self.connection.execute("SELECT size FROM responses WHERE key = ?", (key,)).fetchone()
+                self.total += size - (previous[0] if previous else 0)
+                self.accessed.pop(key, None)
+
+            self.connection.executemany("INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?)", rows.values())
+            self.__write_accessed()
+            self.__evict()
+
+    def __write_accessed(self):
+        'Writes the pending access times in one statement.'
+
+        if self.accessed:
+            self.connection.executemany("UPDATE responses SET accessed = ? WHERE key = ?",
+                                        [(accessed, key) for key, accessed in self.accessed.items()])
+            self.accessed.clear()
+
+    def __evict(self):
+        'Deletes the least recently used responses until the total size is within max_bytes.'
+
+        if self.max_bytes is None:
+            return
+
+        while self.total > self.max_bytes:
+            # quantas respostas de tamanho médio cobrem o excesso; as mais antigas são apagadas de uma vez
+            entries = self.connection.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+            if not entries:
+                self.total = 0
+                break
+            number = max(1, -(-(self.total - self.max_bytes) * entries // self.total))
+
+            oldest = "SELECT key, size FROM responses ORDER BY accessed LIMIT ?"
+            freed, deleted = self.connection.execute("SELECT COALESCE(SUM(size), 0), COUNT(*) FROM (" + oldest + ")",
+                                                     (number,)).fetchone()
+            self.connection.execute("DELETE FROM responses WHERE key IN (SELECT key FROM (" + oldest + "))", (number,))
+            self.total -= freed
+            self.evictions += deleted
+
+    def purge_expired(self):
+        'Deletes the expired responses.'
+
+        if self.ttl is None:
+            return
+
+        limit = time.time() - self.ttl
+        with self.lock, self.connection:
+            freed = self.connection.execute("SELECT COALESCE(SUM(size), 0) FROM responses WHERE created < ?",
+                                            (limit,)).fetchone()[0]
+            self.connection.execute("DELETE FROM responses WHERE created < ?", (limit,))
+            self.total -= freed
+
+    def clear(self):
+        with self.lock, self.connection:
+            self.connection.execute("DELETE FROM responses")
+            self.accessed.clear()
+            self.total = 0
+
+    def statistics(self):
+        'Returns the hits, misses and evictions since the cache was opened, and the entries and bytes stored.'
+
+        with self.lock:
+            entries, size = self.connection.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses").fetchone()
+
+        return {"hits": self.hits, "misses": self.misses, "evictions": self.evictions, "entries": entries, "bytes": size}
+
+    def flush(self):
+        'Writes the pending access times.'
+
+        with self.lock, self.connection:
+            self.__write_accessed()
+
+    def close(self):
+        self.flush()
+        self.connection.close()
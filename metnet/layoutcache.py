@@ -0,0 +1,139 @@
+from .shared import cache_directory
+import hashlib
+import os
+import zipfile
+import numpy as np
+
+'''
+    Disk cache of the layouts of the networks. The layouts are keyed by a hash of the node set, of the edge set
+    and of the layout parameters, and stored as npz files with the node names and the coordinates (float32).
+    When a network is not in the cache, a recent layout that has most of its nodes is used as starting point,
+    so adding a few reactions to a network does not compute its layout from scratch.
+'''
+
+DEFAULT_MAX_LAYOUTS = 64
+WARM_START_CANDIDATES = 8
+MIN_OVERLAP = 0.9
+
+
+def layout_key(names, sources, targets, *parameters):
+    'Hash of the node set, of the edge set and of the parameters, independent of the order of the nodes and edges.'
+
+    order = sorted(range(len(names)), key=names.__getitem__)
+    rank = np.empty(len(names), dtype=np.int64)
+    rank[order] = np.arange(len(names))
+    edges = np.unique(rank[sources] * len(names) + rank[targets])
+
+    digest = hashlib.sha256()
+    digest.update("\n".join(names[node] for node in order).encode("utf-8"))
+    digest.update(edges.tobytes())
+    digest.update(repr(parameters).encode("utf-8"))
+
+    return digest.hexdigest()
+
+
+class LayoutCache:
+
+    '''
+        Directory of npz files with the layouts, one per network and layout parameters.
+        When it has more than max_layouts, the least recently used ones are deleted.
+    '''
+
+    def __init__(self, directory=None, max_layouts=DEFAULT_MAX_LAYOUTS, min_overlap=MIN_OVERLAP):
+        self.directory = directory or os.path.join(cache_directory(), "layouts")
+        self.max_layouts = max_layouts
+        self.min_overlap = min_overlap
+        self.hits = 0
+        self.misses = 0
+        self.warm_starts = 0
+
+        os.makedirs(self.directory, exist_ok=True)
+
+    def path(self, key):
+        return os.path.join(self.directory, key + ".npz")
+
+    def entries(self):
+        'Paths of the cached layouts, the most recently used first.'
+
+        paths = [os.path.join(self.directory, name) for name in os.listdir(self.directory) if name.endswith(".npz")]
+        return sorted(paths, key=os.path.getmtime, reverse=True)
+
+    def read(self, path):
+        'Returns (names, layout, coordinates) of a cached layout, or None if it is missing or corrupt.'
+
+        try:
+            with np.load(path) as data:
+                return data["names"].tolist(), str(data["layout"]), data["coordinates"].astype(np.float64)
+        except (OSError, KeyError, ValueError, zipfile.BadZipFile):
+            return None
+
+    def get(self, key, names):
+        'Returns the coordinates of the cached layout in the order of names, or None.'
+
+        entry = self.read(self.path(key))
+        if entry is None:
+            self.misses += 1
+            return None
+
+        os.utime(self.path(key))
+        self.hits += 1
+
+        if entry[0] == names:
+            return entry[2]
+
+        index = dict(zip(entry[0], range(len(entry[0]))))
+        return entry[2][[index[name] for name in names]]
+
+    def put(self, key, names, layout, coordinates):
+        'Stores a layout, deleting the least recently used ones if the cache is full.'
+
+        temporary_path = self.path(key) + ".tmp"
+        with open(temporary_path, "wb") as out_file:
+            np.savez(out_file, names=np.array(names, dtype=str), layout=np.array(layout),
+                     coordinates=np.asarray(coordinates, dtype=np.float32))
+        os.replace(temporary_path, self.path(key))
+
+        for path in self.entries()[self.max_layouts:]:
+            os.remove(path)
+
+    def warm_start(self, names, sources, targets, layout, dim):
+        """
+            Looks among the recent layouts for one with the same parameters and at least min_overlap of the nodes,
+            and returns the initial coordinates for the network: the cached ones for the known nodes, the mean of
+            the known neighbours (or the centre) for the new ones. Returns None when there is no such layout.
+        """
+        best, best_overlap = None, self.min_overlap
+
+        for path in self.entries()[:WARM_START_CANDIDATES]:
+            entry = self.read(path)
+            if entry is None or entry[1] != layout or entry[2].shape[1] != dim:
+                continue
+
+            index = dict(zip(entry[0], range(len(entry[0]))))
+            positions = np.fromiter((index.get(name, -1) for name in names), dtype=np.int64, count=len(names))
+            overlap = np.count_nonzero(positions >= 0) / max(len(names), 1)
+            if overlap >= best_overlap:
+                best, best_overlap = (positions, entry[2]), overlap
+
+        if best is None:
+            return None
+
+        positions, coordinates = best
+        known = positions >= 0
+        seed = np.zeros((len(names), dim))
+        seed[known] = coordinates[positions[known]]
+
+        # os nós novos começam na média dos vizinhos já colocados
+        sums, counts = np.zeros((len(names), dim)), np.zeros(len(names))
+        for nodes, neighbours in ((sources, targets), (targets, sources)):
+            placed = known[neighbours] & ~known[nodes]
+            np.add.at(sums, nodes[placed], seed[neighbours[placed]])
+            np.add.at(counts, nodes[placed], 1)
+
+        new = ~known
+        centre = seed[known].mean(axis=0)
+        seed[new] = np.where(counts[new, None] > 0, sums[new] / np.maximum(counts[new], 1)[:, None], centre)
+        seed[new] += np.random.default_rng(0).normal(scale=0.1, size=(np.count_nonzero(new), dim))
+
+        self.warm_starts += 1
+        return seed
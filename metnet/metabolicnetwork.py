@@ -1,15 +1,21 @@
+from .cache import cached_analysis
+from .csrgraph import CSRGraph
 from .graph import Graph
+from .kegg import MAX_ENTRIES_PER_GET, KEGGClient, organism_maps, parse_equation, parse_links
+from .keggcache import KEGGResponseCache
+from .layoutcache import LayoutCache
+from .parallel import parallel_betweenness_centrality, parallel_distance_statistics
+from .reactiontable import ReactionTable
+from .reader import DEFAULT_BATCH_SIZE, NetworkFormatError, is_compressed, parse_reaction, read_reactions, read_shards
+from .scope import ScopeEngine
 from .shared import InputOptions
+from .snapshot import METABOLITE, REACTION, SnapshotError, is_current, read_snapshot, snapshot_path, write_snapshot
+from collections import Counter
+from contextlib import nullcontext
+import gc
+import heapq
 import os
-import io
-from Bio.KEGG import REST
-from Bio.KEGG.KGML import KGML_parser
-import pandas as pd 
-import networkx as nx
-import matplotlib.pyplot as plt
-import igraph as ig #para instalar o package igraph em windows seguir o ficheiro txt Instalar_igraph
-from plotly.offline import plot
-import plotly.graph_objs as go
+import numpy as np
 
 class MetabolicNetwork:
 
@@ -19,10 +25,32 @@ class MetabolicNetwork:
 
     def __init__(self, network_type = "metabolite-reaction"):
         self.__graph = Graph()
+        self.__reactions = ReactionTable()
+        self.__reaction_ids = set()
+        self.__metabolite_ids = {} # ordem de inserção
+
+    @property
+    def version(self):
+        'Version of the Graph, changed by every new node or edge.'
+        return self.__graph.version
+
+    @property
+    def graph(self):
+        'The Graph of the network (a CSRGraph when it is compact). It should only be changed through the network.'
+        return self.__graph
+
+    @property
+    def analysis_cache(self):
+        'Cache of the analysis results, shared with the Graph.'
+        return self.__graph.analysis_cache
 
     def add_metabolites_irreversible(self, substract, product, reaction):
         'Adds metabolites of the irreversible reactions to the Graph.'
 
+        self.__check_writable()
+        self.__reaction_ids.add(reaction)
+        self.__metabolite_ids.update(dict.fromkeys(metabolite.strip() for metabolite in list(substract) + list(product)))
+
         for metabolite in substract:
             metabolite_id = metabolite.strip()
 
@@ -39,6 +67,10 @@ class MetabolicNetwork:
 
     def add_metabolites_reversible(self, metabolites, reaction_id):
         'Adds metabolites of the reversible reactions to the Graph.'
+
+        self.__check_writable()
+        self.__reaction_ids.add(reaction_id)
+        self.__metabolite_ids.update(dict.fromkeys(metabolite.strip() for metabolite in metabolites))
   
         for metabolite in metabolites:
             metabolite_id = metabolite.strip()
@@ -60,210 +92,507 @@ class MetabolicNetwork:
 
         return substract, product    
 
-    def create(self, filepath, network_type = 'metabolite-reaction'):
-        'Creates objects of type MetabolicNetwork according to the file.'
-
-        metabolic_network = MetabolicNetwork(network_type)      
-        with open(filepath, "r") as in_file:
-            for line in in_file:
-                if ":" in line:
-                    tokens = line.split(":")
-                    reaction_id = tokens[0].strip()
-                    metabolic_network.__graph.add_vertex(reaction_id)
-                    remaining_line = tokens[1]
-
-                    if "<=>" in remaining_line:
-                        met_substract, met_product = metabolic_network.parse_metabolites(remaining_line, "<=>")
-                        metabolic_network.add_metabolites_reversible(met_substract, reaction_id)
-                        metabolic_network.add_metabolites_reversible(met_product, reaction_id)
-
-                    elif "=>" in remaining_line:
-                        met_substract, met_product = metabolic_network.parse_metabolites(remaining_line, "=>")
-                        metabolic_network.add_metabolites_irreversible(met_substract, met_product, reaction_id)
-                    
-                    else:
-                        return None
+    def freeze(self):
+        'Replaces the Graph by its compact, array-backed (CSR) form. The network becomes read-only.'
+
+        self.__graph = self.__graph.freeze()
+        return self
+
+    @classmethod
+    def create(cls, source, network_type = 'metabolite-reaction', compact = False, batch_size = DEFAULT_BATCH_SIZE,
+               workers = 1):
+        """
+            Creates objects of type MetabolicNetwork according to the file.
+            The source can be a path, an open file or an iterable of lines; gzip, bz2 and xz files are
+            decompressed transparently. Raises NetworkFormatError with the line number of an invalid reaction.
+            With workers > 1, an uncompressed file is split on line boundaries and parsed in a pool of processes.
+        """
+        metabolic_network = cls(network_type)
+
+        # a carga cria milhões de objetos que ficam vivos (conjuntos de adjacência, nomes); com o GC ativo, as
+        # coleções completas disparadas por eles percorrem repetidamente todos os objetos já criados
+        gc_enabled = gc.isenabled()
+        gc.disable()
+        try:
+            if workers > 1 and isinstance(source, (str, os.PathLike)) and not is_compressed(source):
+                for table in read_shards(source, workers):
+                    metabolic_network.__reactions.extend(table)
+            else:
+                for reactions in read_reactions(source, batch_size):
+                    metabolic_network.__reactions.add_batch(reactions)
+
+            metabolic_network.__build_graph(compact)
+        finally:
+            if gc_enabled:
+                gc.enable()
 
         return metabolic_network
 
-    def get_active_reactions(self, list_metabolites):
-        'Obtains the reactions activated through of the list of metabolites.'
-       
-        list_reactions = self.__get_reactions_from_metabolites(list_metabolites)
-        metabolite_subtract = self.__get_subtract_from_reactions(list_reactions)
-        
-        return self.__delete_duplicates([reaction for reaction, metabolites in metabolite_subtract.items()\
-                                        for metabolite in metabolites if metabolite in list_metabolites])
-
-    def generate_metabolic_networks(self, pathway):
-        'Creates a file with the equations of the given pathway. '
-       
-        list_equations = self.__retrieve_equations(pathway)
-        
-        return self.__write_metabolic_network(list_equations, pathway)
+    @classmethod
+    def from_kegg(cls, pathway, network_type = 'metabolite-reaction', client = None, output = None, compact = False):
+        """
+            Creates an object MetabolicNetwork with the reactions of the given pathway, retrieved from the KEGG API,
+            without going through the text file. If output is given, the equations are also written to that file.
+        """
+        metabolic_network = cls(network_type)
+        for _ in metabolic_network.stream_kegg(pathway, client, output = output):
+            pass
+
+        if compact:
+            metabolic_network.freeze()
 
-    def get_centrality_measures(self):
-        'Obtains a centrality measures of the object MetabolicNetwork.'
+        return metabolic_network
 
-        betweeness_centrality_value = sorted([(node, self.__graph.betweeness_centrality(node))\
-                                     for node in self.__graph.get_nodes()], key = lambda x: x[1],\
-                                     reverse = True)
+    def save(self, path, source = None):
+        """
+            Saves the network in a binary snapshot (names, node types, CSR arrays and packed reactions).
+            source is the network file it was parsed from, recorded to detect stale snapshots.
+        """
+        compact_graph = self.__graph.freeze()
+        types = [REACTION if node in self.__reaction_ids else METABOLITE for node in compact_graph.names]
+
+        write_snapshot(path, compact_graph.names, types, compact_graph.out_offsets, compact_graph.out_targets,
+                       compact_graph.in_offsets, compact_graph.in_targets,
+                       self.__reactions.pack(compact_graph.index), source)
+
+    @classmethod
+    def load(cls, path, source = None, verify = True, network_type = 'metabolite-reaction', compact = False):
+        """
+            Loads a network saved by save, with its reactions (direction and stoichiometry), as it was parsed.
+            With compact, the Graph is the read-only CSRGraph over the memory-mapped arrays.
+            Raises SnapshotError if the snapshot is corrupt or stale with respect to source.
+        """
+        names, types, out_offsets, out_targets, in_offsets, in_targets, reactions = read_snapshot(path, source, verify)
+
+        metabolic_network = cls(network_type)
+        metabolic_network.__graph = CSRGraph(names, out_offsets, out_targets, in_offsets, in_targets)
+        if not compact:
+            metabolic_network.__graph = metabolic_network.__graph.thaw()
+
+        metabolic_network.__reactions = ReactionTable.unpack(names, *reactions)
+        metabolic_network.__reaction_ids = {names[node] for node in np.flatnonzero(types == REACTION).tolist()}
+        metabolic_network.__metabolite_ids = dict.fromkeys(names[node] for node in np.flatnonzero(types == METABOLITE).tolist())
+
+        return metabolic_network
+
+    @classmethod
+    def create_with_snapshot(cls, filepath, network_type = 'metabolite-reaction', compact = False, save = False):
+        """
+            Loads the snapshot of the file when it is current; otherwise parses the file, and saves its snapshot
+            when save is True.
+        """
+        path = snapshot_path(filepath)
+        if is_current(path, filepath):
+            try:
+                return cls.load(path, filepath, network_type = network_type, compact = compact)
+            except SnapshotError:
+                pass
+
+        metabolic_network = cls.create(filepath, network_type, compact = compact)
+        if save:
+            try:
+                metabolic_network.save(path, filepath)
+            except OSError:
+                pass
+
+        return metabolic_network
+
+    def __build_graph(self, compact = False):
+        """
+            Builds the Graph and the kinds of the nodes from the ReactionTable, in one pass over the arrays of its arcs.
+            With compact, the CSRGraph is kept as it is built, without going through the dict Graph.
+        """
+        table = self.__reactions
+        self.__reaction_ids = set(table)
+        self.__metabolite_ids = dict.fromkeys(name for name in table.names if name not in self.__reaction_ids)
+        self.__graph = CSRGraph.from_edges(table.names, *table.arcs())
+        if not compact:
+            self.__graph = self.__graph.thaw()
+
+    def __check_writable(self):
+        'Raises TypeError when the network is compact, before any of its bookkeeping is changed.'
+
+        if isinstance(self.__graph, CSRGraph):
+            raise TypeError("compact networks can not be changed")
+
+    def add_reactions(self, reactions):
+        """
+            Adds a batch of parsed reactions (reader.Reaction) to the Graph, keeping their stoichiometry in the
+            ReactionTable. The arcs are computed from its columns and fed to the Graph without intermediate lists.
+            A reaction that is already in the network is redefined: the arcs of its previous definition are removed.
+        """
+        self.__check_writable()
+
+        table = self.__reactions
+        first_row, first_name = len(table.reactions), len(table.names)
+        table.add_batch(reactions)
+
+        names = table.names
+        new_reactions = [names[node] for node in table.reactions[first_row:].tolist()]
+        for reaction_id in new_reactions:
+            if reaction_id in self.__reaction_ids:
+                self.__remove_arcs(reaction_id)
+        self.__reaction_ids.update(new_reactions)
+        self.__metabolite_ids.update(dict.fromkeys(name for name in names[first_name:] if name not in self.__reaction_ids))
+
+        # os nós são criados pela ordem em que aparecem no ficheiro
+        self.__graph.add_vertices(names[first_name:])
+        self.__graph.add_vertices(new_reactions) # as que já tinham nome na tabela (removidas e adicionadas de novo)
+
+        sources, targets = table.arcs(first_row)
+        self.__graph.add_edges(zip(map(names.__getitem__, sources.tolist()), map(names.__getitem__, targets.tolist())))
+
+    def __remove_arcs(self, reaction_id):
+        'Removes the arcs of a reaction, keeping its node.'
+
+        for successor in self.__graph.get_successors(reaction_id):
+            self.__graph.remove_edge(reaction_id, successor)
+        for predecessor in self.__graph.get_predecessors(reaction_id):
+            self.__graph.remove_edge(predecessor, reaction_id)
+
+    def add_reaction(self, reaction):
+        'Adds one reaction: a parsed reaction (reader.Reaction) or a line like "R1: M1 + M2 => M3".'
+
+        if isinstance(reaction, str):
+            line, reaction = reaction, parse_reaction(reaction)
+            if reaction is None:
+                raise NetworkFormatError("no reaction in " + repr(line))
+
+        self.add_reactions([reaction])
+
+    def remove_reaction(self, reaction_id):
+        """
+            Removes the reaction and its edges, in O(number of metabolites of the reaction); the metabolites are kept.
+            Returns the removed reaction (reader.Reaction), which can be given back to add_reaction, or None for a
+            reaction added without its definition (add_metabolites_irreversible/_reversible).
+            Raises KeyError if reaction_id is not a reaction of the network, e.g. a metabolite.
+        """
+        self.__check_writable()
+        if reaction_id not in self.__reaction_ids:
+            raise KeyError(reaction_id)
+
+        self.__graph.remove_vertex(reaction_id)
+        self.__reaction_ids.discard(reaction_id)
+
+        return self.__reactions.remove(reaction_id)
+
+    def remove_edge(self, initial_node, final_node):
+        'Removes one edge of the Graph, e.g. one metabolite of a reaction.'
+
+        self.__graph.remove_edge(initial_node, final_node)
+
+    def fork(self):
+        """
+            Returns a copy of the network for what-if scenarios. The Graph is copied on write: the two networks
+            share the adjacency sets, and only the ones of the nodes changed in either network are copied.
+        """
+        network = type(self)()
+        network.__graph = self.__graph.fork()
+        network.__reactions = self.__reactions.copy()
+        network.__reaction_ids = set(self.__reaction_ids)
+        network.__metabolite_ids = dict(self.__metabolite_ids)
+
+        return network
+
+    def get_stoichiometry(self, reaction_id):
+        'Obtains the stoichiometric coefficients of the substrates and of the products of the reaction.'
+
+        reaction = self.__reactions.get(reaction_id)
+        if reaction is None:
+            raise KeyError(reaction_id)
+
+        return dict(reaction.substrates), dict(reaction.products)
+
+    @cached_analysis(query = True)
+    def get_active_reactions(self, list_metabolites):
+        'Obtains the reactions activated through of the list of metabolites: the reactions fired in their scope.'
+
+        return set(self.__scope_engine().expand(list_metabolites)[1])
+
+    def get_scopes(self, seed_sets, knockouts = None):
+        """
+            Obtains the scope of each set of seed metabolites: (metabolites produced, reactions fired).
+            knockouts is a set of reactions removed in every scenario, or a list with one set per seed set.
+        """
+        return self.__scope_engine().expand_all(seed_sets, knockouts)
+
+    @cached_analysis(shared = True)
+    def __scope_engine(self):
+        """
+            Compiles the directions of the stored reactions. The arcs of the Graph do not give the direction of
+            the reversible reactions, so a reaction added without its definition raises ValueError.
+        """
+        undefined = self.__reaction_ids.difference(self.__reactions)
+        if undefined:
+            raise ValueError("reactions without direction and stoichiometry: " + ", ".join(sorted(undefined)))
+
+        return ScopeEngine(self.__reactions.directions())
+
+    def generate_metabolic_networks(self, pathway, client = None, output = None):
+        """
+            Creates a file with the equations of the given pathway (by default <pathway>_metabolicnetwork.txt).
+            The equations are written as they are retrieved to <output>.part, which is renamed to output at the end,
+            and the reactions done are recorded in <output>.checkpoint, so a run that is interrupted resumes
+            where it stopped. client is the KEGGClient used to retrieve them; by default the KEGG responses are kept
+            in the persistent cache (KEGGResponseCache).
+        """
+        client = client or KEGGClient(cache = KEGGResponseCache())
+        output = output or pathway + '_metabolicnetwork.txt'
+        partial_path, checkpoint_path = output + '.part', output + '.checkpoint'
+
+        done = self.__read_checkpoint(partial_path, checkpoint_path)
+        list_reactions = [reaction for reaction in self.__retrieve_reactions(pathway, client) if reaction not in done]
+
+        self.__write_metabolic_network(self.__retrieve_equations(list_reactions, client), partial_path, checkpoint_path)
+
+        os.replace(partial_path, output)
+        os.remove(checkpoint_path)
+
+        return output
+
+    def generate_pathway_networks(self, pathways = None, organism = None, client = None, merged = None):
+        """
+            Creates the files of several pathways (<pathway>_metabolicnetwork.txt) and, if merged is given, a file with
+            the union of their reactions. pathways is a list of pathway codes; with organism (e.g. "hsa") its pathways
+            are used, converted to the reference maps. Each distinct reaction is retrieved once: the line of a reaction
+            shared by several pathways is only kept until the last of them is written. Each pathway file is written
+            as in generate_metabolic_networks, with its .part and .checkpoint files, so an interrupted run resumes
+            where it stopped. The merged file is built from the pathway files. Returns the paths of the files written.
+        """
+        client = client or KEGGClient(cache = KEGGResponseCache())
+        pathways = list(pathways or [])
+        if organism is not None:
+            pathways += organism_maps(client.list('pathway', organism), organism)
+
+        pathway_reactions = {pathway: self.__retrieve_reactions(pathway, client) for pathway in dict.fromkeys(pathways)}
+        remaining = Counter(reaction for reactions in pathway_reactions.values() for reaction in dict.fromkeys(reactions))
+        shared_lines = {}
+
+        outputs = []
+        for pathway, reactions in pathway_reactions.items():
+            output = pathway + '_metabolicnetwork.txt'
+            partial_path, checkpoint_path = output + '.part', output + '.checkpoint'
+
+            done = self.__read_checkpoint(partial_path, checkpoint_path)
+            list_reactions = [reaction for reaction in dict.fromkeys(reactions) if reaction not in done]
+            result = self.__shared_equations(list_reactions, client, shared_lines, remaining)
+            self.__write_metabolic_network(result, partial_path, checkpoint_path)
+
+            for reaction in dict.fromkeys(reactions):
+                remaining[reaction] -= 1
+                if not remaining[reaction]:
+                    shared_lines.pop(reaction, None)
+
+            os.replace(partial_path, output)
+            os.remove(checkpoint_path)
+            outputs.append(output)
+
+        if merged is not None:
+            outputs.append(self.__merge_files(list(outputs), merged))
+
+        return outputs
+
+    def stream_kegg(self, pathway, client = None, batch_size = MAX_ENTRIES_PER_GET, output = None):
+        """
+            Adds the reactions of the given pathway to the network while they are retrieved from the KEGG API,
+            and yields the number of reactions added after each batch, so the network can be analysed before
+            the last reaction arrives. If output is given, the equations are also written to that file.
+        """
+        client = client or KEGGClient(cache = KEGGResponseCache())
+        list_reactions = self.__retrieve_reactions(pathway, client)
+        batch, number_reactions = [], 0
+
+        with open(output + '.part', 'w') if output is not None else nullcontext() as output_file:
+            line_number = 0
+            for _, line in self.__retrieve_equations(list_reactions, client):
+                if line is None:
+                    continue
+
+                line_number += 1
+                if output_file is not None:
+                    output_file.write(line)
+
+                batch.append(parse_reaction(line, line_number, pathway))
+                if len(batch) >= batch_size:
+                    self.add_reactions(batch)
+                    number_reactions += len(batch)
+                    batch = []
+                    yield number_reactions
+
+            if batch:
+                self.add_reactions(batch)
+                number_reactions += len(batch)
+                yield number_reactions
+
+        if output is not None:
+            os.replace(output + '.part', output)
+
+    @cached_analysis
+    def get_centrality_measures(self, workers = 1):
+        'Obtains a centrality measures of the object MetabolicNetwork. With workers > 1 the analysis runs in a pool of processes.'
+
+        if workers == 1:
+            betweeness = self.__graph.all_betweenness_centrality()
+            closeness = self.__graph.all_closeness_centrality()
+        else:
+            compact_graph = self.__graph.freeze()
+            betweeness = parallel_betweenness_centrality(compact_graph, workers)
+            closeness = parallel_distance_statistics(compact_graph, workers)["closeness"]
+
+        betweeness_centrality_value = sorted([(node, round(value, 2)) for node, value in betweeness.items()],\
+                                     key = lambda x: x[1], reverse = True)
+
+        closeness_centrality_value = sorted(closeness.items(), key = lambda x: x[1], reverse=True)
 
-        closeness_centrality_value = sorted([(node, self.__graph.closeness_centrality(node))\
-                                     for node in self.__graph.get_nodes()], key = lambda x: x[1],\
-                                     reverse=True)    
-                                     
         return betweeness_centrality_value, closeness_centrality_value 
 
+    @cached_analysis
     def get_final_metabolites(self):
-        'Obtains the final metabolites of the object MetabolicNetwork.'
-       
-        all_metabolites =[node for node in self.__graph.get_nodes() if node.startswith('M')]  
-              
-        return [metabolite for metabolite in all_metabolites if self.__graph.out_degree(metabolite) == 0]
-
-    def get_frequent_metabolites(self):
-        'Obtains the most five frequent metabolites of the object MetabolicNetwork.'
-
-        frequent_metabolites = {node: degree for node, degree in self.__graph.all_degrees().items() \
-                                if node.startswith('M') or node.startswith('C')}
-
-        return [metabolite[0] for metabolite in sorted(frequent_metabolites.items(), \
-                                                key=lambda x: x[1], reverse=True)[0:5]]
-
-    def show_graphical_visualization(self):
-        'Shows the graphical representation of the object MetabolicNetwork.'
-	
-        nodes = self.__graph.get_nodes()
-        edges = self.__graph.get_edges()
-        num_nodes = len(nodes)
-        dict_nodes = {}
-        labels = []
-        edges_igraph = []
-
-
-        for j in self.__graph.get_nodes():  #criar as labels para identificar a que corresponde cada node na imagem
-            labels.append(j)
-        
-        for t in range(len(nodes)): #criar o grafo da rede metabolica com igraph 
-            dict_nodes[nodes[t]] = t
-            
-        for k in edges:
-            edges_igraph.append(((dict_nodes.get(k[0])),(dict_nodes.get(k[1]))))
-        
-        G = ig.Graph(edges_igraph, directed = True)
-                
-        layt = G.layout("kk", dim = 3) #definir o layout do grafo com o Kamada-Kawai layout algorithm e a 3 dimensoes
-        
-        Xn=[layt[k][0] for k in range(num_nodes)]
-        Yn=[layt[k][1] for k in range(num_nodes)]
-        Zn=[layt[k][2] for k in range(num_nodes)]
-
-        Xe=[]
-        Ye=[]
-        Ze=[]
-        
-        for e in edges_igraph:
-            Xe += [layt[e[0]][0],layt[e[1]][0], None]
-            Ye += [layt[e[0]][1],layt[e[1]][1], None]  
-            Ze += [layt[e[0]][2],layt[e[1]][2], None]
-            
-        edges_trace = go.Scatter3d(x = Xe, y = Ye, z = Ze, mode = "lines",
-                              line = dict(color = "rgb(125,125,125)", width=1),
-                              hoverinfo = "none")
-        
-        nodes_trace = go.Scatter3d(x = Xn, y = Yn, z = Zn, mode = "markers",
-                              marker = dict(symbol = "circle", size = 6,
-                              line = dict(color = "rgb(50,50,50)", width = 0.5)),
-                              text = labels, hoverinfo="text")
-        
-        axis = dict(showbackground = False, showline = False,
-                    zeroline = False, showgrid = False,
-                    showticklabels = False, title = "")
-        
-        layout = go.Layout(title = "3D vizualization of the metabolic network",
-                           width = 1000, height = 1000, showlegend = False,
-                           scene = dict(xaxis = dict(axis), yaxis = dict(axis), zaxis = dict(axis),),
-                           margin=dict(t = 50), hovermode = "closest")
-        
-        data = [edges_trace, nodes_trace]
-
-        fig = go.Figure(data=data, layout=layout)
-    
-        plot(fig)
+        'Obtains the final metabolites (without successors) of the object MetabolicNetwork.'
 
-    def get_metabolites_excreted(self, initial_metabolites):
-        'Obtains the metabolites excreted by the object MetabolicNetwork through the list of metabolites.'
+        return [node for node in self.__graph.get_sinks() if node in self.__metabolite_ids]
 
-        metabolites_excreted = []
-        for substract in initial_metabolites:
-            path = self.__graph.reachable_dfs(substract)
-            if path: 
-                metabolites_excreted.append(path[-1])
-        
-        return self.__delete_duplicates(metabolites_excreted)
+    @cached_analysis
+    def get_frequent_metabolites(self, k = 5):
+        'Obtains the k most frequent metabolites (with the highest degree) of the object MetabolicNetwork.'
 
-    def get_number_reactions_metabolites(self, number_reactions=0, number_metabolites=0):
-        'Obtains the number of reaction and metabolites of the object MetabolicNetwork.'
+        degrees = self.__graph.all_degrees()
 
-        for node in self.__graph.get_nodes():
-            if node.startswith('R'):
-                number_reactions += 1
-            
-            else:
-                number_metabolites += 1
-        
-        return number_reactions, number_metabolites
-    
-    def __delete_duplicates(self, list_elements):
-        'Remove all duplicates elements from the list.'
+        return heapq.nlargest(k, self.__metabolite_ids, key = degrees.__getitem__)
 
-        return set(list_elements)
+    def show_graphical_visualization(self, filename = None, layout = None, collapse_currency = False, max_degree = None,
+                                     layout_cache = None):
+        """
+            Shows the graphical representation of the object MetabolicNetwork. The layout is chosen by the size
+            of the network unless one is given (an igraph layout name). With filename the figure is written to that
+            HTML file without opening the browser. collapse_currency hides the currency metabolites (H2O, ATP, NAD+, ...)
+            and max_degree the nodes with more edges. The layouts are kept in layout_cache (by default a LayoutCache
+            in the metnet cache directory), so drawing the same network again does not compute its layout.
+        """
+        from .visualization import show_network #igraph e plotly só são importados quando necessários
 
-    def __get_reactions_from_metabolites(self, list_metabolites):
-        'Obtains the reactions where the metabolites are involved.'
+        compact_graph = self.__graph.freeze()
+        sources = np.repeat(np.arange(len(compact_graph.names)), np.diff(compact_graph.out_offsets))
 
-        return self.__delete_duplicates([reaction for metabolite in list_metabolites\
-                                        for reaction in self.__graph.graph_map[metabolite]\
-                                        if metabolite in self.__graph.graph_map.keys()])
+        return show_network(compact_graph.names, sources, compact_graph.out_targets, filename, layout,
+                            collapse_currency, max_degree, layout_cache or LayoutCache())
 
-    def __get_subtract_from_reactions(self, list_reactions): 
-        'Obtains the substract (metabolites of left in the equation) of the reaction.'
+    @cached_analysis(query = True)
+    def get_metabolites_excreted(self, initial_metabolites):
+        'Obtains the metabolites excreted by the object MetabolicNetwork through the list of metabolites: the final metabolites reachable from them.'
 
-        return {reaction:self.__graph.get_predecessors(reaction) for reaction in list_reactions}
-    
-    def __to_dataframe(self, result):
-        'Converts the result to dataframe.'
+        return set().union(*self.get_excretion_profiles(initial_metabolites).values())
 
-        return pd.read_csv(io.StringIO(result), header=None, sep='\t')
+    def get_excretion_profiles(self, list_metabolites = None):
+        """
+            Obtains, for each metabolite (all the metabolites by default), the set of final metabolites reachable
+            from it, excluding itself. The Graph is condensed in strongly connected components and the reachable final
+            metabolites are propagated once for all the nodes, so every query reuses the same pass.
+        """
+        final_metabolites, reachable = self.__excretion_sets()
+        index = {metabolite: position for position, metabolite in enumerate(final_metabolites)}
 
-    def __retrieve_reactions(self, pathway):
-        'Gets all reactions of the given pathway using KEGG API.'
+        if list_metabolites is None:
+            list_metabolites = list(self.__metabolite_ids)
 
-        reactions_kegg = REST.kegg_link('rn', pathway).read()
-        df_reactions = self.__to_dataframe(reactions_kegg)[1]
-        
-        return [reaction.replace('rn:', '') for reaction in df_reactions]
+        profiles = {}
+        for metabolite in list_metabolites:
+            bits = reachable.get(metabolite, 0) & ~(1 << index[metabolite] if metabolite in index else 0)
+            profiles[metabolite] = {final_metabolites[position] for position, bit in enumerate(reversed(bin(bits)[2:]))
+                                    if bit == '1'}
 
-    def __retrieve_equations(self, pathway):
-        'Gets all equations of metabolism of the given pathway using KEGG API.'
+        return profiles
 
-        info_reaction_compounds = []
-        list_reactions = self.__retrieve_reactions(pathway)
+    @cached_analysis(shared = True)
+    def __excretion_sets(self):
+        'Obtains the final metabolites (without successors) and, for each node, the bitset of the ones it reaches.'
 
-        for reaction in list_reactions:
-            flat_file_reaction = REST.kegg_get(reaction).readlines()
+        final_metabolites = self.get_final_metabolites()
 
-            for line in flat_file_reaction:
-                if line.startswith('EQUATION'):
-                    equation = line.replace('EQUATION', '').strip()
-                    reaction_compounds = reaction + ' : ' + equation + '\n'
-                    info_reaction_compounds.append(reaction_compounds)
+        return final_metabolites, self.__graph.reachable_targets(final_metabolites)
 
-        return info_reaction_compounds
+    def get_number_reactions_metabolites(self, number_reactions=0, number_metabolites=0):
+        'Obtains the number of reaction and metabolites of the object MetabolicNetwork.'
 
-    def __write_metabolic_network(self, result, pathway):
-        'Writes a file with the results.'
+        return number_reactions + len(self.__reaction_ids), number_metabolites + len(self.__metabolite_ids)
+    
+    def __retrieve_reactions(self, pathway, client):
+        'Gets all reactions of the given pathway using KEGG API.'
 
-        with open(pathway + '_metabolicnetwork.txt', 'w') as output_file:
-            output_file.writelines(result)
+        return parse_links(client.link('rn', pathway))
+
+    def __retrieve_equations(self, list_reactions, client):
+        """
+            Yields (reaction, line of the file) for the given reactions as they are retrieved from the KEGG API,
+            in batched and concurrent requests. line is None for the reactions without equation and for the ones
+            that KEGG does not have, so they are also recorded as done in the checkpoint.
+        """
+        for reaction, flat_file_reaction in client.iter_entries(list_reactions, include_missing = True):
+            equation = parse_equation(flat_file_reaction) if flat_file_reaction is not None else None
+            yield reaction, (reaction + ' : ' + equation + '\n' if equation is not None else None)
+
+    def __read_checkpoint(self, partial_path, checkpoint_path):
+        'Gets the reactions already done by an interrupted run, dropping the incomplete last line of the partial file.'
+
+        if not os.path.exists(partial_path):
+            if os.path.exists(checkpoint_path):
+                os.remove(checkpoint_path)
+            return set()
+
+        with open(partial_path, 'rb+') as partial_file:
+            content = partial_file.read()
+            partial_file.truncate(content.rfind(b'\n') + 1)
+
+        lines = content.decode('utf-8').split('\n')[:-1]
+        done = {line.split(' : ', 1)[0] for line in lines}
+
+        if os.path.exists(checkpoint_path):
+            with open(checkpoint_path) as checkpoint_file:
+                done.update(line.strip() for line in checkpoint_file if line.endswith('\n'))
+
+        return done
+
+    def __write_metabolic_network(self, result, partial_path, checkpoint_path):
+        """
+            Appends each line to the partial file as soon as it is retrieved, and then the reaction to the checkpoint.
+            Both files are line buffered, so every reaction in the checkpoint is already in the partial file.
+        """
+        with open(partial_path, 'a', buffering = 1) as output_file, \
+             open(checkpoint_path, 'a', buffering = 1) as checkpoint_file:
+            for reaction, line in result:
+                if line is not None:
+                    output_file.write(line)
+                checkpoint_file.write(reaction + '\n')
+
+            os.fsync(output_file.fileno())
+
+    def __shared_equations(self, list_reactions, client, shared_lines, remaining):
+        """
+            Yields (reaction, line) for the given reactions: the lines kept for the reactions shared with other
+            pathways, and then the ones retrieved from the KEGG API, keeping those that other pathways still need.
+        """
+        for reaction in list_reactions:
+            if reaction in shared_lines:
+                yield reaction, shared_lines[reaction]
+
+        missing = [reaction for reaction in list_reactions if reaction not in shared_lines]
+        for reaction, line in self.__retrieve_equations(missing, client):
+            if remaining[reaction] > 1:
+                shared_lines[reaction] = line
+            yield reaction, line
+
+    def __merge_files(self, paths, output):
+        'Writes the lines of the given files to a temporary file, each reaction once, and renames it to output.'
+
+        written = set()
+        with open(output + '.part', 'w') as output_file:
+            for path in paths:
+                with open(path) as input_file:
+                    for line in input_file:
+                        reaction = line.split(' : ', 1)[0]
+                        if reaction not in written:
+                            written.add(reaction)
+                            output_file.write(line)
+        os.replace(output + '.part', output)
+
+        return output
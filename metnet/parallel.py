@@ -0,0 +1,85 @@
+from .centrality import accumulate_betweenness, normalize_betweenness
+from .csrgraph import CSRGraph
+from .distances import DEFAULT_BLOCK_SIZE, distance_sums, summarize_distances
+from concurrent.futures import ProcessPoolExecutor
+import os
+import numpy as np
+
+'''
+    Parallel execution of the per-source graph analyses.
+    The source nodes are split in shards that run in a pool of processes. The compact (CSR) graph
+    is shipped once to each worker, when the process starts, and the partial results are merged here.
+'''
+
+SHARDS_PER_WORKER = 4
+
+worker_graph = None
+
+
+def initialize_worker(names, out_offsets, out_targets, in_offsets, in_targets):
+    'Rebuilds the compact graph once in each worker process.'
+
+    global worker_graph
+    worker_graph = CSRGraph(names, out_offsets, out_targets, in_offsets, in_targets)
+
+
+def betweenness_shard(sources):
+    'Partial betweenness of all nodes, from the shortest paths starting at the given sources.'
+
+    number_nodes = len(worker_graph.names)
+    partial = accumulate_betweenness(range(number_nodes), worker_graph.successor_list, sources.tolist())
+
+    return np.fromiter(partial.values(), dtype=np.float64, count=number_nodes)
+
+
+def distance_shard(sources, block_size):
+    'Sums of distances, reachable nodes and eccentricity of the given sources.'
+
+    return distance_sums(worker_graph, sources, block_size)
+
+
+def get_workers(workers):
+    'Number of processes to use; None means one per CPU.'
+
+    if workers is None:
+        return os.cpu_count() or 1
+
+    return max(1, int(workers))
+
+
+def map_shards(graph, task, workers, *arguments):
+    'Runs the task over shards of all source nodes and returns the partial results in order.'
+
+    graph = CSRGraph.from_graph(graph)
+    workers = get_workers(workers)
+    shards = np.array_split(np.arange(len(graph.names)), workers * SHARDS_PER_WORKER)
+    shards = [shard for shard in shards if len(shard) > 0] or shards[:1]
+
+    initargs = (graph.names, graph.out_offsets, graph.out_targets, graph.in_offsets, graph.in_targets)
+
+    if workers == 1:
+        initialize_worker(*initargs)
+        return [task(shard, *arguments) for shard in shards]
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=initialize_worker, initargs=initargs) as executor:
+        return list(executor.map(task, shards, *[[argument] * len(shards) for argument in arguments]))
+
+
+def parallel_betweenness_centrality(graph, workers=None, normalized=True):
+    'Betweenness centrality of every node, with the sources split over a pool of processes.'
+
+    graph = CSRGraph.from_graph(graph)
+    betweenness = sum(map_shards(graph, betweenness_shard, workers), np.zeros(len(graph.names)))
+    betweenness = dict(zip(graph.names, betweenness.tolist()))
+
+    return normalize_betweenness(betweenness, len(graph.names)) if normalized else betweenness
+
+
+def parallel_distance_statistics(graph, workers=None, block_size=DEFAULT_BLOCK_SIZE):
+    'Closeness, eccentricity, mean distance and reachability, with the sources split over a pool of processes.'
+
+    graph = CSRGraph.from_graph(graph)
+    partials = map_shards(graph, distance_shard, workers, block_size)
+    totals, reachable, eccentricity = (np.concatenate(values) for values in zip(*partials))
+
+    return summarize_distances(graph.names, totals, reachable, eccentricity)
@@ -0,0 +1,262 @@
+from .reader import Reaction
+from array import array
+from itertools import islice
+import numpy as np
+
+'''
+    Compact store of the reactions of a network (direction and stoichiometry). The reactions are kept in columns
+    instead of one object per reaction and per term: the metabolites of all the reactions are one array of integer
+    ids (the names are interned), with the offsets of the terms and of the products of each reaction. Only the
+    coefficients other than 1 are stored, by position of the term.
+'''
+
+
+class ReactionTable:
+
+    '''
+        Reactions by id, one row per reaction. A reaction added again replaces the previous definition, whose row
+        is left unused. The arcs of the network are computed from the columns with array operations.
+    '''
+
+    def __init__(self):
+        self.names = [] # reações e metabolitos, pela ordem em que aparecem
+        self.index = {}
+        self.rows = {} # id da reação -> linha
+        self.reactions = array("q") # id (em names) da reação de cada linha
+        self.offsets = array("q", [0]) # os termos da linha i estão em terms[offsets[i]:offsets[i + 1]]
+        self.splits = array("q") # posição do primeiro produto de cada linha
+        self.terms = array("q")
+        self.reversible = array("b")
+        self.line_numbers = array("q") # 0 quando a reação não vem de um ficheiro
+        self.coefficients = {} # posição do termo -> coeficiente diferente de 1
+
+    def __len__(self):
+        return len(self.rows)
+
+    def __contains__(self, reaction_id):
+        return reaction_id in self.rows
+
+    def __iter__(self):
+        return iter(self.rows)
+
+    def add_batch(self, reactions):
+        """
+            Adds the parsed reactions (reader.Reaction). Returns the previous definitions (reader.Reaction)
+            of the reactions that were already in the table.
+        """
+        index, names, rows, coefficients = self.index, self.names, self.rows, self.coefficients
+        intern = index.setdefault
+        add_reaction, add_offset, add_split = self.reactions.append, self.offsets.append, self.splits.append
+        add_term, add_reversible, add_line_number = self.terms.append, self.reversible.append, self.line_numbers.append
+        terms = self.terms
+        replaced = []
+
+        for reaction in reactions:
+            reaction_id = reaction.reaction_id
+            if reaction_id in rows:
+                names.extend(islice(index, len(names), None)) # a linha antiga pode usar nomes deste lote
+                replaced.append(self.remove(reaction_id))
+
+            rows[reaction_id] = len(self.reactions)
+            add_reaction(intern(reaction_id, len(index)))
+
+            for metabolite, coefficient in reaction.substrates:
+                if coefficient != 1 or type(coefficient) is not int:
+                    coefficients[len(terms)] = coefficient
+                add_term(intern(metabolite, len(index)))
+            add_split(len(terms))
+
+            for metabolite, coefficient in reaction.products:
+                if coefficient != 1 or type(coefficient) is not int:
+                    coefficients[len(terms)] = coefficient
+                add_term(intern(metabolite, len(index)))
+            add_offset(len(terms))
+
+            add_reversible(reaction.reversible)
+            add_line_number(reaction.line_number or 0)
+
+        names.extend(islice(index, len(names), None))
+
+        return replaced
+
+    def extend(self, table):
+        """
+            Adds the reactions of another table (e.g. parsed in another process) as if they were added after the
+            ones of this table: the names are interned again and the columns are appended with array operations.
+            Returns the previous definitions (reader.Reaction) of the reactions that were already in the table.
+        """
+        index = self.index
+        intern = index.setdefault
+        node_ids = np.fromiter((intern(name, len(index)) for name in table.names), dtype=np.int64, count=len(table.names))
+        self.names.extend(islice(index, len(self.names), None))
+
+        replaced = [self.remove(reaction_id) for reaction_id in table.rows if reaction_id in self.rows]
+
+        first_row, first_term = len(self.reactions), len(self.terms)
+        self.reactions.frombytes(node_ids[np.asarray(table.reactions, dtype=np.int64)].tobytes())
+        self.terms.frombytes(node_ids[np.asarray(table.terms, dtype=np.int64)].tobytes())
+        self.offsets.frombytes((np.asarray(table.offsets[1:], dtype=np.int64) + first_term).tobytes())
+        self.splits.frombytes((np.asarray(table.splits, dtype=np.int64) + first_term).tobytes())
+        self.reversible.extend(table.reversible)
+        self.line_numbers.extend(table.line_numbers)
+
+        self.coefficients.update((position + first_term, coefficient) for position, coefficient in table.coefficients.items())
+        self.rows.update((reaction_id, row + first_row) for reaction_id, row in table.rows.items())
+
+        return replaced
+
+    def pack(self, index):
+        """
+            Returns the live rows, in order, as packed arrays over the node ids of index (name -> id):
+            (reactions, offsets, splits, terms, reversible, line_numbers, coefficient positions, coefficients).
+        """
+        rows = np.fromiter(self.rows.values(), dtype=np.int64, count=len(self.rows))
+        # os nomes que já não estão em index (reações removidas) só aparecem em linhas mortas
+        node_ids = np.fromiter((index.get(name, -1) for name in self.names), dtype=np.int64, count=len(self.names))
+
+        offsets = np.asarray(self.offsets, dtype=np.int64)
+        starts, number_terms = offsets[rows], offsets[rows + 1] - offsets[rows]
+        new_offsets = np.zeros(len(rows) + 1, dtype=np.int64)
+        np.cumsum(number_terms, out=new_offsets[1:])
+
+        # posição antiga de cada termo das linhas vivas, pela nova ordem
+        positions = np.arange(new_offsets[-1], dtype=np.int64) + np.repeat(starts - new_offsets[:-1], number_terms)
+
+        # os coeficientes só existem nas linhas vivas (remove apaga os das outras)
+        coefficient_positions = np.fromiter(self.coefficients, dtype=np.int64, count=len(self.coefficients))
+        old_rows = np.searchsorted(offsets, coefficient_positions, side="right") - 1
+        new_rows = np.zeros(len(self.reactions), dtype=np.int64)
+        new_rows[rows] = np.arange(len(rows), dtype=np.int64)
+
+        return (node_ids[np.asarray(self.reactions, dtype=np.int64)[rows]],
+                new_offsets,
+                np.asarray(self.splits, dtype=np.int64)[rows] - starts + new_offsets[:-1],
+                node_ids[np.asarray(self.terms, dtype=np.int64)[positions]],
+                np.asarray(self.reversible, dtype=np.uint8)[rows],
+                np.asarray(self.line_numbers, dtype=np.int64)[rows],
+                coefficient_positions - offsets[old_rows] + new_offsets[new_rows[old_rows]],
+                list(self.coefficients.values()))
+
+    @classmethod
+    def unpack(cls, names, reactions, offsets, splits, terms, reversible, line_numbers, coefficient_positions=(),
+               coefficients=()):
+        'Builds the table from the arrays returned by pack and the names of the node ids.'
+
+        table = cls()
+        table.names = list(names)
+        table.index = {name: node for node, name in enumerate(table.names)}
+        table.reactions = array("q", np.asarray(reactions, dtype=np.int64).tobytes())
+        table.offsets = array("q", np.asarray(offsets, dtype=np.int64).tobytes())
+        table.splits = array("q", np.asarray(splits, dtype=np.int64).tobytes())
+        table.terms = array("q", np.asarray(terms, dtype=np.int64).tobytes())
+        table.reversible = array("b", np.asarray(reversible, dtype=np.int8).tobytes())
+        table.line_numbers = array("q", np.asarray(line_numbers, dtype=np.int64).tobytes())
+        table.rows = dict(zip(map(table.names.__getitem__, table.reactions.tolist()), range(len(table.reactions))))
+        table.coefficients = dict(zip(np.asarray(coefficient_positions, dtype=np.int64).tolist(), coefficients))
+
+        return table
+
+    def __getstate__(self):
+        # só as colunas são enviadas entre processos; o índice dos nomes e das linhas é refeito ao receber
+        columns = {column: getattr(self, column) for column in ("names", "reactions", "offsets", "splits", "terms",
+                                                                "reversible", "line_numbers", "coefficients")}
+        columns["rows"] = array("q", self.rows.values())
+        return columns
+
+    def __setstate__(self, columns):
+        rows = columns.pop("rows")
+        self.__dict__.update(columns)
+        self.index = {name: node for node, name in enumerate(self.names)}
+        self.rows = dict(zip(map(self.names.__getitem__, np.asarray(self.reactions, dtype=np.int64)[np.asarray(rows, dtype=np.int64)].tolist()),
+                             rows.tolist()))
+
+    def remove(self, reaction_id):
+        'Removes the reaction and returns it (reader.Reaction), or None if it is not in the table.'
+
+        row = self.rows.pop(reaction_id, None)
+        if row is None:
+            return None
+
+        reaction = self.reaction(row)
+        if self.coefficients:
+            for position in range(self.offsets[row], self.offsets[row + 1]):
+                self.coefficients.pop(position, None)
+
+        return reaction
+
+    def get(self, reaction_id):
+        'Returns the reaction (reader.Reaction), or None if it is not in the table.'
+
+        row = self.rows.get(reaction_id)
+        return None if row is None else self.reaction(row)
+
+    def reaction(self, row):
+        'Builds the reaction (reader.Reaction) of a row.'
+
+        names, coefficients = self.names, self.coefficients
+        start, split, end = self.offsets[row], self.splits[row], self.offsets[row + 1]
+        terms = [(names[node], coefficients.get(position, 1))
+                 for position, node in enumerate(self.terms[start:end].tolist(), start)]
+
+        return Reaction(names[self.reactions[row]], terms[:split - start], terms[split - start:],
+                        bool(self.reversible[row]), self.line_numbers[row] or None)
+
+    def values(self):
+        'Yields the reactions (reader.Reaction) in the order they were added.'
+
+        for row in self.rows.values():
+            yield self.reaction(row)
+
+    def directions(self):
+        'Yields the directions (reaction id, substrates, products) of the reactions; two for a reversible reaction.'
+
+        names, terms = self.names, self.terms
+        for reaction_id, row in self.rows.items():
+            start, split, end = self.offsets[row], self.splits[row], self.offsets[row + 1]
+            substrates = [names[node] for node in terms[start:split].tolist()]
+            products = [names[node] for node in terms[split:end].tolist()]
+
+            yield reaction_id, substrates, products
+            if self.reversible[row]:
+                yield reaction_id, products, substrates
+
+    def arcs(self, first_row=0):
+        """
+            Returns the arcs of the reactions in the rows from first_row, as two arrays of ids of the names
+            (sources, targets): substrate -> reaction -> product, in both directions for a reversible reaction.
+        """
+        offsets = np.asarray(self.offsets, dtype=np.int64)[first_row:]
+        number_terms = np.diff(offsets)
+        rows = np.repeat(np.arange(first_row, len(self.reactions), dtype=np.int64), number_terms)
+        positions = np.arange(offsets[0], offsets[-1], dtype=np.int64)
+        terms = np.asarray(self.terms, dtype=np.int64)[offsets[0]:]
+
+        substrate = positions < np.asarray(self.splits, dtype=np.int64)[rows]
+        reversible = np.asarray(self.reversible, dtype=bool)[rows]
+        reactions = np.asarray(self.reactions, dtype=np.int64)[rows]
+
+        # linhas substituídas ou removidas não têm arcos
+        live = np.ones(len(self.reactions), dtype=bool)
+        if len(self.rows) != len(self.reactions):
+            live[:] = False
+            live[list(self.rows.values())] = True
+        live = live[rows]
+
+        incoming = (substrate | reversible) & live
+        outgoing = (~substrate | reversible) & live
+
+        return (np.concatenate((terms[incoming], reactions[outgoing])),
+                np.concatenate((reactions[incoming], terms[outgoing])))
+
+    def copy(self):
+        'Returns an independent copy of the table.'
+
+        table = ReactionTable()
+        table.names = list(self.names)
+        table.index = dict(self.index)
+        table.rows = dict(self.rows)
+        for column in ("reactions", "offsets", "splits", "terms", "reversible", "line_numbers"):
+            setattr(table, column, array(getattr(self, column).typecode, getattr(self, column)))
+        table.coefficients = dict(self.coefficients)
+
+        return table
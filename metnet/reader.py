@@ -0,0 +1,245 @@
+from array import array
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+import bz2
+import gzip
+import io
+import lzma
+import os
+import re
+
+'''
+    Streaming reader of reaction files, with the format "R1: M1 + 2 M2 => M3" ("<=>" for reversible reactions).
+    The input can be a path, an open file (text or binary) or an iterable of lines, and gzip, bz2 and xz
+    inputs are decompressed transparently. The reactions are produced in batches, so the whole file is never
+    held in memory. Large uncompressed files can also be split on line boundaries and parsed in parallel.
+'''
+
+DEFAULT_BATCH_SIZE = 10000
+SHARD_SIZE = 64 << 20 # bytes
+
+COMPRESSED_FORMATS = [(b"\x1f\x8b", lambda stream: gzip.GzipFile(fileobj=stream, mode="rb")),
+                      (b"BZh", bz2.BZ2File), (b"\xfd7zXZ\x00", lzma.LZMAFile)]
+
+Reaction = namedtuple("Reaction", ["reaction_id", "substrates", "products", "reversible", "line_number"])
+Reaction.__doc__ = 'Reaction of a file. substrates and products are lists of (metabolite, stoichiometric coefficient).'
+
+TERM_SEPARATOR = re.compile(r"\+(?![^()]*\))") # "+" fora de parênteses, e.g. "(n+1) C00001"
+COEFFICIENT = re.compile(r"^(\d+(\.\d+)?|\(?[0-9nmx+\-*]+\)?)$")
+
+
+class NetworkFormatError(ValueError):
+
+    '''
+        Error raised when a line of a reaction file is not valid.
+    '''
+
+    def __init__(self, message, line_number=None, source=None):
+        self.reason = message
+        self.line_number = line_number
+        self.source = source
+        location = ":".join(str(part) for part in (source, line_number) if part is not None)
+        super().__init__(location + ": " + message if location else message)
+
+
+def open_binary(stream):
+    'Wraps a binary stream with the decompressor given by its magic number, if any.'
+
+    if not hasattr(stream, "peek"):
+        stream = io.BufferedReader(stream)
+
+    header = stream.peek(6)[:6]
+    for magic, decompressor in COMPRESSED_FORMATS:
+        if header.startswith(magic):
+            return decompressor(stream)
+
+    return stream
+
+
+def iter_lines(source, encoding="utf-8"):
+    'Yields the text lines of a path, open file or iterable of lines, decompressing them if needed.'
+
+    if isinstance(source, (str, bytes, os.PathLike)):
+        with open(source, "rb") as in_file:
+            with io.TextIOWrapper(open_binary(in_file), encoding=encoding) as text_file:
+                yield from iter_text(text_file)
+
+    elif hasattr(source, "read"):
+        if isinstance(source.read(0), bytes):
+            yield from iter_text(io.TextIOWrapper(open_binary(source), encoding=encoding))
+        else:
+            yield from iter_text(source)
+
+    else:
+        for line in source:
+            yield line.decode(encoding) if isinstance(line, bytes) else line
+
+
+def iter_text(text_file, hint=1 << 20):
+    'Reads a text file in blocks of lines of about hint characters.'
+
+    lines = text_file.readlines(hint)
+    while lines:
+        yield from lines
+        lines = text_file.readlines(hint)
+
+
+def parse_term(term, line_number, source=None):
+    'Splits a term like "2 C00001" in (metabolite, coefficient); the coefficient is 1 when omitted.'
+
+    parts = term.split(None, 1)
+    if len(parts) == 2 and COEFFICIENT.match(parts[0]):
+        coefficient = parts[0]
+        if coefficient.isdigit():
+            coefficient = int(coefficient)
+        elif coefficient.replace(".", "", 1).isdigit():
+            coefficient = float(coefficient)
+        return parts[1].strip(), coefficient
+
+    if not parts:
+        raise NetworkFormatError("empty metabolite", line_number, source)
+
+    return term, 1
+
+
+def parse_side(side, line_number, source=None):
+    'Parses one side of the equation in a list of (metabolite, coefficient).'
+
+    terms = TERM_SEPARATOR.split(side) if "(" in side else side.split("+")
+    if len(terms) == 1 and not terms[0].strip():
+        return []
+
+    metabolites = []
+    for term in terms:
+        term = term.strip()
+        if " " in term or "\t" in term or not term:
+            metabolites.append(parse_term(term, line_number, source))
+        else:
+            metabolites.append((term, 1))
+
+    return metabolites
+
+
+def parse_reaction(line, line_number=None, source=None):
+    'Parses one line of the file. Returns None for the lines without a reaction.'
+
+    reaction_id, separator, equation = line.partition(":")
+    if not separator:
+        return None
+
+    reaction_id = reaction_id.strip()
+    if not reaction_id:
+        raise NetworkFormatError("missing reaction identifier", line_number, source)
+
+    if "<=>" in equation:
+        sides, reversible = equation.split("<=>"), True
+    elif "=>" in equation:
+        sides, reversible = equation.split("=>"), False
+    else:
+        raise NetworkFormatError("reaction " + reaction_id + " without '=>' or '<=>'", line_number, source)
+
+    if len(sides) != 2:
+        raise NetworkFormatError("reaction " + reaction_id + " with more than one arrow", line_number, source)
+
+    return Reaction(reaction_id, parse_side(sides[0], line_number, source),
+                    parse_side(sides[1], line_number, source), reversible, line_number)
+
+
+def read_reactions(source, batch_size=DEFAULT_BATCH_SIZE, encoding="utf-8", first_line=1):
+    'Yields lists of at most batch_size reactions read from the source.'
+
+    name = source if isinstance(source, (str, os.PathLike)) else getattr(source, "name", None)
+    batch = []
+
+    for line_number, line in enumerate(iter_lines(source, encoding), first_line):
+        reaction = parse_reaction(line, line_number, name)
+        if reaction is not None:
+            batch.append(reaction)
+
+            if len(batch) >= batch_size:
+                yield batch
+                batch = []
+
+    if batch:
+        yield batch
+
+
+def is_compressed(path):
+    'Checks the magic number of the file.'
+
+    with open(path, "rb") as in_file:
+        header = in_file.read(6)
+
+    return any(header.startswith(magic) for magic, _ in COMPRESSED_FORMATS)
+
+
+def find_shards(path, number_shards):
+    'Splits the file in at most number_shards byte ranges (start, end) that begin and end on line boundaries.'
+
+    size = os.path.getsize(path)
+    offsets = [0]
+
+    with open(path, "rb") as in_file:
+        for shard in range(1, number_shards):
+            position = size * shard // number_shards
+            if position <= offsets[-1]:
+                continue
+
+            in_file.seek(position - 1)
+            in_file.readline() # avança até ao início da linha seguinte
+            if in_file.tell() >= size:
+                break
+            if in_file.tell() > offsets[-1]:
+                offsets.append(in_file.tell())
+
+    offsets.append(size)
+    return list(zip(offsets[:-1], offsets[1:]))
+
+
+def parse_shard(path, start, end, encoding="utf-8"):
+    """
+        Parses the lines between the byte offsets start and end in a ReactionTable, whose names are interned
+        locally, by order of first appearance. Only its columns go back to the parent process.
+        Returns (table, number of lines, error).
+    """
+    from .reactiontable import ReactionTable # reactiontable usa o Reaction deste módulo
+
+    with open(path, "rb") as in_file:
+        in_file.seek(start)
+        lines = in_file.read(end - start).decode(encoding).split("\n")
+
+    if lines[-1] == "":
+        lines.pop()
+
+    table = ReactionTable()
+    try:
+        table.add_batch(reaction for reaction in map(parse_reaction, lines, range(1, len(lines) + 1))
+                        if reaction is not None)
+    except NetworkFormatError as error:
+        return None, len(lines), (error.reason, error.line_number)
+
+    return table, len(lines), None
+
+
+def read_shards(path, workers, encoding="utf-8"):
+    """
+        Parses an uncompressed file in a pool of processes. Yields, in file order, the parsed shards
+        (ReactionTable), with the line numbers of the reactions relative to the file.
+    """
+    number_shards = max(workers, os.path.getsize(path) // SHARD_SIZE + 1)
+    shards = find_shards(path, number_shards)
+    first_line = 1
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        results = executor.map(parse_shard, [path] * len(shards), *zip(*shards), [encoding] * len(shards))
+
+        for table, number_lines, error in results:
+            if error is not None:
+                message, line_number = error
+                raise NetworkFormatError(message, first_line + line_number - 1, path)
+
+            if first_line > 1:
+                table.line_numbers = array("q", [line_number + first_line - 1 for line_number in table.line_numbers])
+            first_line += number_lines
+
+            yield table
@@ -0,0 +1,74 @@
+'''
+    Network expansion: the scope of a set of seed metabolites is every metabolite that can be produced from them,
+    firing a reaction when all its substrates are available and adding its products, until nothing changes.
+    Each direction of a reaction keeps the number of its substrates still missing, so one expansion visits
+    every reaction and metabolite once: O(V + E).
+'''
+
+
+class ScopeEngine:
+
+    '''
+        Compiled form of the directions of the reactions (reaction, substrates, products), reused by every
+        expansion. A reversible reaction is given as two directions.
+    '''
+
+    def __init__(self, directions):
+        self.reactions = []
+        self.products = []
+        self.required = []
+        self.consumers = {}
+        self.spontaneous = []
+
+        for direction, (reaction, substrates, products) in enumerate(directions):
+            substrates = set(substrates)
+            self.reactions.append(reaction)
+            self.products.append(tuple(set(products)))
+            self.required.append(len(substrates))
+
+            for metabolite in substrates:
+                self.consumers.setdefault(metabolite, []).append(direction)
+            if not substrates:
+                self.spontaneous.append(direction)
+
+    def expand(self, seeds, knockouts=()):
+        """
+            Returns (metabolites, reactions) of the scope of the seeds: the metabolites available and the reactions
+            fired, in the order they fired. The reactions in knockouts never fire.
+        """
+        knockouts = frozenset(knockouts)
+        missing = self.required.copy()
+        available = set(seeds)
+        worklist = list(available)
+        fired = {}
+
+        def fire(direction):
+            if self.reactions[direction] in knockouts:
+                return
+            fired.setdefault(self.reactions[direction], None)
+
+            for product in self.products[direction]:
+                if product not in available:
+                    available.add(product)
+                    worklist.append(product)
+
+        for direction in self.spontaneous:
+            fire(direction)
+
+        while worklist:
+            for direction in self.consumers.get(worklist.pop(), ()):
+                missing[direction] -= 1
+                if missing[direction] == 0:
+                    fire(direction)
+
+        return available, list(fired)
+
+    def expand_all(self, seed_sets, knockouts=None):
+        """
+            Expands several seed sets. knockouts is one set of reactions for all the seed sets,
+            or a list with one set per seed set.
+        """
+        if knockouts is None or isinstance(knockouts, (set, frozenset)):
+            return [self.expand(seeds, knockouts or ()) for seeds in seed_sets]
+
+        return [self.expand(seeds, blocked) for seeds, blocked in zip(seed_sets, knockouts)]
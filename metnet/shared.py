@@ -1,3 +1,6 @@
+import os
+
+
 class InputOptions:
 
     '''
@@ -6,6 +9,8 @@ class InputOptions:
     
     FILEPATH="filepath"
     TOPOLOGICAL_ANALYSIS="top_analysis"
+    WORKERS="workers"
+    SAVE_SNAPSHOT="save_snapshot"
     GRAPHIC_VISUALIZATION='graphical_visualization_graph'
     NUMBER_REACT_MET='number_reactions_metabolites'
     FINAL_METABOLITES='final_metabolites'
@@ -14,3 +19,9 @@ class InputOptions:
     ALL_PRODUCTS='all_metabolites_excreted'
     AUTO_GENERATION="auto_generation"
     AUTO_GENERATION_PATHWAY="auto_generation_pathway"
+
+
+def cache_directory():
+    'Directory of the caches of metnet: $METNET_CACHE_DIR or ~/.cache/metnet.'
+
+    return os.environ.get("METNET_CACHE_DIR", os.path.join(os.path.expanduser("~"), ".cache", "metnet"))
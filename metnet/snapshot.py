@@ -0,0 +1,165 @@
+import json
+import mmap
+import os
+import struct
+import zlib
+import numpy as np
+
+'''
+    Versioned binary snapshot of a parsed network: table of node names, node types, the CSR arrays
+    of both directions and the reactions (direction and stoichiometry) as packed arrays over the node ids.
+    The arrays are read through mmap, so opening a large network does not copy it and the pages are shared
+    between the processes that open the same snapshot.
+
+    Layout: 96-byte header, then the sections, each one aligned to 8 bytes:
+    names (utf-8, separated by "\n"), types (uint8), out_offsets (int64), out_targets (int32),
+    in_offsets (int64), in_targets (int32), and the reactions: reaction node (int32), term offsets (int64),
+    position of the first product (int64), terms (int32), reversible (uint8), line numbers (int64, 0 if none),
+    positions of the coefficients other than 1 (int64) and those coefficients (utf-8 JSON list).
+
+    The checksum covers the header, the names and the index sections (types and offsets), which are small;
+    the bulk sections (targets, terms) are only checked for size, so opening a snapshot does not read them.
+'''
+
+MAGIC = b"METNETSN"
+FORMAT_VERSION = 3
+HEADER = struct.Struct("<8sIIqqqqqqqqqI4x")
+EXTENSION = ".snapshot"
+
+REACTION = 1
+METABOLITE = 0
+
+
+class SnapshotError(ValueError):
+
+    '''
+        Error raised when a snapshot is corrupt, stale or written in an unknown format.
+    '''
+
+
+def snapshot_path(source):
+    'Default path of the snapshot of a network file.'
+
+    return os.fspath(source) + EXTENSION
+
+
+def source_signature(source):
+    'Size and modification time (ns) of the network file the snapshot was built from.'
+
+    if source is None:
+        return 0, 0
+
+    status = os.stat(source)
+    return status.st_size, status.st_mtime_ns
+
+
+def align(size):
+    return (size + 7) // 8 * 8
+
+
+def section_layout(number_nodes, number_edges, names_size, number_reactions, number_terms, number_coefficients,
+                   coefficients_size):
+    'Returns the (dtype, count) of each section, in order, and the indexes of the sections covered by the checksum.'
+
+    sections = [(np.uint8, names_size), (np.uint8, number_nodes),
+                (np.int64, number_nodes + 1), (np.int32, number_edges), (np.int64, number_nodes + 1), (np.int32, number_edges),
+                (np.int32, number_reactions), (np.int64, number_reactions + 1), (np.int64, number_reactions),
+                (np.int32, number_terms), (np.uint8, number_reactions), (np.int64, number_reactions),
+                (np.int64, number_coefficients), (np.uint8, coefficients_size)]
+
+    return sections, (0, 1, 2, 4, 7, 8, 12, 13)
+
+
+def checksum(header, sections, indexes):
+    'CRC32 of the header (without the checksum) and of the given sections.'
+
+    value = zlib.crc32(header[:HEADER.size - 8])
+    for position in indexes:
+        value = zlib.crc32(sections[position], value)
+    return value
+
+
+def write_snapshot(path, names, types, out_offsets, out_targets, in_offsets, in_targets, reactions=None, source=None):
+    """
+        Writes the snapshot to a temporary file and renames it, so a partial snapshot is never read.
+        reactions are the arrays returned by ReactionTable.pack, over the ids of names.
+    """
+    if reactions is None:
+        reactions = ([], [0], [], [], [], [], [], [])
+    reaction_nodes, offsets, splits, terms, reversible, line_numbers, coefficient_positions, coefficients = reactions
+
+    names_blob = "\n".join(names).encode("utf-8")
+    coefficients_blob = json.dumps(list(coefficients), separators=(",", ":")).encode("utf-8") if len(coefficients) else b""
+
+    layout, indexes = section_layout(len(names), len(out_targets), len(names_blob), len(reaction_nodes), len(terms),
+                                     len(coefficient_positions), len(coefficients_blob))
+    values = [names_blob, types, out_offsets, out_targets, in_offsets, in_targets, reaction_nodes, offsets, splits,
+              terms, reversible, line_numbers, coefficient_positions, coefficients_blob]
+    sections = [value if isinstance(value, bytes) else np.ascontiguousarray(value, dtype=dtype).tobytes()
+                for value, (dtype, _) in zip(values, layout)]
+
+    source_size, source_mtime = source_signature(source)
+    header = HEADER.pack(MAGIC, FORMAT_VERSION, 0, len(names), len(out_targets), len(names_blob), len(reaction_nodes),
+                         len(terms), len(coefficient_positions), len(coefficients_blob), source_size, source_mtime, 0)
+    header = header[:HEADER.size - 8] + struct.pack("<I4x", checksum(header, sections, indexes))
+
+    temporary_path = os.fspath(path) + ".tmp"
+    with open(temporary_path, "wb") as out_file:
+        out_file.write(header)
+        for section in sections:
+            out_file.write(section)
+            out_file.write(b"\0" * (align(len(section)) - len(section)))
+    os.replace(temporary_path, path)
+
+
+def read_snapshot(path, source=None, verify=True):
+    """
+        Maps the snapshot in memory and returns (names, types, out_offsets, out_targets, in_offsets, in_targets,
+        reactions). The arrays are read-only views over the mapped file and reactions are the packed arrays
+        given to ReactionTable.unpack. Raises SnapshotError if the snapshot is corrupt, or if it was built from
+        a version of source other than the current one.
+    """
+    path = os.fspath(path)
+    with open(path, "rb") as in_file:
+        try:
+            mapped = mmap.mmap(in_file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            raise SnapshotError(path + ": empty snapshot")
+
+    if len(mapped) < HEADER.size:
+        raise SnapshotError(path + ": truncated snapshot")
+
+    magic, version, _, number_nodes, number_edges, names_size, number_reactions, number_terms, number_coefficients, \
+        coefficients_size, source_size, source_mtime, expected_checksum = HEADER.unpack_from(mapped)
+
+    if magic != MAGIC or version != FORMAT_VERSION:
+        raise SnapshotError(path + ": unknown snapshot format")
+
+    if source is not None and (source_size, source_mtime) != source_signature(source):
+        raise SnapshotError(path + ": stale snapshot of " + os.fspath(source))
+
+    layout, indexes = section_layout(number_nodes, number_edges, names_size, number_reactions, number_terms,
+                                     number_coefficients, coefficients_size)
+    if len(mapped) != HEADER.size + sum(align(count * np.dtype(dtype).itemsize) for dtype, count in layout):
+        raise SnapshotError(path + ": truncated snapshot")
+
+    view, position, sections = memoryview(mapped), HEADER.size, []
+    for dtype, count in layout:
+        size = count * np.dtype(dtype).itemsize
+        sections.append(view[position:position + size])
+        position += align(size)
+
+    if verify and checksum(mapped[:HEADER.size], sections, indexes) != expected_checksum:
+        raise SnapshotError(path + ": checksum mismatch")
+
+    names = bytes(sections[0]).decode("utf-8").split("\n") if number_nodes else []
+    arrays = [np.frombuffer(section, dtype=dtype, count=count) for section, (dtype, count) in zip(sections, layout)]
+    coefficients = json.loads(bytes(sections[13]).decode("utf-8")) if coefficients_size else []
+
+    return (names, *arrays[1:6], (*arrays[6:13], coefficients))
+
+
+def is_current(path, source):
+    'Checks if the snapshot exists and is newer than the network file.'
+
+    return os.path.exists(path) and os.path.getmtime(path) >= os.path.getmtime(source)
@@ -0,0 +1,110 @@
+from collections import deque
+
+'''
+    Traversal kernel shared by the graph algorithms.
+    Both traversals are generators of (node, depth, parent) tuples, yielded as soon as each node
+    is discovered, so the callers can stop early without materializing the whole result.
+    The sources are yielded first, with depth 0 and parent None.
+'''
+
+
+def breadth_first(successors, sources, max_depth=None):
+    'Breadth-first traversal (queue) from one or more sources, in O(V+E).'
+
+    visited = set()
+    queue = deque()
+
+    for source in sources:
+        if source not in visited:
+            visited.add(source)
+            queue.append((source, 0))
+            yield source, 0, None
+
+    while queue:
+        node, depth = queue.popleft()
+        if max_depth is not None and depth >= max_depth:
+            continue
+
+        for element in successors(node):
+            if element not in visited:
+                visited.add(element)
+                queue.append((element, depth + 1))
+                yield element, depth + 1, node
+
+
+def depth_first(successors, sources, max_depth=None):
+    'Depth-first traversal (stack) from one or more sources, in O(V+E). Nodes are yielded in preorder.'
+
+    visited = set()
+
+    for source in sources:
+        if source in visited:
+            continue
+
+        visited.add(source)
+        yield source, 0, None
+        stack = [(source, 0, iter(successors(source)))]
+
+        while stack:
+            node, depth, elements = stack[-1]
+
+            for element in elements:
+                if element not in visited:
+                    visited.add(element)
+                    yield element, depth + 1, node
+
+                    if max_depth is None or depth + 1 < max_depth:
+                        stack.append((element, depth + 1, iter(successors(element))))
+                    break
+            else:
+                stack.pop()
+
+
+def strongly_connected_components(nodes, successors):
+    """
+        Iterative Tarjan algorithm, in O(V+E) and without recursion limits.
+        Returns the components in reverse topological order: each component appears
+        after all the components reachable from it.
+    """
+
+    index, lowlink = {}, {}
+    stack, on_stack = [], set()
+    components = []
+
+    for root in nodes:
+        if root in index:
+            continue
+
+        index[root] = lowlink[root] = len(index)
+        stack.append(root)
+        on_stack.add(root)
+        work = [(root, iter(successors(root)))]
+
+        while work:
+            node, elements = work[-1]
+
+            for element in elements:
+                if element not in index:
+                    index[element] = lowlink[element] = len(index)
+                    stack.append(element)
+                    on_stack.add(element)
+                    work.append((element, iter(successors(element))))
+                    break
+
+                elif element in on_stack and index[element] < lowlink[node]:
+                    lowlink[node] = index[element]
+            else:
+                work.pop()
+                if work and lowlink[node] < lowlink[work[-1][0]]:
+                    lowlink[work[-1][0]] = lowlink[node]
+
+                if lowlink[node] == index[node]:
+                    component = []
+                    element = None
+                    while element != node:
+                        element = stack.pop()
+                        on_stack.discard(element)
+                        component.append(element)
+                    components.append(component)
+
+    return components
@@ -0,0 +1,154 @@
+from .layoutcache import layout_key
+import numpy as np
+import igraph as ig
+from plotly.offline import plot
+import plotly.graph_objs as go
+
+'''
+    Graphical representation of a network with plotly. The layout is chosen by the size of the network:
+    the 3D Kamada-Kawai layout for small networks and, for large ones, the 2D Fruchterman-Reingold layout
+    with the grid approximation of the repulsive forces, drawn with WebGL. The currency metabolites and
+    the hubs can be hidden, since they connect most of the reactions and hide the structure of the network.
+'''
+
+KK_MAX_NODES = 1000
+
+CURRENCY_METABOLITES = frozenset(["C00001", "C00002", "C00003", "C00004", "C00005", "C00006", "C00007", "C00008",
+                                  "C00009", "C00010", "C00011", "C00013", "C00014", "C00080"])
+# H2O, ATP, NAD+, NADH, NADPH, NADP+, O2, ADP, Pi, CoA, CO2, PPi, NH3, H+
+
+
+def choose_layout(number_nodes):
+    'Returns the layout (name, dimensions, options) for a network with the given number of nodes.'
+
+    if number_nodes <= KK_MAX_NODES:
+        return "kk", 3, {}
+
+    return "fr", 2, {"grid": True}
+
+
+def warm_start_options(layout, number_nodes):
+    'Options of the layouts that can start from given coordinates (fewer iterations), or None.'
+
+    return {"kk": {"maxiter": 5 * number_nodes}, "fr": {"niter": 50, "start_temp": 1.0}, "drl": {}}.get(layout)
+
+
+def compute_layout(number_nodes, sources, targets, layout, dim, options, seed=None):
+    'Computes the coordinates of the nodes, an array with one row per node. seed gives the initial coordinates.'
+
+    if seed is not None:
+        options = dict(options, seed=seed.tolist(), **warm_start_options(layout, number_nodes))
+
+    graph = ig.Graph(n=number_nodes, edges=np.column_stack((sources, targets)).tolist(), directed=True)
+    return np.array(graph.layout(layout, dim=dim, **options).coords, dtype=np.float64).reshape(number_nodes, -1)
+
+
+def cached_layout(names, sources, targets, layout, dim, options, cache=None):
+    """
+        Takes the layout from the cache (LayoutCache) or computes it and stores it. A cached layout of
+        a network with most of the same nodes is used as starting point, when the layout allows it.
+    """
+    if cache is None:
+        return compute_layout(len(names), sources, targets, layout, dim, options)
+
+    key = layout_key(names, sources, targets, layout, dim, sorted(options.items()))
+    coordinates = cache.get(key, names)
+
+    if coordinates is None:
+        seed = None
+        if warm_start_options(layout, len(names)) is not None:
+            seed = cache.warm_start(names, sources, targets, layout, dim)
+
+        coordinates = compute_layout(len(names), sources, targets, layout, dim, options, seed)
+        cache.put(key, names, layout, coordinates)
+
+    return coordinates
+
+
+def edge_coordinates(coordinates, sources, targets):
+    'Returns the coordinates of the edges per axis: start, end and a NaN gap for each edge.'
+
+    segments = np.full((len(sources), 3, coordinates.shape[1]), np.nan)
+    segments[:, 0] = coordinates[sources]
+    segments[:, 1] = coordinates[targets]
+
+    return segments.reshape(-1, coordinates.shape[1]).T
+
+
+def hub_mask(names, sources, targets, currency=(), max_degree=None):
+    'Marks the currency metabolites and the nodes with more than max_degree edges.'
+
+    hubs = np.fromiter((name in currency for name in names), dtype=bool, count=len(names))
+
+    if max_degree is not None:
+        degrees = np.bincount(sources, minlength=len(names)) + np.bincount(targets, minlength=len(names))
+        hubs |= degrees > max_degree
+
+    return hubs
+
+
+def remove_nodes(names, sources, targets, removed):
+    'Removes the marked nodes and their edges. Returns the names, sources and targets renumbered.'
+
+    kept = ~removed
+    new_ids = np.cumsum(kept) - 1
+    kept_edges = kept[sources] & kept[targets]
+
+    return [names[node] for node in np.flatnonzero(kept).tolist()], new_ids[sources[kept_edges]], new_ids[targets[kept_edges]]
+
+
+def network_figure(names, coordinates, sources, targets):
+    'Builds the plotly figure: Scatter3d for 3D coordinates, Scattergl for 2D ones.'
+
+    title = "%dD vizualization of the metabolic network" % coordinates.shape[1]
+    coordinates = np.round(coordinates, 3)
+    edges = edge_coordinates(coordinates, sources, targets)
+    marker_size = 6 if len(names) <= KK_MAX_NODES else 3
+
+    if coordinates.shape[1] == 3:
+        edges_trace = go.Scatter3d(x = edges[0], y = edges[1], z = edges[2], mode = "lines",
+                                   line = dict(color = "rgb(125,125,125)", width = 1), hoverinfo = "none")
+        nodes_trace = go.Scatter3d(x = coordinates[:, 0], y = coordinates[:, 1], z = coordinates[:, 2], mode = "markers",
+                                   marker = dict(symbol = "circle", size = marker_size,
+                                                 line = dict(color = "rgb(50,50,50)", width = 0.5)),
+                                   text = names, hoverinfo = "text")
+    else:
+        edges_trace = go.Scattergl(x = edges[0], y = edges[1], mode = "lines",
+                                   line = dict(color = "rgb(125,125,125)", width = 0.5), hoverinfo = "none")
+        nodes_trace = go.Scattergl(x = coordinates[:, 0], y = coordinates[:, 1], mode = "markers",
+                                   marker = dict(symbol = "circle", size = marker_size),
+                                   text = names, hoverinfo = "text")
+
+    axis = dict(showbackground = False, showline = False, zeroline = False, showgrid = False,
+                showticklabels = False, title = "")
+
+    layout = go.Layout(title = title, width = 1000, height = 1000, showlegend = False,
+                       scene = dict(xaxis = dict(axis), yaxis = dict(axis), zaxis = dict(axis)),
+                       xaxis = dict(visible = False), yaxis = dict(visible = False),
+                       margin = dict(t = 50), hovermode = "closest")
+
+    return go.Figure(data = [edges_trace, nodes_trace], layout = layout)
+
+
+def show_network(names, sources, targets, filename=None, layout=None, collapse_currency=False, max_degree=None,
+                 cache=None):
+    """
+        Draws the network given by the node names and the arrays of edges (ids of the nodes).
+        With filename the figure is written to that HTML file without opening the browser.
+        collapse_currency hides the currency metabolites, and max_degree the nodes with more edges.
+        With cache (LayoutCache) the layout is reused when the network was already drawn.
+    """
+    sources, targets = np.asarray(sources, dtype=np.int64), np.asarray(targets, dtype=np.int64)
+
+    if collapse_currency or max_degree is not None:
+        hubs = hub_mask(names, sources, targets, CURRENCY_METABOLITES if collapse_currency else (), max_degree)
+        names, sources, targets = remove_nodes(names, sources, targets, hubs)
+
+    layout, dim, options = choose_layout(len(names)) if layout is None else (layout, 3, {})
+    coordinates = cached_layout(names, sources, targets, layout, dim, options, cache)
+    figure = network_figure(names, coordinates, sources, targets)
+
+    if filename is not None:
+        return plot(figure, filename = filename, auto_open = False)
+
+    return plot(figure)
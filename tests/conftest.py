@@ -0,0 +1,109 @@
+import os
+import random
+import sys
+import urllib.error
+
+import pytest
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+sys.path.insert(0, ROOT)
+
+from metnet.graph import Graph
+
+EXAMPLE_NETWORK = os.path.join(ROOT, "example-net.txt")
+
+
+def make_graph(edges, nodes=()):
+    'Builds a Graph with the given nodes and edges.'
+
+    graph = Graph()
+    graph.add_vertices(nodes)
+    graph.add_edges(edges)
+    return graph
+
+
+def random_edges(number_nodes, number_edges, seed):
+    'Random directed edges between the nodes "N0".."N<number_nodes - 1>", without self loops.'
+
+    generator = random.Random(seed)
+    edges = set()
+    while len(edges) < number_edges:
+        initial_node, final_node = generator.sample(range(number_nodes), 2)
+        edges.add(("N%d" % initial_node, "N%d" % final_node))
+    return sorted(edges)
+
+
+class FakeKEGG:
+
+    '''
+        Stand-in of the KEGG REST API with the interface of the transports of KEGGClient. It records the requests,
+        and the next requests fail with HTTP 503 while failures is positive.
+    '''
+
+    def __init__(self, equations, pathways=None):
+        self.equations = equations # reação -> equação
+        self.pathways = pathways or {} # via -> reações
+        self.requests = []
+        self.failures = 0
+
+    def record(self, path):
+        self.requests.append(path)
+        if self.failures > 0:
+            self.failures -= 1
+            raise urllib.error.HTTPError(path, 503, "Service Unavailable", None, None)
+
+    def get(self, entries):
+        self.record("get/" + "+".join(entries))
+        found = [entry for entry in entries if entry in self.equations]
+        if not found:
+            raise urllib.error.HTTPError("get", 404, "Not Found", None, None)
+
+        return "".join("ENTRY       %s                      Reaction\nNAME        %s\nEQUATION    %s\n///\n"
+                       % (entry, entry.lower(), self.equations[entry]) for entry in found)
+
+    def link(self, target, source):
+        self.record("link/" + target + "/" + source)
+        return "".join("path:%s\trn:%s\n" % (source, reaction) for reaction in self.pathways.get(source, []))
+
+    def list(self, database, organism=None):
+        self.record("list/" + database + "/" + organism)
+        return "".join("path:%s%s\tpathway\n" % (organism, pathway[3:]) for pathway in self.pathways)
+
+    def gets(self):
+        return [path for path in self.requests if path.startswith("get/")]
+
+
+@pytest.fixture
+def kegg():
+    equations = {"R%05d" % number: "C%05d + C%05d <=> C%05d" % (number, number + 1, number + 2) for number in range(1, 31)}
+    equations["R00031"] = "C00031 => C00001"
+    return FakeKEGG(equations, {"map00001": sorted(equations)[:20], "map00002": sorted(equations)[15:]})
+
+
+@pytest.fixture
+def kegg_client(kegg):
+    from metnet.kegg import KEGGClient
+    return KEGGClient(kegg, requests_per_second=0, backoff=0)
+
+
+@pytest.fixture
+def random_graph():
+    return make_graph(random_edges(60, 150, seed=1), ["N%d" % node for node in range(60)])
+
+
+@pytest.fixture
+def example_network():
+    from metnet.metabolicnetwork import MetabolicNetwork
+    return MetabolicNetwork.create(EXAMPLE_NETWORK)
+
+
+@pytest.fixture
+def write_network(tmp_path):
+    'Writes the given reaction lines to a file in tmp_path and returns its path.'
+
+    def write(lines, name="network.txt"):
+        path = tmp_path / name
+        path.write_text("".join(line + "\n" for line in lines))
+        return str(path)
+
+    return write
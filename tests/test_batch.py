@@ -0,0 +1,112 @@
+import csv
+import json
+import os
+import shutil
+import subprocess
+import sys
+
+import pytest
+
+from conftest import EXAMPLE_NETWORK, ROOT
+from metnet.batch import analyze_file, find_files, main, parse_arguments
+
+
+@pytest.fixture
+def networks(tmp_path):
+    'Directory with the example network, a second network and an invalid one.'
+
+    directory = tmp_path / "networks"
+    directory.mkdir()
+    shutil.copy(EXAMPLE_NETWORK, str(directory / "example.txt"))
+    (directory / "small.txt").write_text("R1: A + B => C\nR2: C <=> D\n")
+    (directory / "invalid.txt").write_text("R1: A + B => C\nR2: C -> D\n")
+    return directory
+
+
+def read_results(path):
+    return {os.path.basename(result["file"]): result for result in map(json.loads, open(path))}
+
+
+def test_find_files(networks):
+    (networks / "small.txt.snapshot").write_bytes(b"")
+
+    expected = [str(networks / name) for name in ("example.txt", "invalid.txt", "small.txt")]
+
+    assert find_files([str(networks)]) == expected
+    assert find_files([str(networks / "*.txt"), str(networks / "small.txt")]) == expected
+    assert find_files([str(networks / "missing*")]) == []
+
+
+def test_analyze_file(networks):
+    result = analyze_file(str(networks / "example.txt"), ["counts", "final", "active", "excreted"], ["M1", "M2"])
+
+    assert result["error"] is None
+    assert result["counts"] == (4, 7)
+    assert result["final"] == ["M3", "M7"]
+    assert result["active"] == {"R1"}
+    assert result["excreted"] == {"M3", "M7"}
+    assert result["seconds"] >= result["load_seconds"] >= 0
+
+
+def test_errors_do_not_stop_the_batch(networks):
+    result = analyze_file(str(networks / "invalid.txt"), ["counts"], [])
+
+    assert result["error"].startswith("NetworkFormatError: ")
+    assert ":2: " in result["error"]
+    assert "counts" not in result
+
+
+def test_jsonl(tmp_path, networks):
+    output = str(tmp_path / "results.jsonl")
+
+    status = main([str(networks), "--analyses", "counts,active", "--metabolites", "A", "B", "--output", output,
+                   "--processes", "2"])
+
+    results = read_results(output)
+    assert status == 1
+    assert sorted(results) == ["example.txt", "invalid.txt", "small.txt"]
+    assert results["small.txt"]["counts"] == [2, 4]
+    assert results["small.txt"]["active"] == ["R1", "R2"]
+    assert results["invalid.txt"]["error"] is not None
+
+
+def test_csv(tmp_path, networks):
+    output = str(tmp_path / "results.csv")
+    os.remove(str(networks / "invalid.txt"))
+
+    status = main([str(networks), "--format", "csv", "--output", output, "--processes", "1"])
+
+    rows = {os.path.basename(row["file"]): row for row in csv.DictReader(open(output, newline=""))}
+    assert status == 0
+    assert json.loads(rows["example.txt"]["counts"]) == [4, 7]
+    assert json.loads(rows["small.txt"]["final"]) == []
+    assert rows["small.txt"]["error"] == ""
+
+
+def test_snapshot(tmp_path, networks):
+    output = str(tmp_path / "results.jsonl")
+    arguments = [str(networks / "small.txt"), "--analyses", "counts,final", "--snapshot", "--output", output]
+
+    main(arguments)
+    assert (networks / "small.txt.snapshot").exists()
+
+    main(arguments)
+    assert read_results(output)["small.txt"]["counts"] == [2, 4]
+
+
+def test_arguments():
+    options = parse_arguments(["networks/", "--analyses", " counts , final "])
+
+    assert options.analyses == ["counts", "final"]
+    assert options.output_format == "jsonl" and not options.snapshot
+    with pytest.raises(SystemExit):
+        parse_arguments(["networks/", "--analyses", "counts,unknown"])
+
+
+def test_command_line(networks):
+    completed = subprocess.run([sys.executable, os.path.join(ROOT, "metnet"), "batch", str(networks / "small.txt"),
+                                "--analyses", "counts"], capture_output=True, text=True, timeout=120)
+
+    assert completed.returncode == 0
+    assert json.loads(completed.stdout)["counts"] == [2, 4]
+    assert "1 files analyzed, 0 failed" in completed.stderr
@@ -0,0 +1,119 @@
+import numpy as np
+
+from conftest import make_graph
+from metnet.cache import AnalysisCache, cached_analysis, copy_result, make_key
+from metnet.metabolicnetwork import MetabolicNetwork
+
+
+class Counted:
+
+    'Object with the attributes used by cached_analysis, counting the calls of each analysis.'
+
+    def __init__(self):
+        self.version = 0
+        self.analysis_cache = AnalysisCache(max_entries=2)
+        self.calls = 0
+
+    @cached_analysis
+    def analysis(self, value=1):
+        self.calls += 1
+        return {"values": [value], "array": np.arange(3)}
+
+    @cached_analysis(query = True)
+    def query(self, metabolites):
+        self.calls += 1
+        return set(metabolites)
+
+    @cached_analysis(shared = True)
+    def shared(self):
+        self.calls += 1
+        return [1, 2]
+
+
+def test_memoized_until_change():
+    counted = Counted()
+
+    counted.analysis()
+    counted.analysis()
+    assert counted.calls == 1
+
+    counted.analysis(value=2)
+    assert counted.calls == 2
+
+    counted.version += 1
+    counted.analysis()
+    assert counted.calls == 3
+
+
+def test_results_are_copies():
+    counted = Counted()
+
+    result = counted.analysis()
+    result["values"].append(2)
+    result["array"][0] = 10
+
+    assert counted.analysis()["values"] == [1]
+    assert counted.analysis()["array"].tolist() == [0, 1, 2]
+    assert counted.shared() is counted.shared()
+
+
+def test_queries_do_not_evict_analyses():
+    counted = Counted()
+    counted.analysis()
+
+    for metabolites in (["A"], ["B"], ["C"], ["D"]):
+        counted.query(metabolites)
+    calls = counted.calls
+
+    counted.analysis()
+    counted.query(["D"])
+    assert counted.calls == calls
+
+    counted.query(["A"]) # o mais antigo foi removido
+    assert counted.calls == calls + 1
+    assert len(counted.analysis_cache.entries) == 2
+
+
+def test_query_keys():
+    counted = Counted()
+
+    counted.query(["A", "B"])
+    counted.query(("A", "B"))
+    counted.query({"B", "A"})
+
+    assert counted.calls == 2
+    assert make_key([{"A": [1]}, {"B"}]) == ((("A", (1,)),), frozenset(["B"]))
+
+
+def test_copy_result_keeps_types():
+    value = {"list": [1, (2, {3})], "tuple": (1,), "graph": make_graph([("A", "B")])}
+
+    copied = copy_result(value)
+
+    assert copied["list"] == value["list"] and copied["list"] is not value["list"]
+    assert copied["graph"] is value["graph"]
+    assert type(copied["tuple"]) is tuple
+    assert copied["list"][1][1] is not value["list"][1][1]
+
+
+def test_graph_invalidation(random_graph):
+    degrees = random_graph.all_degrees()
+    degrees["N0"] = -1
+
+    assert random_graph.all_degrees()["N0"] != -1
+
+    random_graph.add_edge("N0", "new")
+    assert random_graph.all_degrees()["new"] == 1
+    assert random_graph.all_degrees()["N0"] == len(random_graph.get_adjacents("N0"))
+
+
+def test_network_invalidation(write_network):
+    network = MetabolicNetwork.create(write_network(["R1: A => B"]))
+    assert network.get_final_metabolites() == ["B"]
+    assert network.get_active_reactions(["A"]) == {"R1"}
+
+    network.add_reaction("R2: B => C")
+
+    assert network.get_final_metabolites() == ["C"]
+    assert network.get_active_reactions(["A"]) == {"R1", "R2"}
+    assert network.get_metabolites_excreted(["A"]) == {"C"}
@@ -0,0 +1,62 @@
+import pytest
+
+from conftest import make_graph
+from metnet.centrality import accumulate_betweenness, betweenness_centrality, normalize_betweenness
+
+
+def test_matches_networkx(random_graph):
+    networkx = pytest.importorskip("networkx")
+    reference = networkx.DiGraph(random_graph.get_edges())
+
+    expected = networkx.betweenness_centrality(reference, normalized=True)
+    result = random_graph.all_betweenness_centrality()
+
+    assert result.keys() == expected.keys()
+    for node, value in expected.items():
+        assert result[node] == pytest.approx(value)
+
+
+def test_path_graph():
+    graph = make_graph([("A", "B"), ("B", "C"), ("C", "D")])
+
+    betweenness = graph.all_betweenness_centrality(normalized=False)
+
+    assert betweenness == {"A": 0.0, "B": 2.0, "C": 2.0, "D": 0.0}
+
+
+def test_counts_every_shortest_path():
+    # A chega a D por B e por C: cada um fica com metade do par
+    graph = make_graph([("A", "B"), ("A", "C"), ("B", "D"), ("C", "D")])
+
+    betweenness = graph.all_betweenness_centrality(normalized=False)
+
+    assert betweenness["B"] == betweenness["C"] == 0.5
+
+
+def test_sources_add_up(random_graph):
+    nodes = random_graph.get_nodes()
+    successors = random_graph.graph_map.__getitem__
+
+    full = accumulate_betweenness(nodes, successors)
+    first = accumulate_betweenness(nodes, successors, nodes[:25])
+    second = accumulate_betweenness(nodes, successors, nodes[25:])
+
+    for node in nodes:
+        assert first[node] + second[node] == pytest.approx(full[node])
+
+
+def test_normalization():
+    betweenness = {"A": 6.0, "B": 0.0, "C": 3.0, "D": 0.0}
+
+    assert normalize_betweenness(betweenness, 4) == {"A": 1.0, "B": 0.0, "C": 0.5, "D": 0.0}
+    assert normalize_betweenness({"A": 1.0}, 2) == {"A": 1.0}
+    assert betweenness_centrality([], lambda node: []) == {}
+
+
+def test_centrality_measures(example_network):
+    betweenness, closeness = example_network.get_centrality_measures()
+
+    graph = example_network.graph
+    assert len(betweenness) == len(closeness) == len(graph.get_nodes())
+    assert [value for _, value in betweenness] == sorted((value for _, value in betweenness), reverse=True)
+    assert dict(betweenness) == {node: round(value, 2) for node, value in graph.all_betweenness_centrality().items()}
@@ -0,0 +1,54 @@
+import pytest
+
+from conftest import make_graph
+
+
+def test_matches_per_node(random_graph):
+    coefficients = random_graph.all_clustering_coefs()
+
+    assert coefficients.keys() == set(random_graph.get_nodes())
+    for node, value in coefficients.items():
+        assert value == pytest.approx(random_graph.clustering_coef(node))
+
+
+def test_triangle():
+    # os adjacentes são contados sem sentido: B e C estão ligados, e dos vizinhos de C só A e B
+    graph = make_graph([("A", "B"), ("A", "C"), ("B", "C"), ("C", "D")])
+
+    coefficients = graph.all_clustering_coefs()
+
+    assert coefficients["A"] == coefficients["B"] == 1.0
+    assert coefficients["C"] == pytest.approx(1 / 3)
+    assert coefficients["D"] == 0.0
+    assert graph.mean_clustering_coef() == pytest.approx((1.0 + 1.0 + 1 / 3 + 0.0) / 4)
+
+
+def test_self_loops_and_reciprocal_edges():
+    graph = make_graph([("A", "B"), ("B", "A"), ("A", "C"), ("C", "A"), ("B", "C"), ("C", "B"), ("A", "A")])
+
+    assert graph.all_clustering_coefs() == {node: graph.clustering_coef(node) for node in "ABC"}
+
+
+def test_per_degree(random_graph):
+    coefficients = random_graph.all_clustering_coefs()
+
+    for deg_type in ("inout", "in", "out"):
+        degrees = random_graph.all_degrees(deg_type)
+        expected = {}
+        for node, degree in degrees.items():
+            expected.setdefault(degree, []).append(coefficients[node])
+
+        result = random_graph.mean_clustering_perdegree(deg_type)
+
+        assert result.keys() == expected.keys()
+        for degree, values in expected.items():
+            assert result[degree] == pytest.approx(sum(values) / len(values))
+
+
+def test_follows_edits():
+    graph = make_graph([("A", "B"), ("A", "C")])
+    assert graph.all_clustering_coefs()["A"] == 0.0
+
+    graph.add_edge("B", "C")
+
+    assert graph.all_clustering_coefs()["A"] == 1.0
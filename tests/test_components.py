@@ -0,0 +1,78 @@
+import pytest
+
+from conftest import make_graph
+from metnet.traversal import strongly_connected_components
+
+
+def cyclic_nodes(graph):
+    'Nodes with a path back to themselves, by a search from each of their successors.'
+
+    return {node for node in graph.get_nodes()
+            if node in graph.graph_map[node] or any(node in graph.reachable_bfs(element) for element in graph.graph_map[node])}
+
+
+def test_components():
+    graph = make_graph([("A", "B"), ("B", "C"), ("C", "A"), ("C", "D"), ("D", "E"), ("E", "D"), ("F", "F")])
+
+    components = graph.strongly_connected_components()
+
+    assert sorted(sorted(component) for component in components) == [["A", "B", "C"], ["D", "E"], ["F"]]
+    # ordem topológica: {A, B, C} antes de {D, E}
+    positions = {node: position for position, component in enumerate(components) for node in component}
+    assert positions["A"] < positions["D"]
+
+
+def test_matches_networkx(random_graph):
+    networkx = pytest.importorskip("networkx")
+    reference = networkx.DiGraph(random_graph.get_edges())
+    reference.add_nodes_from(random_graph.get_nodes())
+
+    expected = sorted(sorted(component) for component in networkx.strongly_connected_components(reference))
+
+    assert sorted(sorted(component) for component in random_graph.strongly_connected_components()) == expected
+    assert sorted(sorted(component) for component in random_graph.freeze().strongly_connected_components()) == expected
+
+
+def test_deep_graph():
+    chain = {node: [node + 1] for node in range(100000)}
+    chain[100000] = [0]
+
+    assert len(strongly_connected_components(chain.keys(), chain.__getitem__)) == 1
+
+
+def test_node_has_cycle(random_graph):
+    random_graph.add_edge("N5", "N5")
+    cyclic = cyclic_nodes(random_graph)
+
+    for node in random_graph.get_nodes():
+        assert random_graph.node_has_cycle(node) == (node in cyclic)
+    assert not random_graph.node_has_cycle("missing")
+
+
+def test_has_cycle():
+    graph = make_graph([("A", "B"), ("B", "C")])
+    assert not graph.has_cycle()
+
+    graph.add_edge("C", "C")
+    assert graph.has_cycle()
+    assert graph.node_has_cycle("C") and not graph.node_has_cycle("B")
+
+    graph.remove_edge("C", "C")
+    graph.add_edge("C", "A")
+    assert graph.has_cycle()
+    assert graph.node_has_cycle("B")
+
+
+def test_condensation():
+    graph = make_graph([("A", "B"), ("B", "A"), ("B", "C"), ("C", "D"), ("D", "C")])
+
+    components, component_of, dag = graph.condensation()
+
+    assert component_of["A"] == component_of["B"] != component_of["C"] == component_of["D"]
+    assert dag.get_edges() == [(component_of["A"], component_of["C"])]
+
+    # o resultado devolvido é uma cópia
+    components.clear()
+    dag.add_edge(component_of["C"], component_of["A"])
+    assert len(graph.condensation()[0]) == 2
+    assert not graph.condensation()[2].has_cycle()
@@ -0,0 +1,101 @@
+import pytest
+
+from conftest import make_graph
+from metnet.csrgraph import CSRGraph
+from metnet.metabolicnetwork import MetabolicNetwork
+
+
+def edge_set(graph):
+    return set(graph.get_edges())
+
+
+def test_same_graph(random_graph):
+    compact = random_graph.freeze()
+
+    assert isinstance(compact, CSRGraph)
+    assert compact.get_nodes() == random_graph.get_nodes()
+    assert edge_set(compact) == edge_set(random_graph)
+    assert compact.size() == random_graph.size()
+
+    for node in random_graph.get_nodes():
+        assert sorted(compact.get_successors(node)) == sorted(random_graph.get_successors(node))
+        assert sorted(compact.get_predecessors(node)) == sorted(random_graph.get_predecessors(node))
+        assert sorted(compact.get_adjacents(node)) == sorted(random_graph.get_adjacents(node))
+        assert compact.degree(node) == random_graph.degree(node)
+
+
+def test_same_analyses(random_graph):
+    compact = random_graph.freeze()
+
+    for deg_type in ("in", "out", "inout"):
+        assert compact.all_degrees(deg_type) == random_graph.all_degrees(deg_type)
+        assert compact.degree_histogram(deg_type) == random_graph.degree_histogram(deg_type)
+    assert sorted(compact.get_sinks()) == sorted(random_graph.get_sinks())
+    assert compact.all_clustering_coefs() == pytest.approx(random_graph.all_clustering_coefs())
+
+
+def test_from_edges_removes_repeated_arcs():
+    compact = CSRGraph.from_edges(["A", "B", "C"], [0, 0, 1, 0], [1, 1, 2, 2])
+
+    assert sorted(compact.get_edges()) == [("A", "B"), ("A", "C"), ("B", "C")]
+    assert compact.get_predecessors("C") == ["A", "B"]
+    assert compact.get_sinks() == ["C"]
+
+
+def test_thaw(random_graph):
+    graph = random_graph.freeze().thaw()
+
+    assert graph.get_nodes() == random_graph.get_nodes()
+    assert graph.graph_map == random_graph.graph_map
+    assert graph.reverse_graph_map == random_graph.reverse_graph_map
+
+    graph.add_edge("N0", "new")
+    assert "new" not in random_graph.graph_map
+
+
+@pytest.mark.parametrize("change", [
+    lambda graph: graph.add_vertex("X"),
+    lambda graph: graph.add_vertices(["X"]),
+    lambda graph: graph.add_edge("A", "X"),
+    lambda graph: graph.add_edges([("A", "X")]),
+    lambda graph: graph.remove_edge("A", "B"),
+    lambda graph: graph.remove_vertex("A"),
+])
+def test_frozen(change):
+    compact = make_graph([("A", "B")]).freeze()
+
+    with pytest.raises(TypeError):
+        change(compact)
+    assert compact.get_edges() == [("A", "B")]
+    assert compact.get_nodes() == ["A", "B"]
+
+
+def test_compact_network(write_network):
+    path = write_network(["R1: A + B => C", "R2: C <=> D"])
+    network = MetabolicNetwork.create(path, compact=True)
+
+    assert isinstance(network.graph, CSRGraph)
+    assert edge_set(network.graph) == edge_set(MetabolicNetwork.create(path).graph)
+
+    for change in (lambda: network.add_reaction("R3: D => E"), lambda: network.remove_reaction("R1"),
+                   lambda: network.add_metabolites_irreversible(["D"], ["E"], "R3"),
+                   lambda: network.add_metabolites_reversible(["D", "E"], "R3")):
+        with pytest.raises(TypeError):
+            change()
+
+    assert network.get_number_reactions_metabolites() == (2, 4)
+    assert network.get_final_metabolites() == []
+    assert network.get_stoichiometry("R1") == ({"A": 1, "B": 1}, {"C": 1})
+
+
+def test_freeze_network(write_network):
+    network = MetabolicNetwork.create(write_network(["R1: A => B"]))
+    edges = edge_set(network.graph)
+
+    network.freeze()
+
+    assert isinstance(network.graph, CSRGraph)
+    assert edge_set(network.graph) == edges
+    with pytest.raises(TypeError):
+        network.add_reaction("R2: B => C")
+    assert network.get_number_reactions_metabolites() == (1, 2)
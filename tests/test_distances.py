@@ -0,0 +1,60 @@
+import numpy as np
+import pytest
+
+from conftest import make_graph
+from metnet.distances import block_distances, distance_sums
+
+
+def brute_force_distances(graph):
+    'Distances of every reachable pair, from one breadth-first search per node.'
+
+    return {node: dict(graph.reachable_with_dist(node)) for node in graph.get_nodes()}
+
+
+def test_block_distances():
+    compact = make_graph([("A", "B"), ("B", "C"), ("C", "A"), ("C", "D"), ("E", "E")]).freeze()
+
+    distances = block_distances(compact, [compact.index["A"], compact.index["D"]])
+
+    assert compact.names == ["A", "B", "C", "D", "E"]
+    assert distances.tolist() == [[0, 1, 2, 3, -1], [-1, -1, -1, 0, -1]]
+
+
+def test_statistics(random_graph):
+    distances = brute_force_distances(random_graph)
+    statistics = random_graph.distance_statistics()
+
+    pairs = [distance for reached in distances.values() for distance in reached.values()]
+    number_nodes = len(distances)
+    assert statistics["mean_distance"] == pytest.approx(sum(pairs) / len(pairs))
+    assert statistics["reachability"] == pytest.approx(len(pairs) / (number_nodes * (number_nodes - 1)))
+    assert random_graph.mean_distances() == (statistics["mean_distance"], statistics["reachability"])
+
+    for node, reached in distances.items():
+        assert statistics["eccentricity"][node] == max(reached.values(), default=0)
+        assert statistics["closeness"][node] == pytest.approx(random_graph.closeness_centrality(node))
+
+
+def test_block_size(random_graph):
+    compact = random_graph.freeze()
+    expected = distance_sums(compact)
+
+    for result, reference in zip(distance_sums(compact, block_size=7), expected):
+        assert np.array_equal(result, reference)
+    assert random_graph.distance_statistics(block_size=7) == random_graph.distance_statistics()
+
+
+def test_closeness_shared_with_mean_distances(random_graph):
+    closeness = random_graph.all_closeness_centrality()
+    misses = random_graph.analysis_cache.misses
+    random_graph.mean_distances()
+    random_graph.eccentricities()
+
+    assert closeness == random_graph.distance_statistics()["closeness"]
+    assert random_graph.analysis_cache.misses == misses
+
+
+def test_small_graphs():
+    assert make_graph([], ["A"]).distance_statistics()["mean_distance"] == 0.0
+    assert make_graph([], ["A"]).mean_distances() == (0.0, 0.0)
+    assert make_graph([("A", "B")]).all_closeness_centrality() == {"A": 1.0, "B": 0.0}
@@ -0,0 +1,137 @@
+import random
+
+import pytest
+
+from metnet.degreestats import DegreeStatistics
+from metnet.metabolicnetwork import MetabolicNetwork
+
+LINES = ["R1: A + B => C", "R2: C <=> D", "R3: D + B => E"]
+
+
+def same_statistics(graph):
+    'Checks the live statistics against the ones computed from scratch.'
+
+    live, fresh = graph.degree_statistics(), DegreeStatistics(graph)
+    assert live.inout == fresh.inout
+    assert live.histograms == fresh.histograms
+    assert set(live.sinks) == set(fresh.sinks)
+    assert graph.all_degrees() == {node: len(graph.get_adjacents(node)) for node in graph.get_nodes()}
+
+
+def test_incremental_network(write_network):
+    expected = MetabolicNetwork.create(write_network(LINES))
+    network = MetabolicNetwork()
+    network.graph.degree_statistics()
+
+    for line in LINES:
+        network.add_reaction(line)
+
+    assert network.graph.graph_map == expected.graph.graph_map
+    assert network.graph.reverse_graph_map == expected.graph.reverse_graph_map
+    assert network.get_number_reactions_metabolites() == expected.get_number_reactions_metabolites()
+    assert network.get_stoichiometry("R2") == expected.get_stoichiometry("R2")
+    same_statistics(network.graph)
+
+
+def test_redefinition(write_network):
+    network = MetabolicNetwork.create(write_network(LINES))
+    network.graph.degree_statistics()
+
+    network.add_reaction("R1: C => F")
+
+    assert sorted(network.graph.get_predecessors("R1")) == ["C"]
+    assert network.graph.get_successors("R1") == ["F"]
+    assert "R1" not in network.graph.graph_map["A"]
+    assert network.get_stoichiometry("R1") == ({"C": 1}, {"F": 1})
+    assert network.get_active_reactions(["A", "B"]) == set()
+    same_statistics(network.graph)
+
+    # a mesma rede, lida de um ficheiro onde a reação é redefinida
+    from_file = MetabolicNetwork.create(write_network(LINES + ["R1: C => F"], "redefined.txt"))
+    assert set(from_file.graph.get_edges()) == set(network.graph.get_edges())
+
+
+def test_remove_and_restore(write_network):
+    network = MetabolicNetwork.create(write_network(LINES))
+    graph_map = {node: set(successors) for node, successors in network.graph.graph_map.items()}
+
+    reaction = network.remove_reaction("R2")
+
+    assert reaction.reversible and reaction.substrates == [("C", 1)]
+    assert "R2" not in network.graph.graph_map
+    assert "R2" not in network.graph.reverse_graph_map["D"]
+    assert network.get_number_reactions_metabolites() == (2, 5)
+    assert sorted(network.get_final_metabolites()) == ["C", "E"]
+    with pytest.raises(KeyError):
+        network.get_stoichiometry("R2")
+
+    network.add_reaction(reaction)
+
+    assert network.graph.graph_map == graph_map
+    assert network.get_stoichiometry("R2") == ({"C": 1}, {"D": 1})
+
+
+def test_remove_unknown_reaction(write_network):
+    network = MetabolicNetwork.create(write_network(LINES))
+
+    for reaction_id in ("A", "R9"):
+        with pytest.raises(KeyError):
+            network.remove_reaction(reaction_id)
+    assert network.get_number_reactions_metabolites() == (3, 5)
+
+
+def test_random_edits_keep_statistics(random_graph):
+    generator = random.Random(7)
+    random_graph.degree_statistics()
+    nodes = ["N%d" % number for number in range(70)]
+
+    for _ in range(500):
+        initial_node, final_node = generator.choice(nodes), generator.choice(nodes)
+        action = generator.random()
+        if action < 0.5:
+            random_graph.add_edge(initial_node, final_node)
+        elif action < 0.9:
+            random_graph.remove_edge(initial_node, final_node)
+        else:
+            random_graph.remove_vertex(initial_node)
+
+    same_statistics(random_graph)
+
+
+def test_histogram_is_a_copy(random_graph):
+    histogram = random_graph.degree_histogram()
+    histogram[1000] = 1
+    degrees = random_graph.all_degrees()
+    degrees["N0"] = 1000
+
+    assert 1000 not in random_graph.degree_histogram()
+    assert random_graph.all_degrees()["N0"] != 1000
+    assert random_graph.degree("N0") != 1000
+    same_statistics(random_graph)
+
+
+def test_fork(write_network):
+    network = MetabolicNetwork.create(write_network(LINES))
+    network.graph.degree_statistics()
+    edges = set(network.graph.get_edges())
+
+    fork = network.fork()
+    fork.remove_reaction("R3")
+    fork.add_reaction("R4: E => F")
+    network.add_reaction("R5: A => G")
+
+    assert set(fork.graph.get_edges()) == edges - {("D", "R3"), ("B", "R3"), ("R3", "E")} | {("E", "R4"), ("R4", "F")}
+    assert set(network.graph.get_edges()) == edges | {("A", "R5"), ("R5", "G")}
+    assert fork.get_number_reactions_metabolites() == (3, 6)
+    assert network.get_number_reactions_metabolites() == (4, 6)
+    same_statistics(fork.graph)
+    same_statistics(network.graph)
+
+
+def test_remove_edge(write_network):
+    network = MetabolicNetwork.create(write_network(LINES))
+
+    network.remove_edge("B", "R3")
+
+    assert sorted(network.graph.get_predecessors("R3")) == ["D"]
+    assert network.graph.in_degree("R3") == 1
@@ -0,0 +1,54 @@
+import random
+
+from metnet.metabolicnetwork import MetabolicNetwork
+
+
+def naive_excreted(network, metabolite):
+    'Final metabolites reachable from the metabolite, by a breadth-first search.'
+
+    final_metabolites = set(network.get_final_metabolites())
+    return final_metabolites.intersection(network.graph.reachable_bfs(metabolite)) - {metabolite}
+
+
+def random_lines(seed):
+    generator = random.Random(seed)
+    lines = []
+    for number in range(60):
+        substrates = generator.sample(range(50), generator.randint(1, 2))
+        products = generator.sample(range(50), generator.randint(1, 2))
+        arrow = "<=>" if generator.random() < 0.2 else "=>"
+        lines.append("R%d: %s %s %s" % (number, " + ".join("M%d" % node for node in substrates), arrow,
+                                        " + ".join("M%d" % node for node in products)))
+    return lines
+
+
+def test_example(example_network):
+    assert example_network.get_metabolites_excreted(["M1"]) == {"M3", "M7"}
+    assert example_network.get_metabolites_excreted(["M6"]) == {"M3", "M7"}
+    assert example_network.get_metabolites_excreted(["M3", "M7"]) == set()
+
+
+def test_matches_search(write_network):
+    network = MetabolicNetwork.create(write_network(random_lines(5)))
+
+    profiles = network.get_excretion_profiles()
+
+    assert profiles.keys() == set(network.graph.get_nodes()) - set("R%d" % number for number in range(60))
+    for metabolite, excreted in profiles.items():
+        assert excreted == naive_excreted(network, metabolite)
+
+    seeds = ["M1", "M2", "M3"]
+    assert network.get_metabolites_excreted(seeds) == set().union(*(naive_excreted(network, seed) for seed in seeds))
+
+
+def test_follows_edits(write_network):
+    network = MetabolicNetwork.create(write_network(["R1: A => B", "R2: B => C"]))
+    assert network.get_metabolites_excreted(["A"]) == {"C"}
+
+    network.add_reaction("R3: C => D + E")
+    assert network.get_metabolites_excreted(["A"]) == {"D", "E"}
+
+    network.remove_reaction("R3")
+    excreted = network.get_metabolites_excreted(["A"])
+    excreted.add("X")
+    assert network.get_metabolites_excreted(["A"]) == {"C"}
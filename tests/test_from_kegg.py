@@ -0,0 +1,45 @@
+from metnet.csrgraph import CSRGraph
+from metnet.metabolicnetwork import MetabolicNetwork
+
+
+def test_same_network_as_the_file(tmp_path, kegg_client):
+    path = str(tmp_path / "map00001.txt")
+    MetabolicNetwork().generate_metabolic_networks("map00001", kegg_client, path)
+    expected = MetabolicNetwork.create(path)
+
+    network = MetabolicNetwork.from_kegg("map00001", client=kegg_client)
+
+    assert network.graph.get_nodes() == expected.graph.get_nodes()
+    assert network.graph.graph_map == expected.graph.graph_map
+    assert network.get_number_reactions_metabolites() == expected.get_number_reactions_metabolites()
+    assert network.get_stoichiometry("R00001") == ({"C00001": 1, "C00002": 1}, {"C00003": 1})
+
+
+def test_output_and_compact(tmp_path, kegg_client):
+    path = str(tmp_path / "map00002.txt")
+
+    network = MetabolicNetwork.from_kegg("map00002", client=kegg_client, output=path, compact=True)
+
+    assert isinstance(network.graph, CSRGraph)
+    assert network.graph.graph_map == MetabolicNetwork.create(path).graph.graph_map
+    assert not (tmp_path / "map00002.txt.part").exists()
+
+
+def test_stream(kegg, kegg_client):
+    network = MetabolicNetwork()
+    sizes = []
+
+    for number_reactions in network.stream_kegg("map00001", kegg_client, batch_size=8):
+        # a rede pode ser analisada antes de chegar a última reação
+        sizes.append((number_reactions, network.get_number_reactions_metabolites()[0]))
+
+    assert sizes == [(8, 8), (16, 16), (20, 20)]
+
+
+def test_missing_reactions_are_skipped(kegg, kegg_client):
+    kegg.pathways["map00001"].append("R99999")
+
+    network = MetabolicNetwork.from_kegg("map00001", client=kegg_client)
+
+    assert network.get_number_reactions_metabolites()[0] == 20
+    assert "R99999" not in network.graph.graph_map
@@ -0,0 +1,48 @@
+from conftest import make_graph
+
+
+def reverse_of(graph):
+    'Reverse adjacency rebuilt from scratch from the successors.'
+
+    reverse = {node: set() for node in graph.graph_map}
+    for initial_node, final_node in graph.get_edges():
+        reverse[final_node].add(initial_node)
+    return reverse
+
+
+def test_predecessors():
+    graph = make_graph([("A", "C"), ("B", "C"), ("C", "D")])
+
+    assert sorted(graph.get_predecessors("C")) == ["A", "B"]
+    assert graph.get_predecessors("A") == []
+    assert graph.in_degree("C") == 2
+    assert sorted(graph.get_adjacents("C")) == ["A", "B", "D"]
+
+
+def test_reverse_index_follows_edits(random_graph):
+    random_graph.remove_edge("N0", random_graph.get_successors("N0")[0])
+    random_graph.remove_vertex("N1")
+    random_graph.add_edge("N2", "N3")
+    random_graph.add_edge("N2", "new")
+
+    assert random_graph.reverse_graph_map == reverse_of(random_graph)
+    assert "N1" not in random_graph.reverse_graph_map
+    assert all("N1" not in successors for successors in random_graph.graph_map.values())
+
+
+def test_add_edges_keeps_reverse_index():
+    graph = make_graph([("A", "B"), ("A", "B"), ("B", "A")])
+
+    assert graph.size() == (2, 2)
+    assert graph.reverse_graph_map == {"A": {"B"}, "B": {"A"}}
+
+
+def test_remove_missing_edge():
+    graph = make_graph([("A", "B")])
+    version = graph.version
+
+    graph.remove_edge("B", "A")
+    graph.remove_edge("A", "C")
+
+    assert graph.get_edges() == [("A", "B")]
+    assert graph.version == version
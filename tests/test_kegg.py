@@ -0,0 +1,79 @@
+import time
+import urllib.error
+
+import pytest
+
+from metnet.kegg import (KEGGClient, RateLimiter, make_batches, organism_maps, parse_equation, parse_links,
+                         split_entries)
+from metnet.metabolicnetwork import MetabolicNetwork
+
+
+def test_parsers(kegg):
+    flat_files = split_entries(kegg.get(["R00001", "R00031"]))
+
+    assert list(flat_files) == ["R00001", "R00031"]
+    assert parse_equation(flat_files["R00031"]) == "C00031 => C00001"
+    assert parse_equation("ENTRY       R1\n///\n") is None
+    assert parse_links("path:map00001\trn:R00001\npath:map00001\trn:R00002\n") == ["R00001", "R00002"]
+    assert organism_maps("path:hsa00010\tGlycolysis\npath:hsa00020\tTCA\n", "hsa") == ["map00010", "map00020"]
+    assert make_batches(list(range(25))) == [list(range(10)), list(range(10, 20)), list(range(20, 25))]
+
+
+def test_batches(kegg, kegg_client):
+    entries = ["rn:R%05d" % number for number in range(1, 26)]
+
+    result = list(kegg_client.iter_entries(entries))
+
+    assert [entry for entry, _ in result] == [entry[3:] for entry in entries]
+    assert len(kegg.gets()) == 3
+    assert all(len(path[4:].split("+")) <= 10 for path in kegg.gets())
+
+
+def test_missing_entries(kegg, kegg_client):
+    entries = ["R00001", "R99999", "R00002"]
+
+    assert list(kegg_client.get_entries(entries)) == ["R00001", "R00002"]
+    assert [(entry, flat_file is None) for entry, flat_file in kegg_client.iter_entries(entries, include_missing=True)] == \
+        [("R00001", False), ("R99999", True), ("R00002", False)]
+    assert kegg_client.get_entries(["R99998"]) == {}
+
+
+def test_retries(kegg, kegg_client):
+    kegg.failures = 2
+
+    assert list(kegg_client.get_entries(["R00001"])) == ["R00001"]
+    assert len(kegg.gets()) == 3
+
+    kegg.failures = 10
+    with pytest.raises(urllib.error.HTTPError):
+        kegg_client.get_entries(["R00002"])
+
+
+def test_concurrent_batches_keep_order(kegg):
+    client = KEGGClient(kegg, workers=4, requests_per_second=0)
+    entries = ["R%05d" % number for number in range(31, 0, -1)]
+
+    assert [entry for entry, _ in client.iter_entries(entries)] == entries
+
+
+def test_rate_limiter():
+    limiter = RateLimiter(50)
+
+    start = time.monotonic()
+    for _ in range(4):
+        limiter.wait()
+
+    assert time.monotonic() - start >= 3 / 50 - 0.005
+    assert RateLimiter(0).interval == 0.0
+
+
+def test_generate_metabolic_networks(tmp_path, kegg, kegg_client):
+    output = str(tmp_path / "map00001.txt")
+
+    assert MetabolicNetwork().generate_metabolic_networks("map00001", kegg_client, output) == output
+
+    lines = open(output).read().splitlines()
+    assert lines[0] == "R00001 : C00001 + C00002 <=> C00003"
+    assert len(lines) == 20
+    assert len(kegg.gets()) == 2
+    assert MetabolicNetwork.create(output).get_number_reactions_metabolites() == (20, 22)
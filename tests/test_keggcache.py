@@ -0,0 +1,128 @@
+import pytest
+
+from metnet import keggcache
+from metnet.kegg import KEGGClient, KEGGOfflineError
+from metnet.keggcache import ACCESS_RESOLUTION, KEGGResponseCache
+from metnet.metabolicnetwork import MetabolicNetwork
+
+
+class Clock:
+
+    'Replaces the time module of keggcache, so the tests set the time of each operation.'
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def time(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(keggcache, "time", clock)
+    return clock
+
+
+def stored_size(cache):
+    return cache.connection.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+
+
+def test_persistent(tmp_path):
+    path = str(tmp_path / "kegg.sqlite")
+    cache = KEGGResponseCache(path)
+    cache.put("get/R00001", "EQUATION    C00001 => C00002")
+    cache.close()
+
+    cache = KEGGResponseCache(path)
+
+    assert cache.get("get/R00001") == "EQUATION    C00001 => C00002"
+    assert cache.get("get/R00002") is None
+    assert cache.statistics() == {"hits": 1, "misses": 1, "evictions": 0, "entries": 1, "bytes": 28}
+
+
+def test_time_to_live(clock):
+    cache = KEGGResponseCache(":memory:", ttl=100)
+    cache.put("a", "1")
+    clock.now += 50
+    cache.put("b", "2")
+
+    clock.now += 60
+    assert cache.get("a") is None and cache.get("b") == "2"
+
+    cache.purge_expired()
+    assert cache.statistics()["entries"] == 1
+    assert cache.total == stored_size(cache) == 1
+
+
+def test_least_recently_used(clock):
+    cache = KEGGResponseCache(":memory:", max_bytes=30)
+    for key in ("a", "b", "c"):
+        cache.put(key, "x" * 10)
+        clock.now += ACCESS_RESOLUTION
+
+    cache.get("a")
+    cache.put("d", "x" * 10)
+
+    assert cache.get("b") is None
+    assert all(cache.get(key) for key in ("a", "c", "d"))
+    assert cache.evictions == 1
+    assert cache.total == stored_size(cache) == 30
+
+
+def test_hit_does_not_write(clock):
+    cache = KEGGResponseCache(":memory:")
+    cache.put("a", "1")
+    changes = cache.connection.total_changes
+
+    cache.get("a")
+    clock.now += ACCESS_RESOLUTION
+    cache.get("a")
+    cache.get("a")
+
+    assert cache.connection.total_changes == changes
+    assert list(cache.accessed) == ["a"]
+
+    cache.flush()
+    assert cache.connection.execute("SELECT accessed FROM responses").fetchone()[0] == clock.now
+
+
+def test_running_total():
+    cache = KEGGResponseCache(":memory:", max_bytes=100)
+
+    cache.put_many([("a", "x" * 40), ("b", "y" * 40)])
+    cache.put("a", "é" * 5)
+    assert cache.total == stored_size(cache) == 50
+
+    cache.put("c", "z" * 90)
+    assert cache.total == stored_size(cache) <= 100
+    assert cache.get("c") == "z" * 90
+
+    cache.clear()
+    assert cache.total == stored_size(cache) == 0
+
+
+def test_client(tmp_path, kegg):
+    path = str(tmp_path / "kegg.sqlite")
+    client = KEGGClient(kegg, requests_per_second=0, cache=KEGGResponseCache(path))
+    output = str(tmp_path / "map00001.txt")
+    MetabolicNetwork().generate_metabolic_networks("map00001", client, output)
+    expected = open(output).read()
+    number_requests = len(kegg.requests)
+
+    offline = KEGGClient(kegg, cache=KEGGResponseCache(path), offline=True)
+    MetabolicNetwork().generate_metabolic_networks("map00001", offline, output)
+
+    assert open(output).read() == expected
+    assert len(kegg.requests) == number_requests
+    assert offline.cache.statistics()["misses"] == 0
+    with pytest.raises(KEGGOfflineError):
+        offline.get_entries(["R00031"])
+
+
+def test_missing_entries_are_cached(kegg):
+    client = KEGGClient(kegg, requests_per_second=0, cache=KEGGResponseCache(":memory:"))
+
+    assert client.get_entries(["R99999", "R00001"]).keys() == {"R00001"}
+    assert client.get_entries(["R99999", "R00001"]).keys() == {"R00001"}
+    assert len(kegg.gets()) == 1
@@ -0,0 +1,98 @@
+import os
+
+import numpy as np
+import pytest
+
+from metnet.keggcache import default_cache_path
+from metnet.layoutcache import LayoutCache, layout_key
+
+NAMES = ["A", "B", "C", "D"]
+SOURCES = np.array([0, 1, 2])
+TARGETS = np.array([1, 2, 3])
+COORDINATES = np.arange(12, dtype=np.float64).reshape(4, 3)
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return LayoutCache(str(tmp_path / "layouts"), max_layouts=3)
+
+
+def test_key():
+    key = layout_key(NAMES, SOURCES, TARGETS, "kk", 3)
+    # os mesmos nós e arcos por outra ordem
+    reordered = layout_key(["D", "C", "B", "A"], np.array([1, 3, 2]), np.array([0, 2, 1]), "kk", 3)
+
+    assert key == reordered
+    assert key != layout_key(NAMES, SOURCES, TARGETS, "kk", 2)
+    assert key != layout_key(NAMES, SOURCES[:2], TARGETS[:2], "kk", 3)
+    assert key != layout_key(["A", "B", "C", "E"], SOURCES, TARGETS, "kk", 3)
+
+
+def test_get_and_put(cache):
+    key = layout_key(NAMES, SOURCES, TARGETS, "kk", 3)
+    assert cache.get(key, NAMES) is None
+
+    cache.put(key, NAMES, "kk", COORDINATES)
+
+    assert cache.get(key, NAMES).tolist() == COORDINATES.tolist()
+    assert cache.get(key, NAMES[::-1]).tolist() == COORDINATES[::-1].tolist()
+    assert (cache.hits, cache.misses) == (2, 1)
+
+
+def test_least_recently_used(cache):
+    for number in range(3):
+        cache.put("key%d" % number, NAMES, "kk", COORDINATES)
+        os.utime(cache.path("key%d" % number), (number, number))
+
+    assert cache.get("key0", NAMES) is not None # passa a ser o mais recente
+    cache.put("key3", NAMES, "kk", COORDINATES)
+
+    assert sorted(os.path.basename(path) for path in cache.entries()) == ["key0.npz", "key2.npz", "key3.npz"]
+
+
+def test_corrupt_entry(cache):
+    with open(cache.path("key"), "wb") as entry:
+        entry.write(b"not a layout")
+
+    assert cache.get("key", NAMES) is None
+    assert cache.warm_start(NAMES, SOURCES, TARGETS, "kk", 3) is None
+
+
+def test_warm_start(cache):
+    cache.put("key", NAMES, "kk", COORDINATES)
+    names = NAMES + ["E"] + ["N%d" % number for number in range(40)]
+    sources, targets = np.append(SOURCES, 4), np.append(TARGETS, 3)
+
+    assert cache.warm_start(names, sources, targets, "kk", 3) is None # poucos nós em comum
+
+    cache.min_overlap = 0.5
+    seed = cache.warm_start(NAMES + ["E"], sources, targets, "kk", 3)
+
+    assert seed[:4].tolist() == COORDINATES.tolist()
+    assert np.abs(seed[4] - COORDINATES[3]).max() < 1 # E começa junto de D, o seu vizinho
+    assert cache.warm_start(NAMES, SOURCES, TARGETS, "fr", 3) is None
+    assert cache.warm_start(NAMES, SOURCES, TARGETS, "kk", 2) is None
+
+
+def test_cached_layout(cache):
+    pytest.importorskip("igraph")
+    from metnet.visualization import cached_layout
+
+    coordinates = cached_layout(NAMES, SOURCES, TARGETS, "kk", 3, {}, cache)
+
+    assert np.allclose(cached_layout(NAMES, SOURCES, TARGETS, "kk", 3, {}, cache), coordinates, atol=1e-4)
+    assert (cache.hits, cache.misses) == (1, 1)
+
+    cached_layout(NAMES + ["E"], np.append(SOURCES, 4), np.append(TARGETS, 3), "kk", 3, {}, cache)
+    assert cache.warm_starts == 0 # 4 de 5 nós: abaixo de min_overlap
+
+    cache.min_overlap = 0.5
+    cached_layout(NAMES + ["F"], np.append(SOURCES, 4), np.append(TARGETS, 3), "kk", 3, {}, cache)
+    assert cache.warm_starts == 1
+
+
+def test_cache_directory(tmp_path, monkeypatch):
+    monkeypatch.setenv("METNET_CACHE_DIR", str(tmp_path))
+
+    assert LayoutCache().directory == str(tmp_path / "layouts")
+    assert default_cache_path() == str(tmp_path / "kegg.sqlite")
@@ -0,0 +1,42 @@
+from metnet.metabolicnetwork import MetabolicNetwork
+
+LINES = ["rxn1: Ribose + ATP => Ribose-5P + ADP", "rxn2: Ribose-5P + ATP <=> PRPP + AMP", "rxn3: PRPP =>",
+         "rxn4: ADP + AMP => ATP"]
+
+
+def test_node_kinds(write_network):
+    network = MetabolicNetwork.create(write_network(LINES))
+
+    # os tipos dos nós vêm da sua posição nas reações, não dos nomes
+    assert network.get_number_reactions_metabolites() == (4, 6)
+    assert network.get_number_reactions_metabolites(1, 2) == (5, 8)
+    assert network.get_final_metabolites() == []
+
+
+def test_final_metabolites(example_network, write_network):
+    assert example_network.get_final_metabolites() == ["M3", "M7"]
+
+    network = MetabolicNetwork.create(write_network(["R1: A => B", "R2: B =>", "R3: C => D"]))
+
+    assert network.get_final_metabolites() == ["D"] # R2 não tem sucessores, mas é uma reação
+
+
+def test_frequent_metabolites(example_network):
+    degrees = example_network.graph.all_degrees()
+    metabolites = ["M%d" % number for number in range(1, 8)]
+    expected = sorted(metabolites, key=lambda metabolite: -degrees[metabolite])
+
+    assert example_network.get_frequent_metabolites() == expected[:5]
+    assert example_network.get_frequent_metabolites(2) == ["M4", "M6"]
+    assert example_network.get_frequent_metabolites(100) == expected
+
+
+def test_kinds_follow_edits(write_network):
+    network = MetabolicNetwork.create(write_network(["R1: A => B"]))
+
+    network.add_reaction("R2: B + C => D")
+    network.remove_reaction("R1")
+
+    assert network.get_number_reactions_metabolites() == (1, 4)
+    assert sorted(network.get_final_metabolites()) == ["A", "D"]
+    assert network.get_frequent_metabolites(1) == ["B"]
@@ -0,0 +1,31 @@
+import pytest
+
+from metnet.parallel import get_workers, parallel_betweenness_centrality, parallel_distance_statistics
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_betweenness(random_graph, workers):
+    expected = random_graph.all_betweenness_centrality()
+
+    result = parallel_betweenness_centrality(random_graph, workers)
+
+    assert result.keys() == expected.keys()
+    for node, value in expected.items():
+        assert result[node] == pytest.approx(value)
+    assert parallel_betweenness_centrality(random_graph.freeze(), workers, normalized=False) == \
+        pytest.approx(random_graph.all_betweenness_centrality(normalized=False))
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_distance_statistics(random_graph, workers):
+    assert parallel_distance_statistics(random_graph, workers, block_size=5) == random_graph.distance_statistics()
+
+
+def test_centrality_measures(example_network):
+    assert example_network.get_centrality_measures(workers=2) == example_network.get_centrality_measures()
+
+
+def test_workers():
+    assert get_workers(3) == 3
+    assert get_workers(0) == 1
+    assert get_workers(None) >= 1
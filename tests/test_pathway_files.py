@@ -0,0 +1,85 @@
+import os
+import urllib.error
+
+import pytest
+
+from metnet.kegg import KEGGClient
+from metnet.metabolicnetwork import MetabolicNetwork
+
+
+def interrupt_after(kegg, number_gets):
+    'Makes the gets of the fake KEGG fail after the first number_gets.'
+
+    get = kegg.get
+
+    def interrupted_get(entries):
+        if len(kegg.gets()) >= number_gets:
+            raise urllib.error.HTTPError("get", 400, "Bad Request", None, None)
+        return get(entries)
+
+    kegg.get = interrupted_get
+    return get
+
+
+@pytest.fixture
+def output(tmp_path):
+    return str(tmp_path / "map00001_metabolicnetwork.txt")
+
+
+def test_interrupted_run_resumes(tmp_path, kegg, output):
+    expected_path = str(tmp_path / "expected.txt")
+    MetabolicNetwork().generate_metabolic_networks("map00001", KEGGClient(kegg, requests_per_second=0), expected_path)
+
+    get = interrupt_after(kegg, 3)
+    client = KEGGClient(kegg, workers=1, requests_per_second=0, retries=0)
+    with pytest.raises(urllib.error.HTTPError):
+        MetabolicNetwork().generate_metabolic_networks("map00001", client, output)
+
+    assert not os.path.exists(output)
+    assert len(open(output + ".part").read().splitlines()) == 10
+    assert len(open(output + ".checkpoint").read().splitlines()) == 10
+
+    kegg.get = get
+    requested = len(kegg.gets())
+    MetabolicNetwork().generate_metabolic_networks("map00001", client, output)
+
+    assert open(output).read() == open(expected_path).read()
+    assert len(kegg.gets()) == requested + 1
+    assert not os.path.exists(output + ".part") and not os.path.exists(output + ".checkpoint")
+
+
+def test_incomplete_line_is_dropped(kegg, kegg_client, output):
+    with open(output + ".part", "w") as partial_file:
+        partial_file.write("R00001 : C00001 + C00002 <=> C00003\nR00002 : C00002 + C0")
+
+    MetabolicNetwork().generate_metabolic_networks("map00001", kegg_client, output)
+
+    lines = open(output).read().splitlines()
+    assert len(lines) == len(set(lines)) == 20
+    assert "R00002 : C00002 + C00003 <=> C00004" in lines
+    assert "R00001" not in " ".join(kegg.gets())
+
+
+def test_missing_reactions_are_checkpointed(kegg, output):
+    kegg.pathways["map00001"].insert(0, "R99999")
+    get = interrupt_after(kegg, 1)
+    client = KEGGClient(kegg, workers=1, requests_per_second=0, retries=0)
+
+    with pytest.raises(urllib.error.HTTPError):
+        MetabolicNetwork().generate_metabolic_networks("map00001", client, output)
+    assert "R99999" in open(output + ".checkpoint").read().split()
+
+    kegg.get = get
+    MetabolicNetwork().generate_metabolic_networks("map00001", client, output)
+
+    assert [path for path in kegg.gets() if "R99999" in path] == ["get/" + "+".join(kegg.pathways["map00001"][:10])]
+    assert len(open(output).read().splitlines()) == 20
+
+
+def test_stale_checkpoint_without_partial_file(kegg, kegg_client, output):
+    with open(output + ".checkpoint", "w") as checkpoint_file:
+        checkpoint_file.write("R00001\nR00002\n")
+
+    MetabolicNetwork().generate_metabolic_networks("map00001", kegg_client, output)
+
+    assert len(open(output).read().splitlines()) == 20
@@ -0,0 +1,64 @@
+import os
+from collections import Counter
+
+import pytest
+
+from metnet.metabolicnetwork import MetabolicNetwork
+
+
+@pytest.fixture(autouse=True)
+def in_tmp_path(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+
+
+def requested_entries(kegg):
+    return Counter(entry for path in kegg.gets() for entry in path[4:].split("+"))
+
+
+def reactions_of(path):
+    return [line.split(" : ")[0] for line in open(path).read().splitlines()]
+
+
+def test_each_reaction_is_retrieved_once(kegg, kegg_client):
+    outputs = MetabolicNetwork().generate_pathway_networks(["map00001", "map00002", "map00001"], client=kegg_client,
+                                                           merged="merged.txt")
+
+    assert outputs == ["map00001_metabolicnetwork.txt", "map00002_metabolicnetwork.txt", "merged.txt"]
+    assert reactions_of(outputs[0]) == kegg.pathways["map00001"]
+    assert reactions_of(outputs[1]) == kegg.pathways["map00002"]
+    assert sorted(reactions_of("merged.txt")) == sorted(kegg.equations)
+
+    entries = requested_entries(kegg)
+    assert set(entries) == set(kegg.equations)
+    assert max(entries.values()) == 1
+
+
+def test_same_files_as_one_pathway_at_a_time(tmp_path, kegg, kegg_client):
+    MetabolicNetwork().generate_pathway_networks(["map00001", "map00002"], client=kegg_client)
+
+    for pathway in ("map00001", "map00002"):
+        expected = str(tmp_path / (pathway + ".expected"))
+        MetabolicNetwork().generate_metabolic_networks(pathway, kegg_client, expected)
+        assert sorted(open(pathway + "_metabolicnetwork.txt")) == sorted(open(expected))
+
+
+def test_organism(kegg, kegg_client):
+    outputs = MetabolicNetwork().generate_pathway_networks(organism="hsa", client=kegg_client)
+
+    assert outputs == ["map00001_metabolicnetwork.txt", "map00002_metabolicnetwork.txt"]
+    assert "list/pathway/hsa" in kegg.requests
+
+
+def test_interrupted_run_resumes(kegg, kegg_client):
+    # a primeira via ficou a meio: só é pedido o que falta, e as reações partilhadas continuam na segunda
+    with open("map00001_metabolicnetwork.txt.part", "w") as partial_file:
+        partial_file.write("R00016 : C00016 + C00017 <=> C00018\n")
+    with open("map00001_metabolicnetwork.txt.checkpoint", "w") as checkpoint_file:
+        checkpoint_file.write("R00016\n")
+
+    MetabolicNetwork().generate_pathway_networks(["map00001", "map00002"], client=kegg_client)
+
+    assert sorted(reactions_of("map00001_metabolicnetwork.txt")) == kegg.pathways["map00001"]
+    assert sorted(reactions_of("map00002_metabolicnetwork.txt")) == kegg.pathways["map00002"]
+    assert requested_entries(kegg)["R00016"] == 1
+    assert not [name for name in os.listdir(".") if name.endswith((".part", ".checkpoint"))]
@@ -0,0 +1,101 @@
+import pickle
+
+from metnet.reactiontable import ReactionTable
+from metnet.reader import parse_reaction
+
+LINES = ["R1: A + 2 B => C", "R2: C <=> 0.5 D", "R3: D => A + E"]
+
+
+def make_table(lines=LINES):
+    table = ReactionTable()
+    table.add_batch(parse_reaction(line, line_number) for line_number, line in enumerate(lines, 1))
+    return table
+
+
+def arc_set(table):
+    sources, targets = table.arcs()
+    return {(table.names[source], table.names[target]) for source, target in zip(sources.tolist(), targets.tolist())}
+
+
+def test_reactions():
+    table = make_table()
+
+    assert len(table) == 3 and "R2" in table and "A" not in table
+    assert list(table.values()) == [parse_reaction(line, line_number) for line_number, line in enumerate(LINES, 1)]
+    assert table.get("R2").products == [("D", 0.5)]
+    assert table.get("R4") is None
+
+
+def test_arcs_and_directions():
+    table = make_table()
+
+    assert arc_set(table) == {("A", "R1"), ("B", "R1"), ("R1", "C"), ("C", "R2"), ("R2", "D"), ("D", "R2"),
+                              ("R2", "C"), ("D", "R3"), ("R3", "A"), ("R3", "E")}
+    assert list(table.directions()) == [("R1", ["A", "B"], ["C"]), ("R2", ["C"], ["D"]), ("R2", ["D"], ["C"]),
+                                        ("R3", ["D"], ["A", "E"])]
+
+
+def test_redefinition():
+    table = make_table()
+
+    replaced = table.add_batch([parse_reaction("R1: B => F")])
+
+    assert [reaction.reaction_id for reaction in replaced] == ["R1"]
+    assert replaced[0].substrates == [("A", 1), ("B", 2)]
+    assert table.get("R1").substrates == [("B", 1)]
+    assert ("A", "R1") not in arc_set(table) and ("B", "R1") in arc_set(table)
+    assert len(table) == 3
+
+
+def test_redefinition_in_one_batch():
+    table = make_table(["R1: A => B", "R1: C => D"])
+
+    assert table.get("R1").substrates == [("C", 1)]
+    assert arc_set(table) == {("C", "R1"), ("R1", "D")}
+
+
+def test_remove():
+    table = make_table()
+
+    assert table.remove("R2").reversible
+    assert table.remove("R2") is None
+    assert "R2" not in table
+    assert not any("R2" in arc for arc in arc_set(table))
+    assert 0.5 not in table.coefficients.values()
+
+
+def test_extend():
+    table = make_table()
+    other = make_table(["R1: X => A", "R4: 3 E => F"])
+
+    replaced = table.extend(other)
+
+    assert [reaction.reaction_id for reaction in replaced] == ["R1"]
+    assert list(table) == ["R2", "R3", "R1", "R4"]
+    assert table.get("R1").substrates == [("X", 1)]
+    assert table.get("R4").substrates == [("E", 3)]
+    assert table.get("R2").products == [("D", 0.5)]
+
+
+def test_pack_and_unpack():
+    table = make_table()
+    table.remove("R1")
+    index = {name: node for node, name in enumerate(["C", "D", "R2", "R3", "A", "E"])}
+
+    unpacked = ReactionTable.unpack(list(index), *table.pack(index))
+
+    assert list(unpacked.values()) == list(table.values())
+    assert arc_set(unpacked) == arc_set(table)
+
+
+def test_pickle_and_copy():
+    table = make_table()
+    table.remove("R3")
+
+    for copied in (pickle.loads(pickle.dumps(table)), table.copy()):
+        assert list(copied.values()) == list(table.values())
+        assert arc_set(copied) == arc_set(table)
+
+    copied = table.copy()
+    copied.add_batch([parse_reaction("R5: A => Z")])
+    assert "R5" not in table and "Z" not in table.index
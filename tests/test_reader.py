@@ -0,0 +1,90 @@
+import bz2
+import gzip
+import io
+import lzma
+
+import pytest
+
+from conftest import EXAMPLE_NETWORK
+from metnet.metabolicnetwork import MetabolicNetwork
+from metnet.reader import NetworkFormatError, Reaction, is_compressed, parse_reaction, read_reactions
+
+LINES = ["R1: M1 + 2 M2 => M3 + M4", "", "# comment", "R2: 0.5 M4 <=> (n+1) M5", "R3 : M5 =>"]
+
+
+def test_parse_reaction():
+    assert parse_reaction(LINES[0], 1) == Reaction("R1", [("M1", 1), ("M2", 2)], [("M3", 1), ("M4", 1)], False, 1)
+    assert parse_reaction(LINES[3]) == Reaction("R2", [("M4", 0.5)], [("M5", "(n+1)")], True, None)
+    assert parse_reaction(LINES[4]) == Reaction("R3", [("M5", 1)], [], False, None)
+    assert parse_reaction("") is None
+    assert parse_reaction(LINES[2]) is None
+
+
+@pytest.mark.parametrize("line, reason", [
+    ("R1: M1 -> M2", "without '=>' or '<=>'"),
+    (": M1 => M2", "missing reaction identifier"),
+    ("R1: M1 => M2 => M3", "more than one arrow"),
+    ("R1: M1 + => M2", "empty metabolite"),
+])
+def test_errors(write_network, line, reason):
+    path = write_network(["R0: A => B", line])
+
+    with pytest.raises(NetworkFormatError) as error:
+        MetabolicNetwork.create(path)
+
+    assert reason in str(error.value)
+    assert error.value.line_number == 2
+    assert error.value.source == path
+    assert str(error.value).startswith(path + ":2: ")
+    assert isinstance(error.value, ValueError)
+
+
+@pytest.mark.parametrize("compress", [gzip.compress, bz2.compress, lzma.compress])
+def test_compressed(tmp_path, write_network, compress):
+    path = write_network(LINES)
+    compressed = tmp_path / "network.txt.compressed"
+    compressed.write_bytes(compress(open(path, "rb").read()))
+
+    assert is_compressed(str(compressed)) and not is_compressed(path)
+    assert list(read_reactions(str(compressed))) == list(read_reactions(path))
+
+
+def test_sources(write_network):
+    path = write_network(LINES)
+    expected = list(read_reactions(path))
+
+    with open(path) as text_file:
+        assert list(read_reactions(text_file)) == expected
+    with open(path, "rb") as binary_file:
+        assert list(read_reactions(binary_file)) == expected
+    assert list(read_reactions(io.BytesIO(gzip.compress(open(path, "rb").read())))) == expected
+    assert list(read_reactions(line + "\n" for line in LINES)) == expected
+
+
+def test_batches():
+    lines = ["R%d: A%d => A%d" % (number, number, number + 1) for number in range(25)]
+
+    batches = list(read_reactions(lines, batch_size=10))
+
+    assert [len(batch) for batch in batches] == [10, 10, 5]
+    assert batches[2][-1].line_number == 25
+
+
+def test_network(write_network):
+    network = MetabolicNetwork.create(write_network(LINES))
+
+    assert network.get_number_reactions_metabolites() == (3, 5)
+    assert network.get_stoichiometry("R1") == ({"M1": 1, "M2": 2}, {"M3": 1, "M4": 1})
+    assert network.get_stoichiometry("R2") == ({"M4": 0.5}, {"M5": "(n+1)"})
+    assert sorted(network.graph.get_successors("M5")) == ["R2", "R3"]
+    assert network.graph.get_nodes()[:4] == ["R1", "M1", "M2", "M3"]
+
+    with pytest.raises(KeyError):
+        network.get_stoichiometry("M1")
+
+
+def test_same_network_from_lines(example_network):
+    with open(EXAMPLE_NETWORK) as lines:
+        network = MetabolicNetwork.create(list(lines))
+
+    assert network.graph.graph_map == example_network.graph.graph_map
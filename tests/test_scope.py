@@ -0,0 +1,93 @@
+import random
+
+import pytest
+
+from metnet.metabolicnetwork import MetabolicNetwork
+from metnet.reader import parse_reaction
+from metnet.scope import ScopeEngine
+
+
+def naive_scope(directions, seeds, knockouts=()):
+    'Fires the reactions with all the substrates available, scanning all of them until nothing changes.'
+
+    available, fired = set(seeds), set()
+    changed = True
+    while changed:
+        changed = False
+        for reaction, substrates, products in directions:
+            if reaction in knockouts or not set(substrates) <= available:
+                continue
+            if reaction not in fired or not set(products) <= available:
+                fired.add(reaction)
+                available.update(products)
+                changed = True
+    return available, fired
+
+
+def random_lines(seed):
+    generator = random.Random(seed)
+    metabolites = ["M%d" % number for number in range(40)]
+    lines = []
+    for number in range(80):
+        substrates = generator.sample(metabolites, generator.randint(1, 3))
+        products = generator.sample(metabolites, generator.randint(1, 2))
+        arrow = "<=>" if generator.random() < 0.3 else "=>"
+        lines.append("R%d: %s %s %s" % (number, " + ".join(substrates), arrow, " + ".join(products)))
+    return lines
+
+
+def directions_of(lines):
+    directions = []
+    for line in lines:
+        reaction = parse_reaction(line)
+        substrates, products = [name for name, _ in reaction.substrates], [name for name, _ in reaction.products]
+        directions.append((reaction.reaction_id, substrates, products))
+        if reaction.reversible:
+            directions.append((reaction.reaction_id, products, substrates))
+    return directions
+
+
+def test_example(example_network):
+    assert example_network.get_active_reactions(["M1", "M2"]) == {"R1"}
+    assert example_network.get_active_reactions(["M1", "M2", "M5"]) == {"R1", "R2", "R3", "R4"}
+    assert example_network.get_active_reactions(["M7"]) == set()
+
+
+@pytest.mark.parametrize("seed", [1, 2, 3])
+def test_matches_naive_expansion(write_network, seed):
+    lines = random_lines(seed)
+    network = MetabolicNetwork.create(write_network(lines))
+
+    for seeds in (["M0", "M1", "M2"], ["M%d" % number for number in range(0, 40, 3)], ["M5"]):
+        expected_metabolites, expected_reactions = naive_scope(directions_of(lines), seeds)
+        metabolites, reactions = network.get_scopes([seeds])[0]
+
+        assert metabolites == expected_metabolites
+        assert set(reactions) == expected_reactions
+        assert network.get_active_reactions(seeds) == expected_reactions
+
+
+def test_firing_order_and_spontaneous_reactions():
+    engine = ScopeEngine(directions_of(["R1: A => B", "R2: B + C => D", "R3: => C", "R4: D => A"]))
+
+    metabolites, reactions = engine.expand(["A"])
+
+    assert metabolites == {"A", "B", "C", "D"}
+    assert reactions == ["R3", "R1", "R2", "R4"]
+
+
+def test_knockouts():
+    lines = ["R1: A => B", "R2: B => C", "R3: A <=> C"]
+    engine = ScopeEngine(directions_of(lines))
+
+    assert engine.expand(["A"], {"R1"}) == ({"A", "C"}, ["R3"])
+    assert engine.expand_all([["A"], ["C"]], {"R3"}) == [({"A", "B", "C"}, ["R1", "R2"]), ({"C"}, [])]
+    assert engine.expand_all([["A"], ["A"]], [{"R1"}, {"R3"}]) == [({"A", "C"}, ["R3"]), ({"A", "B", "C"}, ["R1", "R2"])]
+
+
+def test_reactions_without_definition():
+    network = MetabolicNetwork()
+    network.add_metabolites_irreversible(["A"], ["B"], "R1")
+
+    with pytest.raises(ValueError, match="R1"):
+        network.get_active_reactions(["A"])
@@ -0,0 +1,82 @@
+import pytest
+
+from metnet.csrgraph import CSRGraph
+from metnet.metabolicnetwork import MetabolicNetwork
+from metnet.reader import NetworkFormatError, find_shards, parse_shard
+
+LINES = ["R%d: %s C%d + 2 C%d => C%d" % (number, "" if number % 3 else "0.5", number, number + 1, number + 2)
+         if number % 4 else "R%d: C%d <=> C%d" % (number, number, number + 7) for number in range(200)]
+
+
+def same_network(network, expected):
+    assert network.graph.get_nodes() == expected.graph.get_nodes()
+    assert network.graph.graph_map == expected.graph.graph_map
+    assert network.get_number_reactions_metabolites() == expected.get_number_reactions_metabolites()
+    for reaction_id in ("R0", "R3", "R199"):
+        assert network.get_stoichiometry(reaction_id) == expected.get_stoichiometry(reaction_id)
+
+
+def test_find_shards(write_network):
+    path = write_network(LINES)
+    data = open(path, "rb").read()
+
+    shards = find_shards(path, 7)
+
+    assert len(shards) == 7
+    assert shards[0][0] == 0 and shards[-1][1] == len(data)
+    for (_, end), (start, _) in zip(shards, shards[1:]):
+        assert end == start and data[start - 1:start] == b"\n"
+
+
+def test_parse_shard(write_network):
+    path = write_network(LINES)
+    start, end = find_shards(path, 4)[1]
+
+    table, number_lines, error = parse_shard(path, start, end)
+
+    assert error is None
+    assert number_lines == open(path, "rb").read()[start:end].count(b"\n")
+    assert len(table) == number_lines
+
+
+@pytest.mark.parametrize("workers", [2, 3])
+def test_same_network(write_network, workers):
+    path = write_network(LINES)
+
+    same_network(MetabolicNetwork.create(path, workers=workers), MetabolicNetwork.create(path))
+
+
+def test_compact(write_network):
+    path = write_network(LINES)
+
+    network = MetabolicNetwork.create(path, workers=2, compact=True)
+
+    assert isinstance(network.graph, CSRGraph)
+    same_network(network, MetabolicNetwork.create(path))
+
+
+def test_redefinition_across_shards(write_network):
+    path = write_network(LINES + ["R0: C500 => C501"])
+
+    network = MetabolicNetwork.create(path, workers=2)
+
+    same_network(network, MetabolicNetwork.create(path))
+    assert sorted(network.graph.get_predecessors("R0")) == ["C500"]
+
+
+def test_error_line_number(write_network):
+    path = write_network(LINES[:150] + ["R150: C1 -> C2"] + LINES[151:])
+
+    with pytest.raises(NetworkFormatError) as error:
+        MetabolicNetwork.create(path, workers=2)
+
+    assert error.value.line_number == 151
+
+
+def test_line_numbers(write_network):
+    path = write_network(LINES)
+    network = MetabolicNetwork.create(path, workers=3)
+
+    reaction = network.remove_reaction("R180")
+
+    assert reaction.line_number == 181
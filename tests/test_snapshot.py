@@ -0,0 +1,125 @@
+import os
+
+import pytest
+
+from metnet.csrgraph import CSRGraph
+from metnet.metabolicnetwork import MetabolicNetwork
+from metnet.snapshot import HEADER, SnapshotError, read_snapshot, snapshot_path
+
+LINES = ["R1: A + 2 B => C", "R2: C <=> 0.5 D", "R3: D => (n+1) E", "R4: E => F"]
+
+
+def same_network(network, expected):
+    assert network.graph.get_nodes() == expected.graph.get_nodes()
+    assert network.graph.graph_map == expected.graph.graph_map
+    assert network.get_number_reactions_metabolites() == expected.get_number_reactions_metabolites()
+    assert network.get_final_metabolites() == expected.get_final_metabolites()
+    for reaction_id in ("R1", "R2", "R3", "R4"):
+        assert network.get_stoichiometry(reaction_id) == expected.get_stoichiometry(reaction_id)
+
+
+@pytest.fixture
+def saved(tmp_path, write_network):
+    'A network file, the network parsed from it and the path of its snapshot.'
+
+    source = write_network(LINES)
+    network = MetabolicNetwork.create(source)
+    path = str(tmp_path / "network.snapshot")
+    network.save(path, source)
+    return source, network, path
+
+
+def test_round_trip(saved):
+    source, network, path = saved
+
+    loaded = MetabolicNetwork.load(path, source)
+
+    same_network(loaded, network)
+    assert loaded.get_active_reactions(["A", "B"]) == {"R1", "R2", "R3", "R4"}
+    assert loaded.get_metabolites_excreted(["A"]) == {"F"}
+
+
+def test_compact_load(saved):
+    source, network, path = saved
+
+    loaded = MetabolicNetwork.load(path, source, compact=True)
+
+    assert isinstance(loaded.graph, CSRGraph)
+    same_network(loaded, network)
+    with pytest.raises(TypeError):
+        loaded.add_reaction("R5: F => G")
+
+
+def test_loaded_network_can_be_edited(saved):
+    source, network, path = saved
+    loaded = MetabolicNetwork.load(path, source)
+
+    loaded.add_reaction("R5: F => G")
+    loaded.remove_reaction("R1")
+
+    assert sorted(loaded.get_final_metabolites()) == ["A", "B", "G"]
+    assert loaded.get_number_reactions_metabolites() == (4, 7)
+
+
+def test_edited_network(tmp_path, saved):
+    _, network, _ = saved
+    network.remove_reaction("R2")
+    network.add_reaction("R1: A => 3 F")
+    path = str(tmp_path / "edited.snapshot")
+
+    network.save(path)
+    loaded = MetabolicNetwork.load(path)
+
+    assert loaded.get_stoichiometry("R1") == ({"A": 1}, {"F": 3})
+    assert loaded.graph.graph_map == network.graph.graph_map
+    with pytest.raises(KeyError):
+        loaded.get_stoichiometry("R2")
+
+
+def test_stale(saved):
+    source, _, path = saved
+
+    with open(source, "a") as source_file:
+        source_file.write("R5: F => G\n")
+
+    with pytest.raises(SnapshotError, match="stale"):
+        MetabolicNetwork.load(path, source)
+    assert MetabolicNetwork.load(path).get_number_reactions_metabolites() == (4, 6)
+
+
+@pytest.mark.parametrize("position, message", [(0, "unknown snapshot format"), (HEADER.size, "checksum mismatch"),
+                                               (HEADER.size - 9, "checksum mismatch")])
+def test_corrupt(saved, position, message):
+    _, _, path = saved
+    data = bytearray(open(path, "rb").read())
+    data[position] ^= 0xFF
+    open(path, "wb").write(bytes(data))
+
+    with pytest.raises(SnapshotError, match=message):
+        MetabolicNetwork.load(path)
+
+
+def test_truncated(saved):
+    _, _, path = saved
+    data = open(path, "rb").read()
+
+    for size in (0, HEADER.size - 1, len(data) - 8):
+        open(path, "wb").write(data[:size])
+        with pytest.raises(SnapshotError):
+            read_snapshot(path)
+
+
+def test_create_with_snapshot(write_network):
+    source = write_network(LINES)
+    path = snapshot_path(source)
+
+    MetabolicNetwork.create_with_snapshot(source)
+    assert not os.path.exists(path)
+
+    network = MetabolicNetwork.create_with_snapshot(source, save=True)
+    assert os.path.exists(path)
+    same_network(MetabolicNetwork.create_with_snapshot(source, compact=True), network)
+
+    # um snapshot corrompido é ignorado e o ficheiro é lido de novo
+    open(path, "r+b").write(b"\0" * HEADER.size)
+    same_network(MetabolicNetwork.create_with_snapshot(source), network)
@@ -0,0 +1,37 @@
+import json
+import subprocess
+import sys
+
+from conftest import EXAMPLE_NETWORK, ROOT
+
+HEAVY_MODULES = ["Bio", "igraph", "plotly", "networkx", "pandas", "matplotlib"]
+
+PROGRAM = """
+import json, sys
+sys.path.insert(0, %r)
+from metnet import app, batch
+from metnet.kegg import KEGGClient
+from metnet.metabolicnetwork import MetabolicNetwork
+network = MetabolicNetwork.create(%r)
+network.get_centrality_measures(), network.get_final_metabolites(), network.get_frequent_metabolites()
+network.get_active_reactions(["M1", "M2"]), network.get_metabolites_excreted(["M1"])
+%s
+print(json.dumps([name for name in %r if name in sys.modules]))
+"""
+
+
+def imported_modules(statement="pass"):
+    'Heavy modules imported by the analyses of the example network, and then by the statement.'
+
+    program = PROGRAM % (ROOT, EXAMPLE_NETWORK, statement, HEAVY_MODULES)
+    output = subprocess.run([sys.executable, "-c", program], check=True, capture_output=True, text=True).stdout
+    return json.loads(output)
+
+
+def test_analyses_do_not_import_heavy_modules():
+    assert imported_modules() == []
+
+
+def test_modules_are_imported_when_used():
+    assert "Bio" in imported_modules("from metnet.kegg import BiopythonTransport; BiopythonTransport()")
+    assert {"igraph", "plotly"} <= set(imported_modules("import metnet.visualization"))
@@ -0,0 +1,65 @@
+from itertools import islice
+
+import pytest
+
+from conftest import make_graph
+from metnet.traversal import breadth_first, depth_first
+
+TREE = {"A": ["B", "C"], "B": ["D"], "C": ["D", "E"], "D": ["A"], "E": []}
+
+
+def test_breadth_first():
+    assert list(breadth_first(TREE.__getitem__, ["A"])) == [
+        ("A", 0, None), ("B", 1, "A"), ("C", 1, "A"), ("D", 2, "B"), ("E", 2, "C")]
+
+
+def test_depth_first():
+    assert list(depth_first(TREE.__getitem__, ["A"])) == [
+        ("A", 0, None), ("B", 1, "A"), ("D", 2, "B"), ("C", 1, "A"), ("E", 2, "C")]
+
+
+@pytest.mark.parametrize("traversal", [breadth_first, depth_first])
+def test_max_depth_and_sources(traversal):
+    assert {node for node, _, _ in traversal(TREE.__getitem__, ["A"], max_depth=1)} == {"A", "B", "C"}
+    assert [node for node, depth, _ in traversal(TREE.__getitem__, ["E", "C", "E"]) if depth == 0] == ["E", "C"]
+
+
+@pytest.mark.parametrize("traversal", [breadth_first, depth_first])
+def test_lazy(traversal):
+    calls = []
+
+    def successors(node):
+        calls.append(node)
+        return [node + 1]
+
+    # grafo infinito: só é percorrido o que é pedido
+    assert [node for node, _, _ in islice(traversal(successors, [0]), 4)] == [0, 1, 2, 3]
+    assert len(calls) <= 4
+
+
+@pytest.mark.parametrize("traversal", [breadth_first, depth_first])
+def test_deep_graph(traversal):
+    chain = {node: [node + 1] for node in range(100000)}
+    chain[100000] = []
+
+    assert sum(1 for _ in traversal(chain.__getitem__, [0])) == 100001
+
+
+def test_graph_queries(random_graph):
+    compact = random_graph.freeze()
+
+    for node in ("N0", "N7", "N42"):
+        assert sorted(random_graph.reachable_bfs(node)) == sorted(random_graph.reachable_dfs(node))
+        assert sorted(random_graph.reachable_with_dist(node)) == sorted(compact.reachable_with_dist(node))
+        assert sorted(random_graph.reachable_dfs(node)) == sorted(compact.reachable_dfs(node))
+
+
+def test_distance_and_shortest_path():
+    graph = make_graph([("A", "B"), ("B", "C"), ("C", "D"), ("A", "C")], ["E"])
+
+    assert graph.distance("A", "D") == 2
+    assert graph.distance("A", "E") is None
+    assert graph.shortest_path("A", "D") == ["A", "C", "D"]
+    assert graph.shortest_path("D", "A") is None
+    assert graph.shortest_path("A", "A") == []
+    assert graph.reachable_with_dist("B") == [("C", 1), ("D", 2)]
@@ -0,0 +1,63 @@
+import numpy as np
+import pytest
+
+pytest.importorskip("igraph")
+pytest.importorskip("plotly")
+
+from metnet.layoutcache import LayoutCache
+from metnet.visualization import (CURRENCY_METABOLITES, KK_MAX_NODES, choose_layout, compute_layout,
+                                  edge_coordinates, hub_mask, network_figure, remove_nodes)
+
+NAMES = ["R1", "C00001", "M1", "M2", "R2"]
+SOURCES = np.array([1, 2, 0, 1, 3, 4])
+TARGETS = np.array([0, 0, 3, 4, 4, 1])
+
+
+def test_choose_layout():
+    assert choose_layout(10) == ("kk", 3, {})
+    assert choose_layout(KK_MAX_NODES) == ("kk", 3, {})
+    assert choose_layout(KK_MAX_NODES + 1) == ("fr", 2, {"grid": True})
+
+
+def test_hubs():
+    assert hub_mask(NAMES, SOURCES, TARGETS, CURRENCY_METABOLITES).tolist() == [False, True, False, False, False]
+    assert hub_mask(NAMES, SOURCES, TARGETS, max_degree=2).tolist() == [True, True, False, False, True]
+
+
+def test_remove_nodes():
+    names, sources, targets = remove_nodes(NAMES, SOURCES, TARGETS, np.array([False, True, False, False, False]))
+
+    assert names == ["R1", "M1", "M2", "R2"]
+    assert [(names[source], names[target]) for source, target in zip(sources.tolist(), targets.tolist())] == \
+        [("M1", "R1"), ("R1", "M2"), ("M2", "R2")]
+
+
+def test_edge_coordinates():
+    coordinates = np.arange(10, dtype=np.float64).reshape(5, 2)
+
+    edges = edge_coordinates(coordinates, SOURCES[:2], TARGETS[:2])
+
+    assert edges.shape == (2, 6)
+    assert edges[0, :2].tolist() == [2.0, 0.0]
+    assert np.isnan(edges[:, 2]).all()
+
+
+@pytest.mark.parametrize("layout, dim, trace", [("kk", 3, "scatter3d"), ("fr", 2, "scattergl")])
+def test_figure(layout, dim, trace):
+    coordinates = compute_layout(len(NAMES), SOURCES, TARGETS, layout, dim, {})
+
+    figure = network_figure(NAMES, coordinates, SOURCES, TARGETS)
+
+    assert coordinates.shape == (len(NAMES), dim)
+    assert [data.type for data in figure.data] == [trace, trace]
+    assert list(figure.data[1].text) == NAMES
+
+
+def test_show_graphical_visualization(tmp_path, example_network):
+    filename = str(tmp_path / "network.html")
+    cache = LayoutCache(str(tmp_path / "layouts"))
+
+    example_network.show_graphical_visualization(filename, collapse_currency=True, layout_cache=cache)
+
+    assert (tmp_path / "network.html").stat().st_size > 0
+    assert cache.misses == 1 and len(cache.entries()) == 1